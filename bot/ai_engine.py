@@ -1,18 +1,25 @@
 """
 NEXUS AI Trading Bot - AI Engine
 =================================
-DeepSeek integration for market analysis
+DeepSeek (or model ensemble) integration for market analysis
 """
 
 import json
-from openai import OpenAI
+import metrics
 from loguru import logger
 from config import config
+from llm_ensemble import Ensemble, ModelEndpoint, parse_models
+from decision import Decision, DecisionParseError, parse_decision
+from decision_provider import DecisionProvider
+from market_state import MarketSnapshot, format_number, format_value
+from microstructure import IMBALANCE_DEPTHS, LIQUIDITY_BANDS_BPS
 
 
-class AIEngine:
+class AIEngine(DecisionProvider):
     """AI Engine using DeepSeek for market analysis"""
     
+    name = "llm"
+    
     SYSTEM_PROMPT = """You are NEXUS, an elite AI trading analyst. You analyze crypto markets with precision.
 
 RULES:
@@ -34,96 +41,167 @@ RESPONSE FORMAT (JSON only):
 }"""
 
     def __init__(self):
-        self.client = OpenAI(
-            api_key=config.DEEPSEEK_API_KEY,
-            base_url=config.DEEPSEEK_BASE_URL
-        )
-        self.model = "deepseek-chat"
-        logger.info("AI Engine initialized with DeepSeek")
+        specs = parse_models(config.AI_ENSEMBLE, config.DEEPSEEK_API_KEY)
+        if not specs:
+            specs = [("deepseek-chat", config.DEEPSEEK_BASE_URL, config.DEEPSEEK_API_KEY)]
+        
+        members = [ModelEndpoint(*spec) for spec in specs]
+        self.ensemble = Ensemble(members, config.AI_ENSEMBLE_QUORUM)
+        self.model = members[0].model
+        self.parse_failures = 0
+        
+        if len(members) > 1:
+            logger.info(f"AI Engine initialized with ensemble {', '.join(m.name for m in members)} "
+                        f"(quorum {self.ensemble.quorum})")
+        else:
+            logger.info(f"AI Engine initialized with {self.model}")
     
-    def analyze(self, market_data: dict) -> dict:
+    @metrics.timed('ai.analyze')
+    def analyze(self, market_data: MarketSnapshot) -> Decision:
         """
         Analyze market data and return trading decision
         
         Args:
-            market_data: Dict containing price, volume, indicators, news, etc.
+            market_data: Snapshot with price, volume, indicators, news, etc.
             
         Returns:
-            Dict with decision, confidence, reasoning, entry/exit levels
+            Decision with decision, confidence, reasoning, entry/exit levels
         """
         
         # Build analysis prompt
         prompt = self._build_prompt(market_data)
+        messages = [
+            {"role": "system", "content": self.SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
         
+        def parse(text: str, model: str) -> Decision:
+            return parse_decision(text, price=market_data.price, source=model)
+        
+        # If the run fails outright, assume every member was asked once
+        self.llm_requests = len(self.ensemble.members)
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,  # Lower = more consistent
-                max_tokens=500
-            )
-            
-            result_text = response.choices[0].message.content
-            
-            # Parse JSON response
-            result = self._parse_response(result_text)
-            
-            logger.info(f"AI Decision: {result['decision']} (Confidence: {result['confidence']}%)")
-            
-            return result
-            
+            outcome = self.ensemble.run(messages, parse)
+            self.llm_requests = outcome.get('requests', self.llm_requests)
         except Exception as e:
             logger.error(f"AI Engine error: {e}")
-            return {
-                "decision": "WAIT",
-                "confidence": 0,
-                "reasoning": f"Error: {str(e)}",
-                "entry_price": None,
-                "stop_loss": None,
-                "take_profit": None,
-                "risk_level": "HIGH"
-            }
+            metrics.fallback('ai.error')
+            return Decision.wait(f"Error: {str(e)}")
+        
+        result = self._resolve(outcome)
+        logger.info(f"AI Decision: {result['decision']} (Confidence: {result['confidence']}%)")
+        return result
+    
+    def decide(self, market_data: MarketSnapshot) -> Decision:
+        return self.analyze(market_data)
+    
+    def close(self) -> None:
+        self.ensemble.close()
+    
+    def _resolve(self, outcome: dict) -> Decision:
+        """Merge model answers into one decision"""
+        
+        results = [parsed for _, parsed in outcome['results']]
+        errors = outcome['errors']
+        for name, error in errors:
+            if isinstance(error, DecisionParseError):
+                self.parse_failures += 1
+                logger.warning(f"AI model {name} answer rejected ({error.reason}): {error} "
+                               f"[{self.parse_failures} parse failures so far]")
+            else:
+                logger.warning(f"AI model {name} failed: {error}")
+        
+        if not results:
+            metrics.fallback('ai.error')
+            return Decision.wait("Error: " + "; ".join(f"{name}: {error}" for name, error in errors))
+        
+        decisions = {parsed.decision for parsed in results}
+        winner = outcome['winner']
+        if winner is None and len(decisions) == 1:
+            # Short of quorum only because models failed, not because they disagree
+            winner = decisions.pop()
+            logger.warning(f"AI quorum not reached ({len(results)} answered), using agreeing answers")
+        
+        if winner is None:
+            metrics.fallback('ai.quorum')
+            votes = ", ".join(parsed.decision for parsed in results)
+            return Decision.wait(f"No model quorum ({votes})")
+        
+        agreeing = [parsed for parsed in results if parsed.decision == winner]
+        best = max(agreeing, key=lambda parsed: parsed.confidence)
+        best.confidence = round(sum(parsed.confidence for parsed in agreeing) / len(agreeing))
+        if len(self.ensemble.members) > 1:
+            best.votes = {name: parsed.decision for name, parsed in outcome['results']}
+        return best
     
-    def _build_prompt(self, market_data: dict) -> str:
-        """Build analysis prompt from market data"""
+    def _build_prompt(self, market_data: MarketSnapshot) -> str:
+        """Build analysis prompt from market data (the only place values are formatted)"""
+        
+        m = market_data
+        
+        macd_signal = "N/A"
+        if m.macd is not None and m.macd_signal is not None:
+            macd_signal = "Bullish crossover" if m.macd > m.macd_signal else "Bearish crossover"
+        
+        def ema_position(ema):
+            if ema is None or m.price is None:
+                return "N/A"
+            return "Price above" if m.price > ema else "Price below"
+        
+        news = "\n".join(f"[{sentiment}] {title}" for sentiment, title in m.news) or "No recent news available"
+        
+        imbalance = "N/A"
+        if m.book_imbalance:
+            imbalance = ", ".join(f"top {d}: {v:+.2f}" for d, v in zip(IMBALANCE_DEPTHS, m.book_imbalance))
+        
+        liquidity = "N/A"
+        if m.bid_liquidity and m.ask_liquidity:
+            liquidity = ", ".join(
+                f"±{bps}bps ${format_number(b)} bid / ${format_number(a)} ask"
+                for bps, b, a in zip(LIQUIDITY_BANDS_BPS, m.bid_liquidity, m.ask_liquidity)
+            )
         
-        prompt = f"""ANALYZE THIS MARKET DATA FOR {config.TRADING_SYMBOL}:
+        prompt = f"""ANALYZE THIS MARKET DATA FOR {m.symbol or config.TRADING_SYMBOL}:
 
 === PRICE DATA ===
-Current Price: ${market_data.get('price', 'N/A')}
-24h Change: {market_data.get('change_24h', 'N/A')}%
-24h High: ${market_data.get('high_24h', 'N/A')}
-24h Low: ${market_data.get('low_24h', 'N/A')}
-24h Volume: ${market_data.get('volume_24h', 'N/A')}
+Current Price: ${format_value(m.price)}
+24h Change: {format_value(m.change_24h)}%
+24h High: ${format_value(m.high_24h)}
+24h Low: ${format_value(m.low_24h)}
+24h Volume: ${format_number(m.volume_24h)}
 
 === MARKET STRUCTURE ===
-Funding Rate: {market_data.get('funding_rate', 'N/A')}%
-Open Interest: ${market_data.get('open_interest', 'N/A')}
-OI Change 1h: {market_data.get('oi_change_1h', 'N/A')}%
-Long/Short Ratio: {market_data.get('long_short_ratio', 'N/A')}
+Funding Rate: {format_value(m.funding_rate, 4)}% (24h avg {format_value(m.funding_avg_24h, 4)}%, 8h change {format_value(m.funding_change_8h, 4)}%)
+Open Interest: ${format_number(m.open_interest)}
+OI Change: 1h {format_value(m.oi_change_1h)}% | 4h {format_value(m.oi_change_4h)}% | 24h {format_value(m.oi_change_24h)}%
+Long/Short Ratio: {format_value(m.long_short_ratio)}
+
+=== ORDER BOOK ===
+Microprice: ${format_value(m.microprice)}
+Spread: {format_value(m.spread_bps)} bps (z-score {format_value(m.spread_z)})
+Bid/Ask Imbalance (+ = bids heavier): {imbalance}
+Liquidity: {liquidity}
 
 === LIQUIDATIONS ===
-Long Liquidations 24h: ${market_data.get('long_liquidations', 'N/A')}
-Short Liquidations 24h: ${market_data.get('short_liquidations', 'N/A')}
-Nearest Long Liq Level: ${market_data.get('nearest_long_liq', 'N/A')}
-Nearest Short Liq Level: ${market_data.get('nearest_short_liq', 'N/A')}
+Long Liquidations 24h: ${format_number(m.long_liquidations)}
+Short Liquidations 24h: ${format_number(m.short_liquidations)}
+Nearest Long Liq Level: ${format_value(m.nearest_long_liq)}
+Nearest Short Liq Level: ${format_value(m.nearest_short_liq)}
 
 === SENTIMENT ===
-Fear & Greed Index: {market_data.get('fear_greed', 'N/A')}
-Social Volume: {market_data.get('social_volume', 'N/A')}
-News Sentiment: {market_data.get('news_sentiment', 'N/A')}
+Fear & Greed Index: {format_value(m.fear_greed)}
+Social Volume: {format_number(m.social_volume)}
+News Sentiment: {format_value(m.news_sentiment)}
 
 === RECENT NEWS ===
-{market_data.get('news', 'No recent news')}
+{news}
 
 === TECHNICAL ===
-RSI (14): {market_data.get('rsi', 'N/A')}
-MACD Signal: {market_data.get('macd_signal', 'N/A')}
-EMA 20 vs Price: {market_data.get('ema_20_position', 'N/A')}
-EMA 50 vs Price: {market_data.get('ema_50_position', 'N/A')}
+RSI (14): {format_value(m.rsi, 1)}
+MACD Signal: {macd_signal}
+EMA 20 vs Price: {ema_position(m.ema_20)}
+EMA 50 vs Price: {ema_position(m.ema_50)}
+ATR (14, 1h): ${format_value(m.atr)} ({format_value(m.atr_ratio)}x its recent median)
 
 Based on this data, what is your trading decision? Consider:
 1. Is there a clear trend or reversal setup?
@@ -135,40 +213,6 @@ Based on this data, what is your trading decision? Consider:
 Respond with JSON only."""
         
         return prompt
-    
-    def _parse_response(self, response_text: str) -> dict:
-        """Parse AI response to dict"""
-        
-        # Try to find JSON in response
-        try:
-            # Remove markdown code blocks if present
-            text = response_text.strip()
-            if text.startswith("```"):
-                text = text.split("```")[1]
-                if text.startswith("json"):
-                    text = text[4:]
-            
-            return json.loads(text)
-            
-        except json.JSONDecodeError:
-            # Fallback: try to extract key info
-            logger.warning("Failed to parse AI JSON, using fallback")
-            
-            decision = "WAIT"
-            if "LONG" in response_text.upper():
-                decision = "LONG"
-            elif "SHORT" in response_text.upper():
-                decision = "SHORT"
-            
-            return {
-                "decision": decision,
-                "confidence": 50,
-                "reasoning": response_text[:200],
-                "entry_price": None,
-                "stop_loss": None,
-                "take_profit": None,
-                "risk_level": "MEDIUM"
-            }
 
 
 # Test if run directly
@@ -176,28 +220,36 @@ if __name__ == "__main__":
     engine = AIEngine()
     
     # Test with sample data
-    test_data = {
-        "price": 97500,
-        "change_24h": -1.2,
-        "high_24h": 98500,
-        "low_24h": 96800,
-        "volume_24h": "2.3B",
-        "funding_rate": 0.01,
-        "open_interest": "18.5B",
-        "oi_change_1h": 2.1,
-        "long_short_ratio": 1.8,
-        "long_liquidations": "45M",
-        "short_liquidations": "12M",
-        "nearest_long_liq": 95000,
-        "nearest_short_liq": 99500,
-        "fear_greed": 72,
-        "news_sentiment": "Bullish",
-        "news": "Bitcoin ETF sees $200M inflows",
-        "rsi": 58,
-        "macd_signal": "Bullish crossover",
-        "ema_20_position": "Price above",
-        "ema_50_position": "Price above"
-    }
+    test_data = MarketSnapshot(
+        "BTC/USDT",
+        price=97500,
+        change_24h=-1.2,
+        high_24h=98500,
+        low_24h=96800,
+        volume_24h=2_300_000_000,
+        funding_rate=0.01,
+        open_interest=18_500_000_000,
+        oi_change_1h=2.1,
+        oi_change_4h=3.4,
+        oi_change_24h=-1.5,
+        funding_avg_24h=0.008,
+        funding_change_8h=0.003,
+        long_short_ratio=1.8,
+        long_liquidations=45_000_000,
+        short_liquidations=12_000_000,
+        nearest_long_liq=95000,
+        nearest_short_liq=99500,
+        fear_greed=72,
+        news_sentiment="Bullish",
+        news=[("Bullish", "Bitcoin ETF sees $200M inflows")],
+        rsi=58,
+        macd=120.5,
+        macd_signal=98.2,
+        ema_20=96900,
+        ema_50=95400,
+        atr=850,
+        atr_ratio=1.3
+    )
     
     result = engine.analyze(test_data)
-    print(json.dumps(result, indent=2))
+    print(json.dumps(result.to_dict(), indent=2))
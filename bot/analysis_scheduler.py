@@ -0,0 +1,95 @@
+"""
+NEXUS AI Trading Bot - Analysis Scheduler
+==========================================
+Volatility-adaptive analysis cadence under an hourly LLM call budget
+"""
+
+import math
+import time
+import threading
+from collections import deque
+from loguru import logger
+from config import config
+from typing import Dict, Optional
+
+HOUR = 3600.0
+
+# ATR ratio is clamped to this range before scaling the interval
+MIN_RATIO = 0.25
+MAX_RATIO = 4.0
+
+
+class LLMBudget:
+    """Sliding one-hour window of LLM calls shared by every symbol"""
+
+    def __init__(self, calls_per_hour: int):
+        self.calls_per_hour = calls_per_hour
+        self._calls: deque = deque()  # monotonic times, oldest first
+        self._lock = threading.Lock()
+
+    def record(self, now: float = None, count: int = 1) -> None:
+        with self._lock:
+            self._calls.extend([time.monotonic() if now is None else now] * count)
+
+    def used(self, now: float = None) -> int:
+        """Calls in the last hour"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            while self._calls and self._calls[0] <= now - HOUR:
+                self._calls.popleft()
+            return len(self._calls)
+
+    def wait(self, now: float = None) -> float:
+        """Seconds until another call fits the budget (0 if it fits now)"""
+        now = time.monotonic() if now is None else now
+        if not self.calls_per_hour or self.used(now) < self.calls_per_hour:
+            return 0.0
+        with self._lock:
+            # The call that has to age out before the next one fits
+            oldest = self._calls[len(self._calls) - self.calls_per_hour]
+        return max(oldest + HOUR - now, 0.0)
+
+
+class AnalysisScheduler:
+    """
+    Picks the delay before each symbol's next analysis.
+
+    The base interval is divided by the symbol's ATR ratio (current ATR over
+    its recent median), so a market moving twice as much as usual is looked
+    at twice as often, and a quiet one less often, within
+    [ANALYSIS_MIN_INTERVAL, ANALYSIS_MAX_INTERVAL]. Every request an
+    analysis sends (one per ensemble member, plus hedges) counts against the
+    hourly budget; once it is spent, the next run waits for the oldest call
+    in the window to expire.
+    """
+
+    def __init__(self, base: float = None, minimum: float = None, maximum: float = None,
+                 calls_per_hour: int = None):
+        self.base = base or config.ANALYSIS_INTERVAL
+        self.minimum = minimum or config.ANALYSIS_MIN_INTERVAL
+        self.maximum = maximum or config.ANALYSIS_MAX_INTERVAL
+        self.budget = LLMBudget(config.LLM_CALLS_PER_HOUR if calls_per_hour is None else calls_per_hour)
+        self.intervals: Dict[str, float] = {}
+
+    def record_call(self, count: int = 1) -> None:
+        """Count LLM requests (ensemble members and hedges each count) against the budget"""
+        self.budget.record(count=count)
+
+    def next_interval(self, symbol: str, atr_ratio: Optional[float]) -> float:
+        """Seconds until `symbol` should be analyzed again"""
+
+        if atr_ratio and math.isfinite(atr_ratio):
+            ratio = min(max(atr_ratio, MIN_RATIO), MAX_RATIO)
+            interval = min(max(self.base / ratio, self.minimum), self.maximum)
+        else:
+            # No candles yet (or flat ones): keep the configured cadence
+            interval = float(self.base)
+
+        wait = self.budget.wait()
+        if wait > interval:
+            logger.info(f"LLM budget spent ({self.budget.calls_per_hour}/h), "
+                        f"next {symbol} analysis in {wait:.0f}s")
+            interval = wait
+
+        self.intervals[symbol] = interval
+        return interval
@@ -0,0 +1,353 @@
+"""
+NEXUS AI Trading Bot - Benchmark
+=================================
+Cycle latency and throughput against local fake upstreams
+
+Usage:
+    python benchmark.py --scenarios cycle,broadcast,telegram,tiers --symbols 1,4,16
+    python benchmark.py --latency 0.05 --error-rate 0.02 --compare
+"""
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from loguru import logger
+from config import config
+from fake_upstreams import (
+    Fault, FakeUpstreams, FakeBinance, FakeDeepSeek, FakeCoinglass,
+    FakeCryptoPanic, FakeFearGreed, FakeTelegram, FakeRPC
+)
+from typing import List, Optional
+
+RESULTS_FILE = Path(__file__).parent / "benchmarks" / "results.jsonl"
+
+BENCH_CHAINS = {"base": 8453, "bsc": 56}
+
+# Telegram's own global sendMessage limit (messages/s)
+TELEGRAM_LIMIT = 30
+
+
+def percentiles(samples: List[float]) -> dict:
+    """Latency summary in milliseconds"""
+
+    if not samples:
+        return {}
+
+    ordered = sorted(samples)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+    return {
+        'n': len(ordered),
+        'mean': round(sum(ordered) / len(ordered) * 1000, 2),
+        'p50': pick(0.50),
+        'p90': pick(0.90),
+        'p99': pick(0.99),
+        'max': round(ordered[-1] * 1000, 2)
+    }
+
+
+def git_revision() -> dict:
+    """Current commit and whether the tree has local changes"""
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+        dirty = bool(subprocess.check_output(['git', 'status', '--porcelain', '--untracked-files=no'], text=True).strip())
+        return {'commit': commit, 'dirty': dirty}
+    except Exception:
+        return {'commit': 'unknown', 'dirty': None}
+
+
+# ============ SCENARIOS ============
+
+def bench_cycle(fakes: FakeUpstreams, symbols: int, cycles: int) -> dict:
+    """Full analysis cycle (data fetch, LLM, positions) for N symbols in parallel"""
+    from exchange import Exchange
+    from data_fetcher import DataFetcher
+    from news_ingester import NewsIngester
+    from ai_engine import AIEngine
+
+    pipelines = []
+    for symbol in fakes['binance'].symbols[:symbols]:
+        exchange = Exchange()
+        exchange.symbol = symbol
+        # News is polled off the cycle path; warm it once like a running trader
+        news = NewsIngester([symbol.split('/')[0]])
+        news.poll()
+        pipelines.append((exchange, DataFetcher(exchange, news=news), AIEngine()))
+
+    def run(pipeline) -> List[float]:
+        exchange, fetcher, ai = pipeline
+        latencies = []
+        for _ in range(cycles):
+            start = time.perf_counter()
+            ai.analyze(fetcher.get_all_data())
+            exchange.get_positions()
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    requests_before = sum(service.requests for service in fakes.services.values())
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(pipelines)) as pool:
+        latencies = [lat for result in pool.map(run, pipelines) for lat in result]
+    elapsed = time.perf_counter() - start
+    requests = sum(service.requests for service in fakes.services.values()) - requests_before
+
+    return {
+        'latency_ms': percentiles(latencies),
+        'throughput': round(len(latencies) / elapsed, 2),  # cycles/s
+        'upstream_calls_per_cycle': round(requests / max(len(latencies), 1), 1)
+    }
+
+
+def bench_broadcast(fakes: FakeUpstreams, subscribers: int, telegram_rate: float,
+                    telegram_latency: float = None) -> dict:
+    """
+    One signal fanned out to N subscribers, publish -> Telegram receipt
+
+    `telegram_latency` overrides the fake's base latency for this run only.
+    """
+    from telegram_bot import TelegramBot
+    from signal_broadcast import SignalBroadcaster
+    from token_verifier import TIERS, TIER_FEATURES
+
+    sink = fakes['telegram']
+    base_latency = sink.fault.latency
+    if telegram_latency is not None:
+        sink.fault.latency = telegram_latency
+
+    telegram = TelegramBot()
+    telegram.GLOBAL_RATE = telegram_rate
+
+    with tempfile.TemporaryDirectory() as tmp:
+        broadcaster = SignalBroadcaster(telegram, subscribers_file=str(Path(tmp) / "subscribers.json"))
+        broadcaster.batch_size = max(1, int(telegram_rate))
+
+        # Delayed tiers would only measure their delay
+        tiers = [tier for tier in TIERS if TIER_FEATURES[tier]['signals_delay'] == 0]
+        for i in range(subscribers):
+            broadcaster.add_subscriber(str(10_000_000 + i), tiers[i % len(tiers)])
+
+        already = len(sink.delivered)
+        broadcaster.start()
+
+        start = time.monotonic()
+        broadcaster.publish("<b>BENCHMARK SIGNAL</b>")
+
+        deadline = start + subscribers / telegram_rate * 3 + 30
+        while len(sink.delivered) - already < subscribers and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        received = [at - start for at, _ in sink.delivered[already:]]
+        broadcaster.stop()
+        telegram.close(timeout=1)
+        sink.fault.latency = base_latency
+
+    elapsed = max(received) if received else 0.0
+    return {
+        'latency_ms': percentiles(received),
+        'throughput': round(len(received) / elapsed, 2) if elapsed else 0.0,  # messages/s
+        'delivered': len(received),
+        'dropped': subscribers - len(received)
+    }
+
+
+def bench_tiers(fakes: FakeUpstreams, wallets: int) -> dict:
+    """Batch tier lookup for N wallets plus single-wallet lookup latency (no cache)"""
+    from token_verifier import TokenVerifier
+
+    addresses = {chain: "0x" + f"{i + 1:02x}" * 20 for i, chain in enumerate(BENCH_CHAINS)}
+    verifier = TokenVerifier(addresses, use_cache=False, use_indexer=False)
+    batch = ["0x" + f"{i + 1:040x}" for i in range(wallets)]
+
+    try:
+        start = time.perf_counter()
+        verifier.get_tiers(batch)
+        batch_elapsed = time.perf_counter() - start
+
+        singles = []
+        for wallet in batch[:min(wallets, 200)]:
+            start = time.perf_counter()
+            verifier.get_tier(wallet)
+            singles.append(time.perf_counter() - start)
+    finally:
+        verifier.close()
+
+    return {
+        'latency_ms': percentiles(singles),
+        'throughput': round(wallets / batch_elapsed, 2) if batch_elapsed else 0.0,  # wallets/s in batch
+        'batch_seconds': round(batch_elapsed, 3)
+    }
+
+
+# ============ RESULTS ============
+
+def save_results(records: List[dict], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('a') as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def load_results(path: Path) -> List[dict]:
+    if not path.exists():
+        return []
+    with path.open() as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_baseline(history: List[dict], record: dict) -> Optional[dict]:
+    """Latest stored run of the same scenario and parameters"""
+    for old in reversed(history):
+        if old['scenario'] == record['scenario'] and old['params'] == record['params']:
+            return old
+    return None
+
+
+def print_report(records: List[dict], history: List[dict], compare: bool) -> None:
+    header = f"{'scenario':<10} {'params':<28} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'thruput':>10}"
+    print("\n" + header)
+    print("-" * len(header))
+
+    for record in records:
+        latency = record['result'].get('latency_ms', {})
+        params = ",".join(f"{k}={v}" for k, v in record['params'].items() if k in ('symbols', 'subscribers', 'wallets'))
+        print(f"{record['scenario']:<10} {params:<28} {latency.get('p50', 0):>9} {latency.get('p90', 0):>9} "
+              f"{latency.get('p99', 0):>9} {record['result'].get('throughput', 0):>10}")
+
+        if compare:
+            baseline = find_baseline(history, record)
+            if baseline:
+                old_latency = baseline['result'].get('latency_ms', {})
+                deltas = []
+                for key in ('p50', 'p99'):
+                    if old_latency.get(key):
+                        deltas.append(f"{key} {(latency.get(key, 0) / old_latency[key] - 1) * 100:+.1f}%")
+                old_throughput = baseline['result'].get('throughput')
+                if old_throughput:
+                    deltas.append(f"throughput {(record['result'].get('throughput', 0) / old_throughput - 1) * 100:+.1f}%")
+                dirty = '+' if baseline.get('dirty') else ''
+                print(f"{'':<10} vs {baseline['commit']}{dirty} ({baseline['timestamp']}): {', '.join(deltas)}")
+
+    print()
+
+
+# ============ MAIN ============
+
+def build_fakes(args, symbols: int) -> FakeUpstreams:
+    """Start every fake with the requested latency/error profile"""
+
+    def fault(seed: int, latency: float = None) -> Fault:
+        return Fault(
+            latency=args.latency if latency is None else latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            seed=seed
+        )
+
+    fakes = FakeUpstreams([
+        FakeBinance(fault(1), symbols=symbols),
+        FakeDeepSeek(fault(2, args.llm_latency)),
+        FakeCoinglass(fault(3)),
+        FakeCryptoPanic(fault(4)),
+        FakeFearGreed(fault(5)),
+        FakeTelegram(Fault(args.latency, args.jitter, args.error_rate, error_status=429, seed=6)),
+        FakeRPC(fault(7), chain_ids=BENCH_CHAINS)
+    ]).start()
+    fakes.apply_config()
+    return fakes
+
+
+def parse_counts(value: str) -> List[int]:
+    return [int(item) for item in value.split(',') if item]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="NEXUS bot benchmarks against local fake upstreams")
+    parser.add_argument('--scenarios', default='cycle,broadcast,telegram,tiers')
+    parser.add_argument('--symbols', type=parse_counts, default=[1, 4, 16])
+    parser.add_argument('--subscribers', type=parse_counts, default=[100, 1000])
+    parser.add_argument('--wallets', type=parse_counts, default=[100, 1000, 10000])
+    parser.add_argument('--cycles', type=int, default=20, help="cycles per symbol")
+    parser.add_argument('--latency', type=float, default=0.02, help="base upstream latency (s)")
+    parser.add_argument('--jitter', type=float, default=0.01, help="mean of the exponential latency tail (s)")
+    parser.add_argument('--llm-latency', type=float, default=0.5, help="chat completion latency (s)")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--telegram-rate', type=float, default=1000, help="messages/s for the broadcast scenario")
+    parser.add_argument('--telegram-latency', type=float, default=0.15,
+                        help="sendMessage round trip for the telegram scenario (s)")
+    parser.add_argument('--results', type=Path, default=RESULTS_FILE)
+    parser.add_argument('--label', default='')
+    parser.add_argument('--no-save', action='store_true')
+    parser.add_argument('--compare', action='store_true', help="show change vs the last stored run")
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    # Nothing in the benchmark should reach a real service or place an order
+    config.DRY_RUN = True
+    config.METRICS_ENABLED = False
+    config.TIER_CACHE_ENABLED = False
+    config.INDEXER_ENABLED = False
+    config.TIER_RPC_TIMEOUT = max(config.TIER_RPC_TIMEOUT, args.latency * 10 + 1)
+
+    scenarios = [s for s in args.scenarios.split(',') if s]
+    revision = git_revision()
+    common = {
+        'latency': args.latency, 'jitter': args.jitter,
+        'llm_latency': args.llm_latency, 'error_rate': args.error_rate
+    }
+
+    fakes = build_fakes(args, max(args.symbols))
+    records = []
+
+    try:
+        runs = []
+        if 'cycle' in scenarios:
+            runs += [('cycle', {'symbols': n, 'cycles': args.cycles}, lambda n=n: bench_cycle(fakes, n, args.cycles))
+                     for n in args.symbols]
+        if 'broadcast' in scenarios:
+            runs += [('broadcast', {'subscribers': n, 'telegram_rate': args.telegram_rate},
+                      lambda n=n: bench_broadcast(fakes, n, args.telegram_rate))
+                     for n in args.subscribers]
+        if 'telegram' in scenarios:
+            # Broadcast at Telegram's real limit and round trip: should be rate bound, not RTT bound
+            runs += [('telegram', {'subscribers': n, 'telegram_rate': TELEGRAM_LIMIT,
+                                   'telegram_latency': args.telegram_latency},
+                      lambda n=n: bench_broadcast(fakes, n, TELEGRAM_LIMIT, args.telegram_latency))
+                     for n in args.subscribers]
+        if 'tiers' in scenarios:
+            runs += [('tiers', {'wallets': n}, lambda n=n: bench_tiers(fakes, n)) for n in args.wallets]
+
+        for scenario, params, run in runs:
+            print(f"Running {scenario} {params}...", flush=True)
+            records.append({
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                **revision,
+                'label': args.label,
+                'scenario': scenario,
+                'params': {**params, **common},
+                'result': run()
+            })
+    finally:
+        fakes.stop()
+
+    history = load_results(args.results)
+    print_report(records, history, args.compare)
+
+    if not args.no_save:
+        save_results(records, args.results)
+        print(f"Results appended to {args.results}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""
+NEXUS AI Trading Bot - Circuit Breaker
+=======================================
+Per-source circuit breakers with timeouts adapted to observed latency
+"""
+
+import time
+import threading
+import numpy as np
+import metrics
+from contextlib import contextmanager
+from loguru import logger
+from config import config
+from typing import Dict
+
+CLOSED = 'closed'
+HALF_OPEN = 'half_open'
+OPEN = 'open'
+
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Successful call latencies remembered per source
+LATENCY_WINDOW = 100
+
+# Samples needed before the timeout adapts
+MIN_SAMPLES = 20
+
+# Timeout = p99 latency x this factor, within [MIN_TIMEOUT, MAX_TIMEOUT]
+TIMEOUT_FACTOR = 3.0
+MIN_TIMEOUT = 0.5
+MAX_TIMEOUT = 5.0
+
+# Longest wait between probes of a source that keeps failing
+MAX_RESET_SECONDS = 600.0
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures. While open,
+    calls fail immediately. After the reset delay one probe goes through
+    (half-open): success closes the circuit, failure reopens it and doubles
+    the delay up to MAX_RESET_SECONDS.
+
+    The timeout handed to callers follows the p99 of recent successful
+    calls, so a source that normally answers in 100ms is given up on long
+    before the old fixed 5s. Probes always get MAX_TIMEOUT.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = None, reset_seconds: float = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or config.CIRCUIT_FAILURE_THRESHOLD
+        self.base_reset = reset_seconds or config.CIRCUIT_RESET_SECONDS
+
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.reset_seconds = self.base_reset
+        self.opened_at = 0.0
+        self._probing = False
+
+        self._latencies = np.zeros(LATENCY_WINDOW)
+        self._count = 0
+        self._timeout = MAX_TIMEOUT
+
+        self._state_gauge = metrics.CIRCUIT_STATE.labels(name)
+        self._timeout_gauge = metrics.CIRCUIT_TIMEOUT.labels(name)
+        self._rejections = metrics.CIRCUIT_REJECTIONS.labels(name)
+        self._state_gauge.set(STATE_VALUES[CLOSED])
+        self._timeout_gauge.set(self._timeout)
+
+    @property
+    def timeout(self) -> float:
+        """Seconds to wait for this source right now"""
+        return MAX_TIMEOUT if self.state == HALF_OPEN else self._timeout
+
+    @contextmanager
+    def guard(self):
+        """
+        Wrap one call to the source; yields the timeout to use.
+
+        Raises CircuitOpenError without calling when the circuit is open.
+        Any exception in the block counts as a failure, so callers should
+        raise on bad responses and parse inside it (e.g. raise_for_status()
+        and resp.json()). An interrupt (KeyboardInterrupt, CancelledError)
+        judges nothing but still frees the half-open probe slot.
+        """
+        probe = self._acquire()
+        start = time.perf_counter()
+        try:
+            yield MAX_TIMEOUT if probe else self._timeout
+        except Exception:
+            self._failure(probe)
+            raise
+        except BaseException:
+            self._release(probe)
+            raise
+        self._success(time.perf_counter() - start, probe)
+
+    # ============ STATE ============
+
+    def _acquire(self) -> bool:
+        """Let a call through (True if it is the half-open probe)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return False
+
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self._set_state(HALF_OPEN)
+
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+
+        self._rejections.inc()
+        raise CircuitOpenError(f"{self.name} circuit open")
+
+    def _success(self, latency: float, probe: bool):
+        with self._lock:
+            self._latencies[self._count % LATENCY_WINDOW] = latency
+            self._count += 1
+            if self._count >= MIN_SAMPLES:
+                p99 = float(np.percentile(self._latencies[:min(self._count, LATENCY_WINDOW)], 99))
+                self._timeout = min(max(p99 * TIMEOUT_FACTOR, MIN_TIMEOUT), MAX_TIMEOUT)
+                self._timeout_gauge.set(self._timeout)
+
+            self.failures = 0
+            if probe:
+                self._probing = False
+                self.reset_seconds = self.base_reset
+                self._set_state(CLOSED)
+                logger.info(f"Circuit {self.name} closed (probe took {latency:.2f}s)")
+
+    def _failure(self, probe: bool):
+        with self._lock:
+            self.failures += 1
+            if probe:
+                self._probing = False
+                self.reset_seconds = min(self.reset_seconds * 2, MAX_RESET_SECONDS)
+                self._open()
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def _release(self, probe: bool):
+        """Give up a call without a verdict; the next call may probe again"""
+        if probe:
+            with self._lock:
+                self._probing = False
+
+    def _open(self):
+        """Open the circuit (lock held)"""
+        self.opened_at = time.monotonic()
+        self._set_state(OPEN)
+        logger.warning(f"Circuit {self.name} open after {self.failures} failures, "
+                       f"retry in {self.reset_seconds:.0f}s")
+
+    def _set_state(self, state: str):
+        self.state = state
+        self._state_gauge.set(STATE_VALUES[state])
+
+    def status(self) -> dict:
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'timeout': round(self.timeout, 3),
+            'reset_seconds': self.reset_seconds
+        }
+
+
+# ============ REGISTRY ============
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def breaker(name: str) -> CircuitBreaker:
+    """Shared breaker for a source (created on first use)"""
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def all_breakers() -> Dict[str, CircuitBreaker]:
+    with _registry_lock:
+        return dict(_breakers)
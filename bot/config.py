@@ -18,11 +18,22 @@ class Config:
     # ============ AI PROVIDER ============
     DEEPSEEK_API_KEY: str = os.getenv('DEEPSEEK_API_KEY', '')
     DEEPSEEK_BASE_URL: str = os.getenv('DEEPSEEK_BASE_URL', 'https://api.deepseek.com')
+    AI_ENSEMBLE: str = os.getenv('AI_ENSEMBLE', '')  # model@base_url[|KEY_ENV],... (empty = deepseek-chat only)
+    AI_RESPONSE_FORMAT: str = os.getenv('AI_RESPONSE_FORMAT', 'json_object')  # json_object | json_schema | none
+    AI_ENSEMBLE_QUORUM: int = int(os.getenv('AI_ENSEMBLE_QUORUM', '2'))
+    AI_TIMEOUT_SECONDS: float = float(os.getenv('AI_TIMEOUT_SECONDS', '30'))
+    AI_HEDGE_ENABLED: bool = os.getenv('AI_HEDGE_ENABLED', 'true').lower() == 'true'
+    AI_HEDGE_AFTER_SECONDS: float = float(os.getenv('AI_HEDGE_AFTER_SECONDS', '10'))  # until a model's p95 is known
+    DECISION_PROVIDER: str = os.getenv('DECISION_PROVIDER', 'llm').lower()  # llm | local | hybrid
+    LOCAL_MODEL_PATH: str = os.getenv('LOCAL_MODEL_PATH', 'models/local_model.json')
+    HYBRID_LLM_INTERVAL: float = float(os.getenv('HYBRID_LLM_INTERVAL', '3600'))  # seconds between LLM bias refreshes
     
     # ============ EXCHANGE ============
     BINANCE_API_KEY: str = os.getenv('BINANCE_API_KEY', '')
     BINANCE_SECRET_KEY: str = os.getenv('BINANCE_SECRET_KEY', '')
     BINANCE_TESTNET: bool = os.getenv('BINANCE_TESTNET', 'true').lower() == 'true'
+    BINANCE_WS_URL: str = os.getenv('BINANCE_WS_URL', '')  # Override stream endpoint
+    BINANCE_REST_URL: str = os.getenv('BINANCE_REST_URL', '')  # Override REST host (e.g. local fake)
     
     # ============ TRADING CONFIG ============
     TRADING_SYMBOL: str = os.getenv('TRADING_SYMBOL', 'BTC/USDT')
@@ -32,25 +43,116 @@ class Config:
     STOP_LOSS_PERCENT: float = float(os.getenv('STOP_LOSS_PERCENT', '2'))
     TAKE_PROFIT_PERCENT: float = float(os.getenv('TAKE_PROFIT_PERCENT', '5'))
     
+    # ============ POSITION MONITOR ============
+    POSITION_MONITOR_ENABLED: bool = os.getenv('POSITION_MONITOR_ENABLED', 'true').lower() == 'true'
+    TRAILING_STOP_PERCENT: float = float(os.getenv('TRAILING_STOP_PERCENT', '1.5'))  # 0 = off
+    BREAKEVEN_TRIGGER_PERCENT: float = float(os.getenv('BREAKEVEN_TRIGGER_PERCENT', '1'))  # 0 = off
+    LIQUIDATION_ALERT_PERCENT: float = float(os.getenv('LIQUIDATION_ALERT_PERCENT', '5'))
+    
+    # ============ MARKET STREAMS ============
+    LIQUIDATION_TRACKER_ENABLED: bool = os.getenv('LIQUIDATION_TRACKER_ENABLED', 'true').lower() == 'true'
+    OI_SAMPLER_ENABLED: bool = os.getenv('OI_SAMPLER_ENABLED', 'true').lower() == 'true'
+    OI_POLL_INTERVAL: float = float(os.getenv('OI_POLL_INTERVAL', '60'))  # seconds
+    NEWS_POLL_INTERVAL: float = float(os.getenv('NEWS_POLL_INTERVAL', '120'))  # seconds, needs CRYPTOPANIC_API_KEY
+    NEWS_RESCAN_HOURS: float = float(os.getenv('NEWS_RESCAN_HOURS', '6'))  # posts voted important late are picked up within this
+    
     # ============ BOT SETTINGS ============
     ANALYSIS_INTERVAL: int = int(os.getenv('ANALYSIS_INTERVAL_SECONDS', '300'))
+    ADAPTIVE_SCHEDULE_ENABLED: bool = os.getenv('ADAPTIVE_SCHEDULE_ENABLED', 'true').lower() == 'true'
+    ANALYSIS_MIN_INTERVAL: int = int(os.getenv('ANALYSIS_MIN_INTERVAL_SECONDS', '60'))
+    ANALYSIS_MAX_INTERVAL: int = int(os.getenv('ANALYSIS_MAX_INTERVAL_SECONDS', '900'))
+    LLM_CALLS_PER_HOUR: int = int(os.getenv('LLM_CALLS_PER_HOUR', '30'))  # requests incl. ensemble members and hedges, 0 = unlimited
     LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
+    METRICS_ENABLED: bool = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_HOST: str = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT: int = int(os.getenv('METRICS_PORT', '9108'))
     DRY_RUN: bool = os.getenv('DRY_RUN', 'true').lower() == 'true'
     
+    # ============ FEATURE STORE ============
+    FEATURE_STORE_ENABLED: bool = os.getenv('FEATURE_STORE_ENABLED', 'false').lower() == 'true'
+    FEATURE_STORE_DIR: str = os.getenv('FEATURE_STORE_DIR', 'data/features')
+    FEATURE_STORE_FLUSH_ROWS: int = int(os.getenv('FEATURE_STORE_FLUSH_ROWS', '100'))
+    FEATURE_STORE_FLUSH_SECONDS: float = float(os.getenv('FEATURE_STORE_FLUSH_SECONDS', '60'))  # rows a crash can lose
+    RECORDER_ENABLED: bool = os.getenv('RECORDER_ENABLED', 'false').lower() == 'true'
+    RECORDER_DIR: str = os.getenv('RECORDER_DIR', 'data/recordings')  # one gzip JSONL file per session
+    RECORDER_KEEP_SESSIONS: int = int(os.getenv('RECORDER_KEEP_SESSIONS', '20'))  # older recordings deleted, 0 = keep all
+    
     # ============ DATA SOURCES ============
     COINGLASS_API_KEY: str = os.getenv('COINGLASS_API_KEY', '')
     CRYPTOPANIC_API_KEY: str = os.getenv('CRYPTOPANIC_API_KEY', '')
+    COINGLASS_BASE_URL: str = os.getenv('COINGLASS_BASE_URL', 'https://open-api.coinglass.com/public/v2')
+    CRYPTOPANIC_BASE_URL: str = os.getenv('CRYPTOPANIC_BASE_URL', 'https://cryptopanic.com/api/v1')
+    FEAR_GREED_BASE_URL: str = os.getenv('FEAR_GREED_BASE_URL', 'https://api.alternative.me')
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '3'))  # failures before a source is skipped
+    CIRCUIT_RESET_SECONDS: float = float(os.getenv('CIRCUIT_RESET_SECONDS', '30'))  # first wait before probing it again
     
     # ============ TELEGRAM ============
     TELEGRAM_BOT_TOKEN: str = os.getenv('TELEGRAM_BOT_TOKEN', '')
     TELEGRAM_CHAT_ID: str = os.getenv('TELEGRAM_CHAT_ID', '')
+    TELEGRAM_API_URL: str = os.getenv('TELEGRAM_API_URL', 'https://api.telegram.org')
+    TELEGRAM_COALESCE_SECONDS: float = float(os.getenv('TELEGRAM_COALESCE_SECONDS', '2'))
+    TELEGRAM_QUEUE_MAX: int = int(os.getenv('TELEGRAM_QUEUE_MAX', '50000'))
+    TELEGRAM_SENDER_WORKERS: int = int(os.getenv('TELEGRAM_SENDER_WORKERS', '8'))  # concurrent sendMessage calls
+    
+    # ============ TOKEN GATING ============
+    NEXUS_TOKEN_ADDRESSES: dict = dict(
+        item.split('=', 1) for item in os.getenv('NEXUS_TOKEN_ADDRESSES', '').split(',') if item
+    )  # e.g. base=0x...,bsc=0x...
+    TIER_RPC_TIMEOUT: float = float(os.getenv('TIER_RPC_TIMEOUT', '3'))
+    RPC_URLS: dict = {
+        chain: urls.split(',')
+        for chain, urls in (
+            item.split('=', 1) for item in os.getenv('RPC_URLS', '').split(';') if item
+        )
+    }  # e.g. base=https://a,https://b;bsc=https://c
+    TIER_PARTIAL_POLICY: str = os.getenv('TIER_PARTIAL_POLICY', 'partial')  # partial | strict
+    TIER_CACHE_ENABLED: bool = os.getenv('TIER_CACHE_ENABLED', 'true').lower() == 'true'
+    TIER_CACHE_TTL: float = float(os.getenv('TIER_CACHE_TTL', '3600'))
+    TIER_CACHE_POLL_INTERVAL: float = float(os.getenv('TIER_CACHE_POLL_INTERVAL', '5'))
+    
+    SIG_VERIFY_WORKERS: int = int(os.getenv('SIG_VERIFY_WORKERS', '0'))  # 0 = CPU count - 1
+    SIG_CACHE_SIZE: int = int(os.getenv('SIG_CACHE_SIZE', '10000'))
+    
+    # ============ TIER API ============
+    TIER_API_HOST: str = os.getenv('TIER_API_HOST', '127.0.0.1')
+    TIER_API_PORT: int = int(os.getenv('TIER_API_PORT', '8080'))
+    TIER_API_CACHE_TTL: float = float(os.getenv('TIER_API_CACHE_TTL', '10'))
+    TIER_API_CACHE_SIZE: int = int(os.getenv('TIER_API_CACHE_SIZE', '100000'))
+    TIER_API_RATE: float = float(os.getenv('TIER_API_RATE', '20'))  # requests/s per client
+    TIER_API_BURST: float = float(os.getenv('TIER_API_BURST', '40'))
+    TIER_API_KEY_RATE: float = float(os.getenv('TIER_API_KEY_RATE', '200'))  # requests/s per issued API key
+    TIER_API_KEY_BURST: float = float(os.getenv('TIER_API_KEY_BURST', '400'))
+    TIER_API_WORKERS: int = int(os.getenv('TIER_API_WORKERS', '32'))
+    TIER_API_CORS_ORIGIN: str = os.getenv('TIER_API_CORS_ORIGIN', '*')
+    TIER_API_KEYS: dict = dict(
+        item.split('=', 1) for item in os.getenv('TIER_API_KEYS', '').split(',') if item
+    )  # issued key -> owner wallet, e.g. k1=0x...,k2=0x...
+    
+    # ============ HOLDER INDEXER ============
+    INDEXER_ENABLED: bool = os.getenv('INDEXER_ENABLED', 'false').lower() == 'true'
+    INDEXER_DB_PATH: str = os.getenv('INDEXER_DB_PATH', 'holders.db')
+    INDEXER_START_BLOCKS: dict = {
+        chain: int(block)
+        for chain, block in (
+            item.split(':') for item in os.getenv('INDEXER_START_BLOCKS', '').split(',') if item
+        )
+    }  # e.g. base:12345678,bsc:34567890 (token deploy blocks)
+    INDEXER_CONFIRMATIONS: int = int(os.getenv('INDEXER_CONFIRMATIONS', '3'))
+    INDEXER_POLL_INTERVAL: float = float(os.getenv('INDEXER_POLL_INTERVAL', '5'))
+    INDEXER_MAX_LAG: int = int(os.getenv('INDEXER_MAX_LAG', '20'))  # blocks before falling back to RPC
+    
+    # ============ SIGNAL BROADCAST ============
+    BROADCAST_ENABLED: bool = os.getenv('BROADCAST_ENABLED', 'false').lower() == 'true'
+    BROADCAST_SUBSCRIBERS_FILE: str = os.getenv('BROADCAST_SUBSCRIBERS_FILE', 'subscribers.json')
+    BROADCAST_BATCH_SIZE: int = int(os.getenv('BROADCAST_BATCH_SIZE', '30'))
+    BROADCAST_BATCH_INTERVAL: float = float(os.getenv('BROADCAST_BATCH_INTERVAL', '1'))
     
     @classmethod
     def validate(cls) -> list:
         """Validate required config values"""
         errors = []
         
-        if not cls.DEEPSEEK_API_KEY:
+        if not cls.DEEPSEEK_API_KEY and cls.DECISION_PROVIDER != 'local':
             errors.append("DEEPSEEK_API_KEY is required")
         
         if not cls.BINANCE_API_KEY:
@@ -67,7 +169,7 @@ class Config:
         print("\n" + "="*50)
         print("NEXUS AI BOT - CONFIGURATION")
         print("="*50)
-        print(f"AI Provider: DeepSeek")
+        print(f"AI Provider: DeepSeek (decisions: {cls.DECISION_PROVIDER})")
         print(f"API Key: {'*' * 20}{cls.DEEPSEEK_API_KEY[-4:] if cls.DEEPSEEK_API_KEY else 'NOT SET'}")
         print(f"Exchange: Binance {'TESTNET' if cls.BINANCE_TESTNET else 'LIVE'}")
         print(f"Symbol: {cls.TRADING_SYMBOL}")
@@ -75,7 +177,11 @@ class Config:
         print(f"Position Size: {cls.POSITION_SIZE_PERCENT}%")
         print(f"Stop Loss: {cls.STOP_LOSS_PERCENT}%")
         print(f"Take Profit: {cls.TAKE_PROFIT_PERCENT}%")
-        print(f"Analysis Interval: {cls.ANALYSIS_INTERVAL}s")
+        print(f"Position Monitor: {'ON' if cls.POSITION_MONITOR_ENABLED else 'OFF'} (trail {cls.TRAILING_STOP_PERCENT}%, break-even {cls.BREAKEVEN_TRIGGER_PERCENT}%)")
+        if cls.ADAPTIVE_SCHEDULE_ENABLED:
+            print(f"Analysis Interval: {cls.ANALYSIS_INTERVAL}s adaptive ({cls.ANALYSIS_MIN_INTERVAL}-{cls.ANALYSIS_MAX_INTERVAL}s, {cls.LLM_CALLS_PER_HOUR} LLM calls/h)")
+        else:
+            print(f"Analysis Interval: {cls.ANALYSIS_INTERVAL}s")
         print(f"Dry Run: {cls.DRY_RUN}")
         print("="*50 + "\n")
 
@@ -0,0 +1,425 @@
+"""
+NEXUS AI Trading Bot - Cycle Recorder
+======================================
+Records every upstream response of an analysis cycle and replays them offline
+
+Usage:
+    python cycle_recorder.py data/recordings/session-20260101-000000.jsonl.gz
+    python cycle_recorder.py <recording> --cycle 1767225600000 --profile
+"""
+
+import gzip
+import json
+import time
+import argparse
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from loguru import logger
+from config import config
+from decision import DecisionParseError
+from typing import Callable, Dict, List, Optional
+
+# Exchange methods the cycle calls (reads and orders)
+EXCHANGE_METHODS = (
+    'get_ticker', 'get_orderbook', 'get_ohlcv', 'get_funding_rate', 'get_balance', 'get_positions',
+    'market_order', 'limit_order', 'set_stop_loss', 'set_take_profit', 'close_position',
+    'close_all_positions', 'cancel_all_orders', 'calculate_position_size',
+)
+
+# Background components whose in-memory state the cycle reads
+STATE_SOURCES = ('liquidations', 'open_interest', 'news')
+
+
+class RecordedError(Exception):
+    """An upstream call that failed when it was recorded"""
+
+
+class ReplayError(Exception):
+    """The replayed cycle made a call the recording doesn't have"""
+
+
+# ============ LLM OUTCOMES ============
+
+def _encode_llm(outcome: dict, args: tuple, kwargs: dict) -> dict:
+    """Raw answers only; parsing is redone on replay (parse errors come back with them)"""
+    return {
+        'winner': outcome['winner'],
+        'answers': outcome.get('answers', []),
+        'requests': outcome.get('requests', 0),
+        'errors': [[name, str(error)] for name, error in outcome['errors']
+                   if not isinstance(error, DecisionParseError)]
+    }
+
+
+def _decode_llm(value: dict, args: tuple, kwargs: dict) -> dict:
+    parse = kwargs['parse'] if 'parse' in kwargs else args[1]
+    results, errors = [], []
+    for name, text in value['answers']:
+        try:
+            results.append((name, parse(text, name)))
+        except Exception as e:
+            errors.append((name, e))
+    errors.extend((name, RecordedError(message)) for name, message in value['errors'])
+    return {'winner': value['winner'], 'results': results, 'errors': errors, 'answers': value['answers'],
+            'requests': value.get('requests', 0)}
+
+
+def _http_name(args: tuple) -> str:
+    # DataFetcher._get_json(circuit, upstream, endpoint, url): one queue per endpoint
+    return f"{args[1]}.{args[2]}"
+
+
+def _targets(trader) -> Dict[str, tuple]:
+    """
+    source -> (object, methods, encode, decode, name) for the recorded upstreams of a Trader
+
+    `name(args)` replaces the method name in the call key when one method
+    serves several upstreams.
+    """
+    fetcher = trader.data_fetcher
+    targets = {
+        'exchange': (trader.exchange, EXCHANGE_METHODS, None, None, None),
+        'http': (fetcher, ('_get_json',), None, None, _http_name),
+    }
+    for source in STATE_SOURCES:
+        targets[source] = (getattr(fetcher, source), ('snapshot',), None, None, None)
+    if trader.ai:
+        targets['llm'] = (trader.ai.ensemble, ('run',), _encode_llm, _decode_llm, None)
+    return {source: target for source, target in targets.items() if target[0] is not None}
+
+
+def _call_name(source: str, method: str, name: Optional[Callable], args: tuple) -> str:
+    return f"{source}.{name(args) if name else method}"
+
+
+def _json_default(value):
+    # numpy scalars and anything else exotic in a response
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, separators=(',', ':'), default=_json_default)
+
+
+# ============ RECORD ============
+
+class CycleRecorder:
+    """
+    Wraps the Trader's upstream calls and appends one gzip JSON line per cycle:
+
+        {"cycle": id, "time": t, "symbol": s, "decision": {...},
+         "calls": [["exchange.get_ticker", result], ["http.coinglass.long_short", null, "error"], ...]}
+
+    Only calls made on the cycle's own thread are captured; background
+    pollers and the position monitor talk to the same objects but aren't
+    part of the cycle. Calls nested inside a recorded call (e.g. the balance
+    lookup in calculate_position_size) are left to the outer one. A cycle is
+    written when the next one begins, or on close. Only the newest
+    RECORDER_KEEP_SESSIONS recordings are kept; older ones are deleted when
+    a new session starts.
+    """
+
+    def __init__(self, directory: str = None, keep_sessions: int = None):
+        self.directory = Path(directory or config.RECORDER_DIR)
+        self.path = self.directory / f"session-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl.gz"
+        self.keep_sessions = config.RECORDER_KEEP_SESSIONS if keep_sessions is None else keep_sessions
+        self._file = None
+        self._cycle: Optional[dict] = None
+        self._thread = None
+        self._depth = 0
+        self._lock = threading.Lock()
+
+        # Stats
+        self.cycles = 0
+        self.bytes = 0
+
+    def attach(self, trader) -> None:
+        """Wrap the upstream methods of `trader`'s components"""
+        for source, (target, methods, encode, _, name) in _targets(trader).items():
+            for method in methods:
+                if hasattr(target, method):
+                    setattr(target, method, self._wrap(source, method, getattr(target, method), encode, name))
+        self._prune()
+        logger.info(f"Recording cycles to {self.path}")
+
+    def begin(self, cycle_id: int, timestamp: float, symbol: str) -> None:
+        """Start capturing a cycle on the calling thread (writes the previous one)"""
+        with self._lock:
+            self._write()
+            self._cycle = {'cycle': cycle_id, 'time': timestamp, 'symbol': symbol, 'decision': None, 'calls': []}
+            self._thread = threading.get_ident()
+
+    def set_decision(self, decision) -> None:
+        """The cycle's decision, stored to check replays against"""
+        if self._cycle is not None:
+            self._cycle['decision'] = decision.to_dict()
+
+    def close(self) -> None:
+        with self._lock:
+            self._write()
+            self._thread = None
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _wrap(self, source: str, method: str, func: Callable, encode: Optional[Callable],
+              name: Optional[Callable]) -> Callable:
+        def recorded(*args, **kwargs):
+            cycle = self._cycle
+            if cycle is None or self._depth or threading.get_ident() != self._thread:
+                return func(*args, **kwargs)
+
+            key = _call_name(source, method, name, args)
+            self._depth += 1
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                cycle['calls'].append(_dumps([key, None, f"{type(e).__name__}: {e}"]))
+                raise
+            finally:
+                self._depth -= 1
+            # Encoded now: callers may modify the result afterwards (e.g. snapshot dicts)
+            cycle['calls'].append(_dumps([key, encode(result, args, kwargs) if encode else result]))
+            return result
+
+        return recorded
+
+    def _prune(self) -> None:
+        """Delete all but the newest keep_sessions - 1 recordings, leaving room for this one"""
+        if self.keep_sessions <= 0:
+            return
+        sessions = sorted(self.directory.glob('session-*.jsonl.gz'))
+        for path in sessions[:max(len(sessions) - (self.keep_sessions - 1), 0)]:
+            try:
+                path.unlink()
+                logger.debug(f"Removed old recording {path.name}")
+            except OSError as e:
+                logger.warning(f"Could not remove old recording {path}: {e}")
+
+    def _write(self) -> None:
+        cycle, self._cycle = self._cycle, None
+        if cycle is None:
+            return
+        try:
+            calls = ','.join(cycle.pop('calls'))
+            line = f'{_dumps(cycle)[:-1]},"calls":[{calls}]}}\n'
+            if self._file is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._file = gzip.open(self.path, 'at', encoding='utf-8')
+            self._file.write(line)
+            # Sync flush: a crash loses at most the cycle in progress
+            self._file.flush()
+            self.cycles += 1
+            self.bytes += len(line)
+        except Exception as e:
+            logger.error(f"Could not record cycle {cycle['cycle']}: {e}")
+
+
+# ============ REPLAY ============
+
+def load_recording(path: str) -> List[dict]:
+    """Every complete cycle in a recording (a torn last line is skipped)"""
+    cycles = []
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        try:
+            for line in f:
+                cycles.append(json.loads(line))
+        except (EOFError, ValueError) as e:
+            logger.warning(f"{path}: stopped after {len(cycles)} cycles ({e})")
+    return cycles
+
+
+class _ReplaySource:
+    """Stand-in for a component that only answers from the recording"""
+
+    def __init__(self, symbol: str = None):
+        self.symbol = symbol
+
+
+class CycleReplayer:
+    """
+    Serves a recording back to a Trader built without network access.
+
+    Each recorded call is returned (or its error re-raised as RecordedError)
+    in the order it was made, per method. A call the recording doesn't have
+    raises ReplayError. The Trader's clock returns the recorded cycle time,
+    so cycle ids, snapshot timestamps and time-based logic (e.g. the hybrid
+    LLM refresh) match the original run. Config decides the decision
+    provider, so recorded traffic can be replayed against another one.
+    build_trader() switches off the live-only parts of the config;
+    restore_config() puts them back.
+    """
+
+    def __init__(self, cycles: List[dict]):
+        self.cycles = cycles
+        self.current: Optional[dict] = None
+        self._saved_config: Dict[str, object] = {}
+        self._calls: Dict[str, deque] = {}
+        self.recorded = {call[0] for cycle in cycles for call in cycle['calls']}
+        self.recorded_sources = {name.split('.')[0] for name in self.recorded}
+
+    def build_trader(self):
+        """A Trader whose upstreams are the recording: no network, streams, Telegram or files"""
+        from trader import Trader
+
+        overrides = {
+            'RECORDER_ENABLED': False,
+            'FEATURE_STORE_ENABLED': False,
+            'POSITION_MONITOR_ENABLED': False,
+            'LIQUIDATION_TRACKER_ENABLED': False,
+            'OI_SAMPLER_ENABLED': False,
+            'BROADCAST_ENABLED': False,
+            'CRYPTOPANIC_API_KEY': '',
+            'TELEGRAM_BOT_TOKEN': '',
+        }
+        if any(name.startswith('http.coinglass.') for name in self.recorded) and not config.COINGLASS_API_KEY:
+            overrides['COINGLASS_API_KEY'] = 'replay'  # take the Coinglass branch the recording went through
+        if 'llm' in self.recorded_sources and not config.DEEPSEEK_API_KEY:
+            overrides['DEEPSEEK_API_KEY'] = 'replay'
+
+        for name, value in overrides.items():
+            self._saved_config.setdefault(name, getattr(config, name))
+            setattr(config, name, value)
+
+        symbol = self.cycles[0]['symbol'] if self.cycles else config.TRADING_SYMBOL
+        trader = Trader(exchange=_ReplaySource(symbol))
+        trader.clock = lambda: self.current['time']
+
+        fetcher = trader.data_fetcher
+        for source in STATE_SOURCES:
+            if source in self.recorded_sources:
+                setattr(fetcher, source, _ReplaySource())
+
+        for source, (target, methods, _, decode, name) in _targets(trader).items():
+            for method in methods:
+                setattr(target, method, self._serve(source, method, decode, name))
+        return trader
+
+    def restore_config(self) -> None:
+        """Undo build_trader()'s config changes"""
+        for name, value in self._saved_config.items():
+            setattr(config, name, value)
+        self._saved_config.clear()
+
+    def load(self, cycle: dict) -> None:
+        """Queue one recorded cycle's calls"""
+        self.current = cycle
+        self._calls = {}
+        for call in cycle['calls']:
+            self._calls.setdefault(call[0], deque()).append(call)
+
+    def unused(self) -> Dict[str, int]:
+        """Recorded calls of the current cycle the replay didn't make"""
+        return {name: len(calls) for name, calls in self._calls.items() if calls}
+
+    def _serve(self, source: str, method: str, decode: Optional[Callable], name: Optional[Callable]) -> Callable:
+        def replayed(*args, **kwargs):
+            key = _call_name(source, method, name, args)
+            calls = self._calls.get(key)
+            if not calls:
+                raise ReplayError(f"cycle {self.current['cycle']}: no recorded {key} call left")
+            call = calls.popleft()
+            if len(call) > 2:
+                raise RecordedError(call[2])
+            return decode(call[1], args, kwargs) if decode else call[1]
+
+        return replayed
+
+
+def replay(path: str, stop_at: int = None, on_cycle: Callable = None) -> dict:
+    """
+    Run every recorded cycle through Trader.run_analysis / execute_decision /
+    check_positions at full speed, as NexusBot.analysis_cycle would
+
+    Args:
+        stop_at: Last cycle id to replay (earlier ones still run to rebuild candle state)
+        on_cycle: Called with (recorded cycle, trader) after each cycle
+
+    Returns:
+        {'cycles', 'latencies', 'diverged': [(cycle id, recorded, replayed)], 'errors': [(cycle id, error)]}
+    """
+    replayer = CycleReplayer(load_recording(path))
+    latencies, diverged, errors = [], [], []
+
+    try:
+        trader = replayer.build_trader()
+    except Exception:
+        replayer.restore_config()
+        raise
+
+    try:
+        for cycle in replayer.cycles:
+            replayer.load(cycle)
+            start = time.perf_counter()
+            try:
+                decision = trader.run_analysis()
+                if decision.get('decision') != 'WAIT' and decision.get('confidence', 0) >= 70:
+                    trader.execute_decision(decision)
+                trader.check_positions()
+            except ReplayError as e:
+                errors.append((cycle['cycle'], str(e)))
+                logger.warning(str(e))
+                continue
+            latencies.append(time.perf_counter() - start)
+
+            recorded = cycle.get('decision') or {}
+            if (recorded.get('decision'), recorded.get('confidence')) != (decision.decision, decision.confidence):
+                diverged.append((cycle['cycle'], recorded.get('decision'), decision.decision))
+            if replayer.unused():
+                logger.debug(f"Cycle {cycle['cycle']}: unused recorded calls {replayer.unused()}")
+            if on_cycle:
+                on_cycle(cycle, trader)
+            if stop_at and cycle['cycle'] >= stop_at:
+                break
+    finally:
+        trader.shutdown()
+        replayer.restore_config()
+
+    return {'cycles': len(latencies) + len(errors), 'latencies': latencies, 'diverged': diverged, 'errors': errors}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded analysis cycles offline")
+    parser.add_argument('recording', help="session-*.jsonl.gz from RECORDER_DIR")
+    parser.add_argument('--cycle', type=int, help="stop after this cycle id and print its snapshot")
+    parser.add_argument('--profile', action='store_true', help="cProfile the replay")
+    parser.add_argument('--log-level', default='WARNING')
+    args = parser.parse_args(argv)
+
+    import sys
+    from benchmark import percentiles
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+    config.METRICS_ENABLED = False
+
+    def show(cycle, trader):
+        if args.cycle and cycle['cycle'] == args.cycle:
+            print(f"\nCycle {cycle['cycle']}: {trader.last_market_data}")
+            print(f"Recorded: {cycle.get('decision')}\nReplayed: {trader.last_decision.to_dict()}")
+
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    result = replay(args.recording, stop_at=args.cycle, on_cycle=show)
+
+    if profiler:
+        import pstats
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
+
+    print(f"\n{result['cycles']} cycles replayed: {percentiles(result['latencies'])} (ms)")
+    print(f"{len(result['diverged'])} decisions differ from the recording, {len(result['errors'])} cycles failed")
+    for cycle_id, recorded, replayed in result['diverged'][:20]:
+        print(f"  {cycle_id}: recorded {recorded}, replayed {replayed}")
+    for cycle_id, error in result['errors'][:20]:
+        print(f"  {cycle_id}: {error}")
+    return 1 if result['errors'] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,237 +4,239 @@ NEXUS AI Trading Bot - Data Fetcher
 Aggregates data from multiple sources
 """
 
+import time
 import requests
+import numpy as np
+import metrics
 from loguru import logger
 from config import config
 from exchange import Exchange
+from market_state import CandleBuffer, MarketSnapshot, rsi, macd, ema, atr
+from microstructure import OrderBookFeatures, BOOK_DEPTH
+from liquidations import LiquidationTracker
+from oi_sampler import OpenInterestSampler
+from news_ingester import NewsIngester
+from circuit_breaker import breaker
 from typing import Optional, Dict
-import ta
-import pandas as pd
+
+OHLCV_TIMEFRAME = '1h'
+OHLCV_HISTORY = 100   # candles the indicators look at
+OHLCV_REFRESH = 3     # candles re-fetched per cycle once the buffer is full
 
 
 class DataFetcher:
     """Fetches and aggregates market data from multiple sources"""
     
-    def __init__(self, exchange: Exchange):
+    def __init__(self, exchange: Exchange, liquidations: LiquidationTracker = None,
+                 open_interest: OpenInterestSampler = None, news: NewsIngester = None):
         self.exchange = exchange
-        self.coinglass_base = "https://open-api.coinglass.com/public/v2"
-        self.cryptopanic_base = "https://cryptopanic.com/api/v1"
-        self.alternative_me = "https://api.alternative.me"
-        
-    def get_all_data(self) -> dict:
-        """Aggregate all data sources into one dict"""
+        self.liquidations = liquidations
+        self.open_interest = open_interest
+        self.news = news
+        self.coinglass_base = config.COINGLASS_BASE_URL
+        self.alternative_me = config.FEAR_GREED_BASE_URL
+        self.coinglass_circuit = breaker('coinglass')
+        self.fear_greed_circuit = breaker('fear_greed')
+        self.candles = CandleBuffer(OHLCV_HISTORY)
+        self.book_features = OrderBookFeatures()
+        
+    @metrics.timed('data_fetcher.get_all_data')
+    def get_all_data(self, timestamp: float = None) -> MarketSnapshot:
+        """
+        Aggregate all data sources into one snapshot (raw values, unformatted)
+        
+        Args:
+            timestamp: Cycle time for the snapshot (defaults to now)
+        """
         
         data = {}
         
         # Exchange data (always available)
-        data.update(self._get_exchange_data())
+        with metrics.track('data_fetcher.exchange'):
+            data.update(self._get_exchange_data())
         
         # Technical indicators
-        data.update(self._get_technical_indicators())
+        with metrics.track('data_fetcher.indicators'):
+            data.update(self._get_technical_indicators())
+        
+        # Order book microstructure
+        with metrics.track('data_fetcher.orderbook'):
+            data.update(self._get_orderbook_features())
         
-        # Funding & OI (Coinglass or exchange)
-        data.update(self._get_derivatives_data())
+        # Funding & OI (local sampler, Coinglass or exchange)
+        with metrics.track('data_fetcher.derivatives'):
+            data.update(self._get_derivatives_data())
+        
+        # Liquidations (local stream state, no request)
+        if self.liquidations:
+            with metrics.track('data_fetcher.liquidations'):
+                data.update(self.liquidations.snapshot(data.get('price')))
         
         # Fear & Greed
-        data.update(self._get_sentiment_data())
+        with metrics.track('data_fetcher.sentiment'):
+            data.update(self._get_sentiment_data())
         
-        # News
-        data.update(self._get_news_data())
+        # News (local ingester state, no request)
+        with metrics.track('data_fetcher.news'):
+            data.update(self._get_news_data())
         
-        return data
+        return MarketSnapshot(self.exchange.symbol, timestamp=timestamp or time.time(), **data)
+    
+    def _get_json(self, circuit, upstream: str, endpoint: str, url: str, **kwargs):
+        """GET a JSON API through its circuit breaker"""
+        with circuit.guard() as timeout, metrics.track_upstream(upstream, endpoint):
+            resp = requests.get(url, timeout=timeout, **kwargs)
+            resp.raise_for_status()
+            # A 200 with a garbage body is a failure of the source too
+            return resp.json()
     
     def _get_exchange_data(self) -> dict:
         """Get data from exchange"""
         ticker = self.exchange.get_ticker()
         
         return {
-            'price': ticker.get('price', 0),
-            'bid': ticker.get('bid', 0),
-            'ask': ticker.get('ask', 0),
-            'high_24h': ticker.get('high_24h', 0),
-            'low_24h': ticker.get('low_24h', 0),
-            'volume_24h': self._format_number(ticker.get('volume_24h', 0)),
-            'change_24h': round(ticker.get('change_24h', 0), 2)
+            'price': ticker.get('price'),
+            'bid': ticker.get('bid'),
+            'ask': ticker.get('ask'),
+            'high_24h': ticker.get('high_24h'),
+            'low_24h': ticker.get('low_24h'),
+            'volume_24h': ticker.get('volume_24h'),
+            'change_24h': ticker.get('change_24h')
         }
     
     def _get_technical_indicators(self) -> dict:
-        """Calculate technical indicators from OHLCV"""
+        """Calculate technical indicators from the candle buffer"""
         try:
-            ohlcv = self.exchange.get_ohlcv('1h', 100)
+            self._refresh_candles()
             
-            if not ohlcv:
+            close = self.candles.close
+            if not len(close):
                 return {}
             
-            # Convert to DataFrame
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            
-            # RSI
-            rsi = ta.momentum.RSIIndicator(df['close'], window=14)
-            current_rsi = round(rsi.rsi().iloc[-1], 1)
-            
-            # MACD
-            macd = ta.trend.MACD(df['close'])
-            macd_line = macd.macd().iloc[-1]
-            signal_line = macd.macd_signal().iloc[-1]
-            macd_signal = "Bullish crossover" if macd_line > signal_line else "Bearish crossover"
-            
-            # EMAs
-            ema20 = ta.trend.EMAIndicator(df['close'], window=20).ema_indicator().iloc[-1]
-            ema50 = ta.trend.EMAIndicator(df['close'], window=50).ema_indicator().iloc[-1]
-            current_price = df['close'].iloc[-1]
-            
-            ema_20_position = "Price above" if current_price > ema20 else "Price below"
-            ema_50_position = "Price above" if current_price > ema50 else "Price below"
+            macd_values = macd(close)
+            atr_values = atr(self.candles.candles, 14)
             
             return {
-                'rsi': current_rsi,
-                'macd_signal': macd_signal,
-                'ema_20_position': ema_20_position,
-                'ema_50_position': ema_50_position
+                'rsi': rsi(close, 14),
+                'macd': macd_values[0] if macd_values else None,
+                'macd_signal': macd_values[1] if macd_values else None,
+                'ema_20': float(ema(close, 20)[-1]) if len(close) >= 20 else None,
+                'ema_50': float(ema(close, 50)[-1]) if len(close) >= 50 else None,
+                'atr': float(atr_values[-1]) if len(atr_values) else None,
+                'atr_ratio': self._atr_ratio(atr_values)
             }
             
         except Exception as e:
             logger.warning(f"Error calculating indicators: {e}")
-            return {
-                'rsi': 'N/A',
-                'macd_signal': 'N/A',
-                'ema_20_position': 'N/A',
-                'ema_50_position': 'N/A'
-            }
+            metrics.fallback('indicators')
+            return {}
+    
+    @staticmethod
+    def _atr_ratio(atr_values) -> Optional[float]:
+        """Current ATR vs its median over the buffer (1 = usual volatility); None on flat candles"""
+        if not len(atr_values):
+            return None
+        median = np.median(atr_values)
+        if not median > 0:
+            return None
+        ratio = float(atr_values[-1] / median)
+        return ratio if np.isfinite(ratio) else None
+    
+    def _get_orderbook_features(self) -> dict:
+        """Imbalance, liquidity bands, microprice and spread z-score from the book"""
+        orderbook = self.exchange.get_orderbook(BOOK_DEPTH)
+        if not orderbook:
+            return {}
+        try:
+            with metrics.track('features.orderbook'):
+                return self.book_features.compute(orderbook)
+        except Exception as e:
+            logger.warning(f"Error calculating orderbook features: {e}")
+            metrics.fallback('orderbook')
+            return {}
+    
+    def _refresh_candles(self):
+        """Top up the candle buffer, fetching only the latest candles once warm"""
+        
+        if len(self.candles) < OHLCV_HISTORY:
+            self.candles.update(self.exchange.get_ohlcv(OHLCV_TIMEFRAME, OHLCV_HISTORY))
+            return
+        
+        rows = self.exchange.get_ohlcv(OHLCV_TIMEFRAME, OHLCV_REFRESH)
+        if rows and rows[0][0] > self.candles.last_timestamp:
+            # Candles were missed (e.g. downtime): reload the full window
+            self.candles.clear()
+            rows = self.exchange.get_ohlcv(OHLCV_TIMEFRAME, OHLCV_HISTORY)
+        
+        self.candles.update(rows)
     
     def _get_derivatives_data(self) -> dict:
-        """Get funding rate, OI, liquidations from Coinglass or exchange"""
-        
-        # Try exchange first (always available)
-        funding = self.exchange.get_funding_rate()
-        
-        data = {
-            'funding_rate': round(funding, 4) if funding else 'N/A',
-            'open_interest': 'N/A',
-            'oi_change_1h': 'N/A',
-            'long_short_ratio': 'N/A',
-            'long_liquidations': 'N/A',
-            'short_liquidations': 'N/A',
-            'nearest_long_liq': 'N/A',
-            'nearest_short_liq': 'N/A'
-        }
+        """Get funding rate, OI and OI deltas from the local sampler, Coinglass or exchange"""
+        
+        # Local sampler: memory only, no request
+        data = self.open_interest.snapshot() if self.open_interest else {}
+        
+        if data.get('funding_rate') is None:
+            data['funding_rate'] = self.exchange.get_funding_rate()
         
         # Try Coinglass for more data
         if config.COINGLASS_API_KEY:
             try:
                 headers = {'coinglassSecret': config.COINGLASS_API_KEY}
                 
-                # Open Interest
-                oi_resp = requests.get(
-                    f"{self.coinglass_base}/open_interest",
-                    headers=headers,
-                    params={'symbol': 'BTC'},
-                    timeout=5
-                )
-                if oi_resp.status_code == 200:
-                    oi_data = oi_resp.json().get('data', {})
-                    data['open_interest'] = self._format_number(oi_data.get('openInterest', 0))
+                # Open Interest (only when the sampler has none yet)
+                if data.get('open_interest') is None:
+                    oi_data = self._get_json(
+                        self.coinglass_circuit, 'coinglass', 'open_interest',
+                        f"{self.coinglass_base}/open_interest",
+                        headers=headers,
+                        params={'symbol': 'BTC'}
+                    ).get('data', {})
+                    data['open_interest'] = oi_data.get('openInterest')
                 
                 # Long/Short Ratio
-                ls_resp = requests.get(
+                ls_data = self._get_json(
+                    self.coinglass_circuit, 'coinglass', 'long_short',
                     f"{self.coinglass_base}/long_short",
                     headers=headers,
-                    params={'symbol': 'BTC', 'interval': '1h'},
-                    timeout=5
-                )
-                if ls_resp.status_code == 200:
-                    ls_data = ls_resp.json().get('data', [])
-                    if ls_data:
-                        data['long_short_ratio'] = round(ls_data[-1].get('longRate', 50) / max(ls_data[-1].get('shortRate', 50), 1), 2)
+                    params={'symbol': 'BTC', 'interval': '1h'}
+                ).get('data', [])
+                if ls_data:
+                    data['long_short_ratio'] = ls_data[-1].get('longRate', 50) / max(ls_data[-1].get('shortRate', 50), 1)
                 
             except Exception as e:
                 logger.debug(f"Coinglass API error: {e}")
+                metrics.fallback('coinglass')
         
         return data
     
     def _get_sentiment_data(self) -> dict:
         """Get Fear & Greed Index"""
         try:
-            resp = requests.get(f"{self.alternative_me}/fng/", timeout=5)
-            if resp.status_code == 200:
-                data = resp.json().get('data', [{}])[0]
-                return {
-                    'fear_greed': int(data.get('value', 50)),
-                    'fear_greed_label': data.get('value_classification', 'Neutral')
-                }
+            data = self._get_json(self.fear_greed_circuit, 'alternative_me', 'fng',
+                                  f"{self.alternative_me}/fng/").get('data', [{}])[0]
+            return {
+                'fear_greed': int(data.get('value', 50)),
+                'fear_greed_label': data.get('value_classification', 'Neutral')
+            }
         except Exception as e:
             logger.debug(f"Fear & Greed API error: {e}")
         
+        metrics.fallback('fear_greed')
         return {
             'fear_greed': 50,
             'fear_greed_label': 'Neutral'
         }
     
     def _get_news_data(self) -> dict:
-        """Get latest crypto news"""
-        news_items = []
-        
-        if config.CRYPTOPANIC_API_KEY:
-            try:
-                resp = requests.get(
-                    f"{self.cryptopanic_base}/posts/",
-                    params={
-                        'auth_token': config.CRYPTOPANIC_API_KEY,
-                        'currencies': 'BTC',
-                        'kind': 'news',
-                        'filter': 'important'
-                    },
-                    timeout=5
-                )
-                if resp.status_code == 200:
-                    results = resp.json().get('results', [])[:5]
-                    for item in results:
-                        sentiment = "Neutral"
-                        votes = item.get('votes', {})
-                        if votes.get('positive', 0) > votes.get('negative', 0):
-                            sentiment = "Bullish"
-                        elif votes.get('negative', 0) > votes.get('positive', 0):
-                            sentiment = "Bearish"
-                        
-                        news_items.append(f"[{sentiment}] {item.get('title', '')}")
-                        
-            except Exception as e:
-                logger.debug(f"CryptoPanic API error: {e}")
-        
-        news_text = "\n".join(news_items) if news_items else "No recent news available"
-        
-        # Overall news sentiment
-        bullish_count = sum(1 for n in news_items if 'Bullish' in n)
-        bearish_count = sum(1 for n in news_items if 'Bearish' in n)
-        
-        if bullish_count > bearish_count:
-            news_sentiment = "Bullish"
-        elif bearish_count > bullish_count:
-            news_sentiment = "Bearish"
-        else:
-            news_sentiment = "Neutral"
+        """Latest crypto news (from the ingester's memory, no request)"""
+        if self.news:
+            return self.news.snapshot()
         
         return {
-            'news': news_text,
-            'news_sentiment': news_sentiment,
-            'social_volume': 'N/A'
+            'news': [],
+            'news_sentiment': "Neutral"
         }
-    
-    def _format_number(self, num) -> str:
-        """Format large numbers (1B, 1M, etc)"""
-        try:
-            num = float(num)
-            if num >= 1_000_000_000:
-                return f"{num/1_000_000_000:.1f}B"
-            elif num >= 1_000_000:
-                return f"{num/1_000_000:.1f}M"
-            elif num >= 1_000:
-                return f"{num/1_000:.1f}K"
-            else:
-                return str(round(num, 2))
-        except:
-            return str(num)
 
 
 # Test if run directly
@@ -247,5 +249,5 @@ if __name__ == "__main__":
     data = fetcher.get_all_data()
     
     print("\n=== AGGREGATED MARKET DATA ===")
-    for key, value in data.items():
+    for key, value in data.to_dict().items():
         print(f"{key}: {value}")
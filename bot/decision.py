@@ -0,0 +1,226 @@
+"""
+NEXUS AI Trading Bot - Decision
+================================
+Trading decision schema, strict parsing and field clamping
+"""
+
+import re
+import json
+import metrics
+from typing import Optional
+
+ACTIONS = ('LONG', 'SHORT', 'WAIT')
+RISK_LEVELS = ('LOW', 'MEDIUM', 'HIGH')
+
+# Price fields further than this from the market price are clamped (fraction of price)
+MAX_ENTRY_DISTANCE = 0.05
+MAX_STOP_DISTANCE = 0.20
+MAX_TARGET_DISTANCE = 0.50
+
+MAX_REASONING = 300
+
+# Markdown code fence around the JSON, with or without a newline after it
+FENCE_OPEN = re.compile(r'^```(?:json)?\s*', re.IGNORECASE)
+FENCE_CLOSE = re.compile(r'\s*```$')
+
+# JSON schema sent to models that support structured outputs (json_schema response format)
+DECISION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "decision": {"type": "string", "enum": list(ACTIONS)},
+        "confidence": {"type": "integer", "minimum": 0, "maximum": 100},
+        "reasoning": {"type": "string"},
+        "entry_price": {"type": ["number", "null"]},
+        "stop_loss": {"type": ["number", "null"]},
+        "take_profit": {"type": ["number", "null"]},
+        "risk_level": {"type": "string", "enum": list(RISK_LEVELS)}
+    },
+    "required": ["decision", "confidence", "reasoning", "entry_price", "stop_loss", "take_profit", "risk_level"],
+    "additionalProperties": False
+}
+
+
+def response_format(kind: str) -> Optional[dict]:
+    """OpenAI `response_format` for 'json_schema', 'json_object' or 'none'"""
+    if kind == 'json_schema':
+        return {"type": "json_schema",
+                "json_schema": {"name": "trading_decision", "strict": True, "schema": DECISION_SCHEMA}}
+    if kind == 'json_object':
+        return {"type": "json_object"}
+    return None
+
+
+class DecisionParseError(ValueError):
+    """Model output is not a valid decision"""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class Decision:
+    """
+    One validated trading decision.
+
+    Reads like the old dict (`get`, `[]`, `to_dict`) so callers that expect
+    {'decision': ..., 'confidence': ...} keep working.
+    """
+
+    __slots__ = ('decision', 'confidence', 'reasoning', 'entry_price', 'stop_loss',
+                 'take_profit', 'risk_level', 'votes', 'source')
+
+    def __init__(self, decision: str = 'WAIT', confidence: int = 0, reasoning: str = '',
+                 entry_price: float = None, stop_loss: float = None, take_profit: float = None,
+                 risk_level: str = 'HIGH', votes: dict = None, source: str = None):
+        self.decision = decision
+        self.confidence = confidence
+        self.reasoning = reasoning
+        self.entry_price = entry_price
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.risk_level = risk_level
+        self.votes = votes
+        self.source = source
+
+    @classmethod
+    def wait(cls, reasoning: str) -> "Decision":
+        """Safe no-trade decision"""
+        return cls('WAIT', 0, reasoning, risk_level='HIGH')
+
+    @property
+    def is_fallback(self) -> bool:
+        """True for a wait() stand-in (error, no quorum), not an answer from a model"""
+        return self.source is None
+
+    def get(self, name: str, default=None):
+        value = getattr(self, name, None) if name in self.__slots__ else None
+        return default if value is None else value
+
+    def __getitem__(self, name: str):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"Decision({self.decision}, {self.confidence}%, risk={self.risk_level})"
+
+
+# ============ PARSING ============
+
+def _action(value) -> str:
+    action = str(value).strip().upper() if value is not None else ''
+    if action not in ACTIONS:
+        raise DecisionParseError('schema', f"decision must be one of {ACTIONS}, got {value!r}")
+    return action
+
+
+def _confidence(value) -> int:
+    try:
+        confidence = int(round(float(value)))
+    except (TypeError, ValueError):
+        metrics.DECISION_CLAMPS.labels('confidence').inc()
+        return 0
+    clamped = min(max(confidence, 0), 100)
+    if clamped != confidence:
+        metrics.DECISION_CLAMPS.labels('confidence').inc()
+    return clamped
+
+
+def _risk(value) -> str:
+    risk = str(value).strip().upper() if value is not None else ''
+    if risk not in RISK_LEVELS:
+        metrics.DECISION_CLAMPS.labels('risk_level').inc()
+        return 'HIGH'
+    return risk
+
+
+def _price(value) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return None
+    return price if price > 0 and price != float('inf') else None
+
+
+def _clamp_level(field: str, value: Optional[float], price: float, side: int, distance: float) -> Optional[float]:
+    """
+    Keep a level on the expected side of price (side=+1 above, -1 below),
+    no further than `distance`; a level on the wrong side is dropped.
+    """
+    if value is None:
+        return None
+    if (value - price) * side <= 0:
+        metrics.DECISION_CLAMPS.labels(field).inc()
+        return None
+    limit = price * (1 + side * distance)
+    if (value - limit) * side > 0:
+        metrics.DECISION_CLAMPS.labels(field).inc()
+        return limit
+    return value
+
+
+def parse_decision(text: str, price: float = None, source: str = None) -> Decision:
+    """
+    Parse model output into a Decision
+
+    Args:
+        text: JSON object text (a surrounding ``` fence is tolerated)
+        price: Current market price, used to clamp entry/stop/target
+        source: Model name, for failure counts
+
+    Fields are checked one by one rather than against DECISION_SCHEMA: that
+    schema is the strict contract sent to models, while parsing repairs what
+    it can (clamped prices, defaulted confidence / risk) and only rejects an
+    answer without a valid decision.
+
+    Raises:
+        DecisionParseError: not JSON, or no valid decision field
+    """
+    source = source or 'unknown'
+    text = (text or '').strip()
+    if text.startswith('```'):
+        text = FENCE_CLOSE.sub('', FENCE_OPEN.sub('', text, count=1), count=1)
+
+    try:
+        data = json.loads(text)
+    except ValueError as e:
+        metrics.AI_PARSE_FAILURES.labels(source, 'json').inc()
+        raise DecisionParseError('json', f"not JSON ({e}): {text[:80]!r}") from None
+
+    if not isinstance(data, dict):
+        metrics.AI_PARSE_FAILURES.labels(source, 'schema').inc()
+        raise DecisionParseError('schema', f"expected an object, got {type(data).__name__}")
+
+    try:
+        action = _action(data.get('decision'))
+    except DecisionParseError:
+        metrics.AI_PARSE_FAILURES.labels(source, 'schema').inc()
+        raise
+
+    entry, stop, target = _price(data.get('entry_price')), _price(data.get('stop_loss')), _price(data.get('take_profit'))
+    if price:
+        if entry is not None:
+            low, high = price * (1 - MAX_ENTRY_DISTANCE), price * (1 + MAX_ENTRY_DISTANCE)
+            if not low <= entry <= high:
+                metrics.DECISION_CLAMPS.labels('entry_price').inc()
+                entry = min(max(entry, low), high)
+        if action != 'WAIT':
+            side = 1 if action == 'LONG' else -1
+            stop = _clamp_level('stop_loss', stop, price, -side, MAX_STOP_DISTANCE)
+            target = _clamp_level('take_profit', target, price, side, MAX_TARGET_DISTANCE)
+
+    return Decision(
+        decision=action,
+        confidence=_confidence(data.get('confidence')),
+        reasoning=str(data.get('reasoning') or '')[:MAX_REASONING],
+        entry_price=entry,
+        stop_loss=stop,
+        take_profit=target,
+        risk_level=_risk(data.get('risk_level')),
+        source=source
+    )
@@ -0,0 +1,206 @@
+"""
+NEXUS AI Trading Bot - Decision Providers
+==========================================
+Decision provider interface, local NumPy model and LLM/local hybrid
+"""
+
+import json
+import numpy as np
+import metrics
+from abc import ABC, abstractmethod
+from pathlib import Path
+from loguru import logger
+from config import config
+from decision import Decision, ACTIONS
+from market_state import MarketSnapshot
+from typing import Callable, Dict, Optional
+
+
+class DecisionProvider(ABC):
+    """Anything that turns a market snapshot into a Decision"""
+
+    name = "provider"
+
+    # LLM requests the last decide() call sent, hedges included (for the hourly budget)
+    llm_requests = 0
+
+    @abstractmethod
+    def decide(self, market_data: MarketSnapshot) -> Decision:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+# ============ FEATURES ============
+
+def _ratio_pct(a, b) -> Optional[float]:
+    return (a / b - 1) * 100 if a and b else None
+
+
+def _liquidation_skew(m: MarketSnapshot) -> Optional[float]:
+    total = (m.long_liquidations or 0) + (m.short_liquidations or 0)
+    return (m.long_liquidations - m.short_liquidations) / total if total else None
+
+
+# Standardized features beyond this many std devs are clipped
+Z_CLIP = 5.0
+
+# Feature name -> snapshot extractor (None = missing, scored as the training mean)
+FEATURES: Dict[str, Callable[[MarketSnapshot], Optional[float]]] = {
+    'rsi': lambda m: m.rsi,
+    'macd_hist_bps': lambda m: (m.macd - m.macd_signal) / m.price * 10_000
+    if m.macd is not None and m.macd_signal is not None and m.price else None,
+    'ema_20_gap': lambda m: _ratio_pct(m.price, m.ema_20),
+    'ema_50_gap': lambda m: _ratio_pct(m.price, m.ema_50),
+    'change_24h': lambda m: m.change_24h,
+    'atr_ratio': lambda m: m.atr_ratio,
+    'book_imbalance_5': lambda m: m.book_imbalance[1] if m.book_imbalance else None,
+    'spread_z': lambda m: m.spread_z,
+    'funding_rate': lambda m: m.funding_rate,
+    'funding_change_8h': lambda m: m.funding_change_8h,
+    'oi_change_1h': lambda m: m.oi_change_1h,
+    'oi_change_4h': lambda m: m.oi_change_4h,
+    'liquidation_skew': _liquidation_skew,
+    'fear_greed': lambda m: m.fear_greed,
+    'news_score': lambda m: {'Bullish': 1.0, 'Bearish': -1.0}.get(m.news_sentiment, 0.0),
+}
+
+
+class LocalModel(DecisionProvider):
+    """
+    Linear softmax scorer over snapshot features, no network.
+
+    Weights file (JSON):
+        features  - names from FEATURES, in column order
+        mean, std - standardization per feature (missing values score as the mean)
+        classes   - output order, e.g. ["LONG", "SHORT", "WAIT"]
+        weights   - one row per class, one column per feature
+        bias      - one per class
+        training  - metadata of the run that produced the weights
+        placeholder - true for hand-set weights
+
+    Stop loss / take profit are left to the configured percentages. A
+    placeholder model, or one without training metadata, only loads while
+    orders can't reach a live account (DRY_RUN or BINANCE_TESTNET).
+    """
+
+    name = "local"
+
+    def __init__(self, path: str = None):
+        self.path = Path(path or config.LOCAL_MODEL_PATH)
+        if not self.path.is_absolute():
+            self.path = Path(__file__).parent / self.path
+        self.load()
+
+    def load(self) -> None:
+        spec = json.loads(self.path.read_text())
+
+        self.features = list(spec['features'])
+        unknown = [name for name in self.features if name not in FEATURES]
+        if unknown:
+            raise ValueError(f"Unknown features in {self.path}: {unknown}")
+
+        self.classes = list(spec.get('classes', ACTIONS))
+        self.mean = np.asarray(spec['mean'], dtype=float)
+        self.std = np.where(np.asarray(spec['std'], dtype=float) > 0, spec['std'], 1.0)
+        self.weights = np.asarray(spec['weights'], dtype=float)
+        self.bias = np.asarray(spec['bias'], dtype=float)
+        self._extractors = [FEATURES[name] for name in self.features]
+
+        expected = (len(self.classes), len(self.features))
+        if self.weights.shape != expected or self.bias.shape != (expected[0],) or self.mean.shape != (expected[1],):
+            raise ValueError(f"{self.path}: weights must be {expected}, got {self.weights.shape}")
+
+        if spec.get('placeholder') or not spec.get('training'):
+            if not config.DRY_RUN and not config.BINANCE_TESTNET:
+                raise ValueError(f"{self.path} is a placeholder or has no training metadata; "
+                                 f"refusing to trade a live account on it (set DRY_RUN or BINANCE_TESTNET)")
+            logger.warning(f"PLACEHOLDER LOCAL MODEL {self.path.name}: untrained weights, "
+                           f"paper/testnet use only, retrain before trading live")
+
+        logger.info(f"Local model loaded: {len(self.features)} features, {len(self.classes)} classes ({self.path})")
+
+    def features_of(self, market_data: MarketSnapshot) -> np.ndarray:
+        """Standardized feature vector (missing -> 0, outliers clipped to ±Z_CLIP)"""
+        raw = np.empty(len(self._extractors))
+        for i, extract in enumerate(self._extractors):
+            try:
+                value = extract(market_data)
+            except (TypeError, ZeroDivisionError, IndexError):
+                value = None
+            raw[i] = np.nan if value is None else value
+        z = (raw - self.mean) / self.std
+        return np.clip(np.where(np.isnan(z), 0.0, z), -Z_CLIP, Z_CLIP)
+
+    @metrics.timed('local_model.decide')
+    def decide(self, market_data: MarketSnapshot) -> Decision:
+        scores = self.weights @ self.features_of(market_data) + self.bias
+        probs = np.exp(scores - scores.max())
+        probs /= probs.sum()
+
+        best = int(probs.argmax())
+        confidence = int(round(probs[best] * 100))
+        return Decision(
+            decision=self.classes[best],
+            confidence=confidence,
+            reasoning="Local model: " + ", ".join(f"{c} {p:.0%}" for c, p in zip(self.classes, probs)),
+            risk_level='LOW' if confidence >= 80 else 'MEDIUM' if confidence >= 60 else 'HIGH',
+            source=self.name
+        )
+
+
+class HybridProvider(DecisionProvider):
+    """
+    Local model every cycle, LLM for the slower view.
+
+    The LLM is asked at most every HYBRID_LLM_INTERVAL seconds and its
+    decision kept as the bias. A local LONG/SHORT goes through unless the
+    bias points the other way; the LLM never adds latency to the cycles in
+    between. A failed LLM call (error, no quorum) doesn't replace the bias
+    and is retried on the next cycle.
+    """
+
+    name = "hybrid"
+
+    def __init__(self, local: LocalModel, llm: DecisionProvider):
+        self.local = local
+        self.llm = llm
+        self.interval = config.HYBRID_LLM_INTERVAL
+        self.bias: Optional[Decision] = None
+        self._bias_at = 0.0  # snapshot time, so replays refresh on the same cycles
+
+    def decide(self, market_data: MarketSnapshot) -> Decision:
+        self.llm_requests = 0
+        if self.bias is None or market_data.timestamp - self._bias_at >= self.interval:
+            answer = self.llm.decide(market_data)
+            self.llm_requests = self.llm.llm_requests
+            if answer.is_fallback:
+                kept = self.bias.decision if self.bias else "none"
+                logger.warning(f"Hybrid: LLM unavailable ({answer.reasoning}), keeping bias {kept}, retrying next cycle")
+            else:
+                self.bias = answer
+                self._bias_at = market_data.timestamp
+                logger.info(f"Hybrid: LLM bias now {self.bias.decision} ({self.bias.confidence}%)")
+
+        decision = self.local.decide(market_data)
+        bias = self.bias.decision if self.bias else None
+        decision.votes = {'local': decision.decision, 'llm': bias}
+
+        opposite = {'LONG': 'SHORT', 'SHORT': 'LONG'}.get(decision.decision)
+        if opposite and bias == opposite:
+            return Decision.wait(f"Local {decision.decision} against LLM bias {self.bias.decision}")
+        return decision
+
+    def close(self) -> None:
+        self.llm.close()
+
+
+def build_provider(llm: Optional[DecisionProvider]) -> DecisionProvider:
+    """Provider for DECISION_PROVIDER: llm, local or hybrid"""
+    mode = config.DECISION_PROVIDER
+    if mode == 'local':
+        return LocalModel()
+    if mode == 'hybrid':
+        return HybridProvider(LocalModel(), llm)
+    return llm
@@ -4,7 +4,8 @@ NEXUS AI Trading Bot - Exchange Module
 Binance Futures integration via CCXT
 """
 
-import ccxt
+import metrics
+from urllib.parse import urlparse
 from loguru import logger
 from config import config
 from typing import Optional, Dict, List
@@ -13,11 +14,20 @@ from typing import Optional, Dict, List
 class Exchange:
     """Binance Futures exchange wrapper"""
     
-    def __init__(self):
+    WEIGHT_LIMIT = 2400  # Binance Futures request weight per minute
+    
+    def __init__(self, authenticated: bool = True):
+        """
+        Args:
+            authenticated: False for a market-data-only client (no keys, no leverage setup)
+        """
+        # ccxt takes ~1s to import; load it only when an exchange is built
+        import ccxt
+        
         # Initialize exchange
         exchange_config = {
-            'apiKey': config.BINANCE_API_KEY,
-            'secret': config.BINANCE_SECRET_KEY,
+            'apiKey': config.BINANCE_API_KEY if authenticated else '',
+            'secret': config.BINANCE_SECRET_KEY if authenticated else '',
             'sandbox': config.BINANCE_TESTNET,
             'options': {
                 'defaultType': 'future',
@@ -28,11 +38,32 @@ class Exchange:
         self.exchange = ccxt.binance(exchange_config)
         self.symbol = config.TRADING_SYMBOL
         
+        if config.BINANCE_REST_URL:
+            self._override_urls(config.BINANCE_REST_URL)
+        
+        if not authenticated:
+            logger.debug("Public Binance client initialized")
+            return
+        
+        # Request weight left in Binance's 1-minute window, read at scrape time
+        metrics.RATE_LIMIT_HEADROOM.labels('binance').set_function(self._weight_headroom)
+        
         # Set leverage
         self._set_leverage()
         
         logger.info(f"Exchange initialized: Binance {'TESTNET' if config.BINANCE_TESTNET else 'LIVE'}")
     
+    def public_client(self) -> 'Exchange':
+        """
+        A separate market-data client for background pollers
+        
+        ccxt sync exchanges aren't thread-safe (shared session, rate limiter,
+        nonce), so threads other than the trading loop get their own.
+        """
+        client = Exchange(authenticated=False)
+        client.symbol = self.symbol
+        return client
+    
     def _set_leverage(self):
         """Set leverage for trading symbol"""
         try:
@@ -41,8 +72,32 @@ class Exchange:
         except Exception as e:
             logger.warning(f"Could not set leverage: {e}")
     
+    def _override_urls(self, base: str):
+        """Send every REST call to another host, keeping the API paths"""
+        base = base.rstrip('/')
+        # Sandbox mode keeps the live URLs in 'apiBackup'
+        sections = [self.exchange.urls.get(name) or {} for name in ('api', 'test', 'apiBackup')]
+        for urls in sections:
+            for key, url in urls.items():
+                if isinstance(url, str):
+                    urls[key] = base + urlparse(url).path
+        
+        # The override serves every API, including ones testnet lacks (e.g. fapiData)
+        for urls in sections:
+            for other in sections:
+                for key, url in other.items():
+                    urls.setdefault(key, url)
+        logger.info(f"Binance REST overridden: {base}")
+    
+    def _weight_headroom(self) -> float:
+        """Remaining request weight from the last response headers"""
+        headers = self.exchange.last_response_headers or {}
+        used = headers.get('X-MBX-USED-WEIGHT-1M') or headers.get('x-mbx-used-weight-1m')
+        return self.WEIGHT_LIMIT - float(used) if used else float('nan')
+    
     # ============ MARKET DATA ============
     
+    @metrics.timed('exchange.get_ticker')
     def get_ticker(self) -> dict:
         """Get current ticker data"""
         try:
@@ -58,8 +113,10 @@ class Exchange:
             }
         except Exception as e:
             logger.error(f"Error fetching ticker: {e}")
+            metrics.fallback('exchange.get_ticker')
             return {}
     
+    @metrics.timed('exchange.get_orderbook')
     def get_orderbook(self, limit: int = 20) -> dict:
         """Get orderbook"""
         try:
@@ -71,16 +128,20 @@ class Exchange:
             }
         except Exception as e:
             logger.error(f"Error fetching orderbook: {e}")
+            metrics.fallback('exchange.get_orderbook')
             return {}
     
+    @metrics.timed('exchange.get_ohlcv')
     def get_ohlcv(self, timeframe: str = '1h', limit: int = 100) -> list:
         """Get OHLCV candles"""
         try:
             return self.exchange.fetch_ohlcv(self.symbol, timeframe, limit=limit)
         except Exception as e:
             logger.error(f"Error fetching OHLCV: {e}")
+            metrics.fallback('exchange.get_ohlcv')
             return []
     
+    @metrics.timed('exchange.get_funding_rate')
     def get_funding_rate(self) -> Optional[float]:
         """Get current funding rate"""
         try:
@@ -88,10 +149,35 @@ class Exchange:
             return funding['fundingRate'] * 100  # Convert to percentage
         except Exception as e:
             logger.error(f"Error fetching funding rate: {e}")
+            metrics.fallback('exchange.get_funding_rate')
             return None
     
+    @metrics.timed('exchange.get_open_interest')
+    def get_open_interest(self) -> Optional[dict]:
+        """Get current open interest (contracts) with its timestamp"""
+        try:
+            oi = self.exchange.fetch_open_interest(self.symbol)
+            return {'timestamp': oi['timestamp'], 'amount': oi['openInterestAmount']}
+        except Exception as e:
+            logger.error(f"Error fetching open interest: {e}")
+            metrics.fallback('exchange.get_open_interest')
+            return None
+    
+    @metrics.timed('exchange.get_open_interest_history')
+    def get_open_interest_history(self, timeframe: str = '5m', limit: int = 289) -> list:
+        """Get open interest history [{'timestamp', 'amount', 'value'}], oldest first"""
+        try:
+            history = self.exchange.fetch_open_interest_history(self.symbol, timeframe, limit=limit)
+            return [{'timestamp': item['timestamp'], 'amount': item['openInterestAmount'],
+                     'value': item['openInterestValue']} for item in history]
+        except Exception as e:
+            logger.error(f"Error fetching open interest history: {e}")
+            metrics.fallback('exchange.get_open_interest_history')
+            return []
+    
     # ============ ACCOUNT ============
     
+    @metrics.timed('exchange.get_balance')
     def get_balance(self) -> dict:
         """Get account balance"""
         try:
@@ -104,8 +190,10 @@ class Exchange:
             }
         except Exception as e:
             logger.error(f"Error fetching balance: {e}")
+            metrics.fallback('exchange.get_balance')
             return {'total': 0, 'free': 0, 'used': 0}
     
+    @metrics.timed('exchange.get_positions')
     def get_positions(self) -> List[dict]:
         """Get open positions"""
         try:
@@ -128,10 +216,12 @@ class Exchange:
             return open_positions
         except Exception as e:
             logger.error(f"Error fetching positions: {e}")
+            metrics.fallback('exchange.get_positions')
             return []
     
     # ============ TRADING ============
     
+    @metrics.timed('exchange.market_order')
     def market_order(self, side: str, amount: float) -> Optional[dict]:
         """
         Place market order
@@ -156,6 +246,7 @@ class Exchange:
             logger.error(f"Error placing market order: {e}")
             return None
     
+    @metrics.timed('exchange.limit_order')
     def limit_order(self, side: str, amount: float, price: float) -> Optional[dict]:
         """Place limit order"""
         if config.DRY_RUN:
@@ -175,6 +266,7 @@ class Exchange:
             logger.error(f"Error placing limit order: {e}")
             return None
     
+    @metrics.timed('exchange.set_stop_loss')
     def set_stop_loss(self, side: str, amount: float, stop_price: float) -> Optional[dict]:
         """Set stop loss order"""
         if config.DRY_RUN:
@@ -201,6 +293,7 @@ class Exchange:
             logger.error(f"Error setting stop loss: {e}")
             return None
     
+    @metrics.timed('exchange.set_take_profit')
     def set_take_profit(self, side: str, amount: float, tp_price: float) -> Optional[dict]:
         """Set take profit order"""
         if config.DRY_RUN:
@@ -244,6 +337,7 @@ class Exchange:
         
         return results
     
+    @metrics.timed('exchange.cancel_all_orders')
     def cancel_all_orders(self) -> bool:
         """Cancel all open orders"""
         if config.DRY_RUN:
@@ -0,0 +1,663 @@
+"""
+NEXUS AI Trading Bot - Fake Upstreams
+======================================
+Local stand-ins for every external service, for benchmarks and dry runs
+"""
+
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+import zlib
+from aiohttp import web, WSMsgType
+from eth_abi import decode as abi_decode, encode as abi_encode
+from loguru import logger
+from config import Config
+from typing import Dict, List, Optional
+
+# Function selectors answered by the fake RPC
+DECIMALS_SELECTOR = "313ce567"
+BALANCE_OF_SELECTOR = "70a08231"
+AGGREGATE3_SELECTOR = "82ad56cb"
+
+DEFAULT_BASES = ["BTC", "ETH", "SOL", "BNB", "XRP", "DOGE", "ADA", "AVAX", "LINK", "DOT"]
+
+
+class Fault:
+    """Latency and error injection for one fake service"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 500, seed: int = None):
+        """
+        Args:
+            latency: Base response delay in seconds
+            jitter: Extra delay drawn from an exponential with this mean (long tail)
+            error_rate: Fraction of requests answered with error_status
+            error_status: HTTP status for injected errors
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+
+    def delay(self) -> float:
+        extra = self.random.expovariate(1 / self.jitter) if self.jitter > 0 else 0.0
+        return self.latency + extra
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and self.random.random() < self.error_rate
+
+
+class FakeService:
+    """Base class: an aiohttp sub-app with fault injection and request counts"""
+
+    name = ""
+
+    def __init__(self, fault: Fault = None):
+        self.fault = fault or Fault()
+        self.requests = 0
+        self.errors = 0
+
+    def build(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        self.routes(app.router)
+        return app
+
+    def routes(self, router: web.UrlDispatcher) -> None:
+        raise NotImplementedError
+
+    def error_response(self) -> web.Response:
+        return web.json_response({'error': 'injected failure'}, status=self.fault.error_status)
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.requests += 1
+
+        # Read the body up front, as a real server would, so clients that
+        # give up during the delay don't break the handler
+        if request.can_read_body:
+            await request.read()
+
+        delay = self.fault.delay()
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.fault.should_fail():
+            self.errors += 1
+            return self.error_response()
+
+        return await handler(request)
+
+
+class FakeBinance(FakeService):
+    """Binance USD-M futures REST + combined WebSocket streams"""
+
+    name = "binance"
+
+    def __init__(self, fault: Fault = None, symbols: int = 1, ws_rate: float = 1.0, seed: int = 1):
+        super().__init__(fault)
+        self.random = random.Random(seed)
+        self.ws_rate = ws_rate  # events per second per stream
+
+        bases = DEFAULT_BASES + [f"T{i:03d}" for i in range(max(0, symbols - len(DEFAULT_BASES)))]
+        self.bases = bases[:max(symbols, 1)]
+        self.prices = {f"{base}USDT": 100.0 * (len(self.bases) - i) for i, base in enumerate(self.bases)}
+        self.prices["BTCUSDT"] = 97000.0
+        self.used_weight = 0
+
+    @property
+    def symbols(self) -> List[str]:
+        """Unified symbols served, e.g. 'BTC/USDT'"""
+        return [f"{base}/USDT" for base in self.bases]
+
+    def routes(self, router):
+        router.add_get('/fapi/v1/time', self.handle_time)
+        router.add_get('/fapi/v1/ping', self.handle_empty)
+        router.add_get('/fapi/v1/exchangeInfo', self.handle_exchange_info)
+        router.add_get('/fapi/v1/ticker/24hr', self.handle_ticker)
+        router.add_get('/fapi/v1/depth', self.handle_depth)
+        router.add_get('/fapi/v1/klines', self.handle_klines)
+        router.add_get('/fapi/v1/premiumIndex', self.handle_premium_index)
+        router.add_get('/fapi/v1/openInterest', self.handle_open_interest)
+        router.add_get('/futures/data/openInterestHist', self.handle_open_interest_hist)
+        router.add_post('/fapi/v1/leverage', self.handle_leverage)
+        router.add_get('/fapi/v2/balance', self.handle_balance)
+        router.add_get('/fapi/v3/balance', self.handle_balance)
+        router.add_get('/fapi/v2/account', self.handle_account)
+        router.add_get('/fapi/v3/account', self.handle_account)
+        router.add_get('/fapi/v2/positionRisk', self.handle_position_risk)
+        router.add_get('/fapi/v3/positionRisk', self.handle_position_risk)
+        router.add_route('*', '/fapi/v1/order', self.handle_order)
+        router.add_route('*', '/fapi/v1/allOpenOrders', self.handle_empty)
+        router.add_get('/stream', self.handle_stream)
+        # Spot/coin-M/options market lists ccxt loads alongside futures
+        router.add_route('*', '/{tail:.*}', self.handle_other)
+
+    # ============ REST ============
+
+    def _tick(self, symbol: str) -> float:
+        """Advance the symbol's random walk"""
+        price = self.prices.get(symbol, 100.0)
+        price *= 1 + self.random.gauss(0, 0.0005)
+        self.prices[symbol] = price
+        return price
+
+    def _json(self, data, weight: int = 1) -> web.Response:
+        self.used_weight = (self.used_weight + weight) % 2400
+        return web.json_response(data, headers={'X-MBX-USED-WEIGHT-1M': str(self.used_weight)})
+
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time.time() * 1000)
+
+    async def handle_time(self, request):
+        return self._json({'serverTime': self._now_ms()})
+
+    async def handle_empty(self, request):
+        return self._json({})
+
+    async def handle_other(self, request):
+        if request.path.endswith('exchangeInfo'):
+            return self._json({'timezone': 'UTC', 'serverTime': self._now_ms(), 'rateLimits': [], 'symbols': []})
+        return self._json([])
+
+    async def handle_exchange_info(self, request):
+        symbols = []
+        for base in self.bases:
+            symbols.append({
+                'symbol': f"{base}USDT",
+                'pair': f"{base}USDT",
+                'contractType': 'PERPETUAL',
+                'deliveryDate': 4133404800000,
+                'onboardDate': 1569398400000,
+                'status': 'TRADING',
+                'baseAsset': base,
+                'quoteAsset': 'USDT',
+                'marginAsset': 'USDT',
+                'pricePrecision': 2,
+                'quantityPrecision': 3,
+                'baseAssetPrecision': 8,
+                'quotePrecision': 8,
+                'underlyingType': 'COIN',
+                'triggerProtect': '0.0500',
+                'filters': [
+                    {'filterType': 'PRICE_FILTER', 'minPrice': '0.01', 'maxPrice': '1000000', 'tickSize': '0.01'},
+                    {'filterType': 'LOT_SIZE', 'minQty': '0.001', 'maxQty': '1000', 'stepSize': '0.001'},
+                    {'filterType': 'MARKET_LOT_SIZE', 'minQty': '0.001', 'maxQty': '120', 'stepSize': '0.001'},
+                    {'filterType': 'MIN_NOTIONAL', 'notional': '5'}
+                ],
+                'orderTypes': ['LIMIT', 'MARKET', 'STOP', 'STOP_MARKET', 'TAKE_PROFIT', 'TAKE_PROFIT_MARKET'],
+                'timeInForce': ['GTC', 'IOC', 'FOK', 'GTX']
+            })
+        return self._json({'timezone': 'UTC', 'serverTime': self._now_ms(), 'rateLimits': [], 'assets': [], 'symbols': symbols}, weight=1)
+
+    async def handle_ticker(self, request):
+        symbol = request.query.get('symbol', 'BTCUSDT')
+        price = self._tick(symbol)
+        return self._json({
+            'symbol': symbol,
+            'priceChange': f"{price * 0.01:.2f}",
+            'priceChangePercent': '1.000',
+            'weightedAvgPrice': f"{price:.2f}",
+            'lastPrice': f"{price:.2f}",
+            'lastQty': '0.010',
+            'openPrice': f"{price * 0.99:.2f}",
+            'highPrice': f"{price * 1.02:.2f}",
+            'lowPrice': f"{price * 0.97:.2f}",
+            'volume': '150000.000',
+            'quoteVolume': f"{price * 150000:.2f}",
+            'openTime': self._now_ms() - 86_400_000,
+            'closeTime': self._now_ms(),
+            'count': 1000000
+        })
+
+    async def handle_depth(self, request):
+        symbol = request.query.get('symbol', 'BTCUSDT')
+        limit = int(request.query.get('limit', 20))
+        price = self._tick(symbol)
+        step = price * 0.0001
+        bids = [[f"{price - step * (i + 1):.2f}", f"{self.random.uniform(0.1, 5):.3f}"] for i in range(limit)]
+        asks = [[f"{price + step * (i + 1):.2f}", f"{self.random.uniform(0.1, 5):.3f}"] for i in range(limit)]
+        return self._json({'lastUpdateId': self._now_ms(), 'E': self._now_ms(), 'T': self._now_ms(), 'bids': bids, 'asks': asks}, weight=2)
+
+    async def handle_klines(self, request):
+        symbol = request.query.get('symbol', 'BTCUSDT')
+        limit = int(request.query.get('limit', 100))
+        interval_ms = 3_600_000
+        # Aligned like real candles: the last one is the still-open hour
+        start = (self._now_ms() // interval_ms - limit + 1) * interval_ms
+
+        price = self.prices.get(symbol, 100.0)
+        candles = []
+        for i in range(limit):
+            open_ = price
+            close = price * (1 + self.random.gauss(0, 0.004))
+            high = max(open_, close) * (1 + abs(self.random.gauss(0, 0.002)))
+            low = min(open_, close) * (1 - abs(self.random.gauss(0, 0.002)))
+            t = start + i * interval_ms
+            candles.append([t, f"{open_:.2f}", f"{high:.2f}", f"{low:.2f}", f"{close:.2f}",
+                            f"{self.random.uniform(1000, 5000):.3f}", t + interval_ms - 1,
+                            '0', 1000, '0', '0', '0'])
+            price = close
+        return self._json(candles, weight=5)
+
+    async def handle_premium_index(self, request):
+        symbol = request.query.get('symbol', 'BTCUSDT')
+        price = self._tick(symbol)
+        return self._json({
+            'symbol': symbol,
+            'markPrice': f"{price:.2f}",
+            'indexPrice': f"{price:.2f}",
+            'estimatedSettlePrice': f"{price:.2f}",
+            'lastFundingRate': f"{self.random.uniform(-0.0003, 0.0005):.8f}",
+            'interestRate': '0.00010000',
+            'nextFundingTime': (self._now_ms() // 28_800_000 + 1) * 28_800_000,
+            'time': self._now_ms()
+        })
+
+    async def handle_open_interest(self, request):
+        symbol = request.query.get('symbol', 'BTCUSDT')
+        return self._json({'symbol': symbol, 'openInterest': f"{self.random.uniform(80000, 90000):.3f}", 'time': self._now_ms()})
+
+    async def handle_open_interest_hist(self, request):
+        symbol = request.query.get('symbol', 'BTCUSDT')
+        limit = min(int(request.query.get('limit', 30)), 500)
+        price = self.prices.get(symbol, 100.0)
+        step = 300_000
+        last = self._now_ms() // step * step
+        rows = []
+        for i in range(limit):
+            oi = self.random.uniform(80000, 90000)
+            rows.append({'symbol': symbol, 'sumOpenInterest': f"{oi:.3f}", 'sumOpenInterestValue': f"{oi * price:.2f}",
+                         'timestamp': last - (limit - 1 - i) * step})
+        return self._json(rows)
+
+    async def handle_leverage(self, request):
+        params = {**request.query, **(await request.post())}
+        return self._json({'symbol': params.get('symbol'), 'leverage': int(params.get('leverage', 1)), 'maxNotionalValue': '1000000'})
+
+    async def handle_balance(self, request):
+        return self._json([{
+            'accountAlias': 'fake', 'asset': 'USDT', 'balance': '10000.00', 'crossWalletBalance': '10000.00',
+            'crossUnPnl': '0.00', 'availableBalance': '10000.00', 'maxWithdrawAmount': '10000.00',
+            'marginAvailable': True, 'updateTime': self._now_ms()
+        }], weight=5)
+
+    async def handle_account(self, request):
+        return self._json({
+            'totalWalletBalance': '10000.00', 'totalUnrealizedProfit': '0.00', 'totalMarginBalance': '10000.00',
+            'availableBalance': '10000.00', 'maxWithdrawAmount': '10000.00',
+            'assets': [{'asset': 'USDT', 'walletBalance': '10000.00', 'unrealizedProfit': '0.00',
+                        'marginBalance': '10000.00', 'availableBalance': '10000.00',
+                        'crossWalletBalance': '10000.00', 'maxWithdrawAmount': '10000.00',
+                        'updateTime': self._now_ms()}],
+            'positions': []
+        }, weight=5)
+
+    async def handle_position_risk(self, request):
+        return self._json([], weight=5)
+
+    async def handle_order(self, request):
+        params = {**request.query, **(await request.post())}
+        symbol = params.get('symbol', 'BTCUSDT')
+        price = self.prices.get(symbol, 100.0)
+        return self._json({
+            'orderId': self.random.randint(1, 10 ** 9), 'symbol': symbol, 'status': 'FILLED',
+            'clientOrderId': 'fake', 'price': '0', 'avgPrice': f"{price:.2f}",
+            'origQty': params.get('quantity', '0'), 'executedQty': params.get('quantity', '0'),
+            'type': params.get('type', 'MARKET'), 'side': params.get('side', 'BUY'),
+            'updateTime': self._now_ms()
+        })
+
+    # ============ WEBSOCKET ============
+
+    async def handle_stream(self, request):
+        """Combined stream: /stream?streams=btcusdt@markPrice@1s/btcusdt@bookTicker"""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        streams = set(filter(None, request.query.get('streams', '').split('/')))
+        pusher = asyncio.ensure_future(self._push(ws, streams))
+
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                data = json.loads(msg.data)
+                if data.get('method') == 'SUBSCRIBE':
+                    streams.update(data.get('params', []))
+                    await ws.send_json({'result': None, 'id': data.get('id')})
+        finally:
+            pusher.cancel()
+
+        return ws
+
+    async def _push(self, ws: web.WebSocketResponse, streams: set):
+        interval = 1 / self.ws_rate if self.ws_rate > 0 else 1.0
+        while not ws.closed:
+            for stream in list(streams):
+                event = self._event(stream)
+                if event is not None:
+                    await ws.send_json({'stream': stream, 'data': event})
+            await asyncio.sleep(interval)
+
+    def _event(self, stream: str) -> Optional[dict]:
+        symbol, _, kind = stream.partition('@')
+        symbol = symbol.upper()
+        price = self._tick(symbol)
+        now = self._now_ms()
+
+        if kind.startswith('markPrice'):
+            return {'e': 'markPriceUpdate', 'E': now, 's': symbol, 'p': f"{price:.2f}", 'i': f"{price:.2f}",
+                    'r': f"{self.random.uniform(-0.0003, 0.0005):.8f}", 'T': (now // 28_800_000 + 1) * 28_800_000}
+        if kind == 'bookTicker':
+            return {'e': 'bookTicker', 'E': now, 'T': now, 's': symbol, 'b': f"{price * 0.9999:.2f}",
+                    'B': '2.000', 'a': f"{price * 1.0001:.2f}", 'A': '2.000'}
+        if kind == 'forceOrder':
+            side = self.random.choice(['BUY', 'SELL'])
+            qty = self.random.uniform(0.01, 2)
+            return {'e': 'forceOrder', 'E': now, 'o': {
+                's': symbol, 'S': side, 'o': 'LIMIT', 'f': 'IOC', 'q': f"{qty:.3f}", 'p': f"{price:.2f}",
+                'ap': f"{price:.2f}", 'X': 'FILLED', 'l': f"{qty:.3f}", 'z': f"{qty:.3f}", 'T': now}}
+        return None
+
+
+class FakeDeepSeek(FakeService):
+    """OpenAI-compatible chat completions; any model name works"""
+
+    name = "deepseek"
+
+    def __init__(self, fault: Fault = None, seed: int = 2, agreement: float = 0.8):
+        """
+        Args:
+            agreement: Chance an answer follows the prompt's "true" decision, so
+                ensemble members mostly agree on the same prompt
+        """
+        super().__init__(fault)
+        self.random = random.Random(seed)
+        self.agreement = agreement
+
+    def routes(self, router):
+        router.add_post('/chat/completions', self.handle_completion)
+        router.add_post('/v1/chat/completions', self.handle_completion)
+
+    async def handle_completion(self, request):
+        body = await request.json()
+        choices = ['LONG', 'SHORT', 'WAIT']
+        prompt = body.get('messages', [{}])[-1].get('content', '')
+        if self.random.random() < self.agreement:
+            decision = choices[zlib.crc32(prompt.encode()) % 3]
+        else:
+            decision = self.random.choice(choices)
+        content = json.dumps({
+            'decision': decision,
+            'confidence': self.random.randint(40, 90),
+            'reasoning': 'Synthetic decision from the benchmark stand-in',
+            'entry_price': None,
+            'stop_loss': None,
+            'take_profit': None,
+            'risk_level': 'MEDIUM'
+        })
+        return web.json_response({
+            'id': f"chatcmpl-{self.requests}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'deepseek-chat'),
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': 600, 'completion_tokens': 80, 'total_tokens': 680}
+        })
+
+
+class FakeCoinglass(FakeService):
+    """Coinglass public v2"""
+
+    name = "coinglass"
+
+    def routes(self, router):
+        router.add_get('/open_interest', self.handle_open_interest)
+        router.add_get('/long_short', self.handle_long_short)
+
+    async def handle_open_interest(self, request):
+        return web.json_response({'code': '0', 'success': True, 'data': {'openInterest': 18_500_000_000}})
+
+    async def handle_long_short(self, request):
+        return web.json_response({'code': '0', 'success': True, 'data': [{'longRate': 55.0, 'shortRate': 45.0}]})
+
+
+class FakeCryptoPanic(FakeService):
+    """CryptoPanic posts API: `fresh` new posts per request, newest first, votes drifting"""
+
+    name = "cryptopanic"
+
+    def __init__(self, fault: Fault = None, posts: int = 20, fresh: int = 2):
+        super().__init__(fault)
+        self.posts = posts
+        self.fresh = fresh
+        self.last_id = 0
+
+    def routes(self, router):
+        router.add_get('/posts/', self.handle_posts)
+
+    async def handle_posts(self, request):
+        self.last_id += self.fresh if self.last_id else self.posts
+        now = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        currencies = [{'code': code} for code in request.query.get('currencies', 'BTC').split(',')]
+        results = [{
+            'id': post_id,
+            'kind': 'news',
+            'title': f"Synthetic headline {post_id}",
+            'published_at': now,
+            'currencies': currencies,
+            'votes': {'positive': (post_id + self.requests) % 3, 'negative': (post_id + 1) % 3, 'important': 1}
+        } for post_id in range(self.last_id, max(self.last_id - self.posts, 0), -1)]
+        return web.json_response({'count': len(results), 'next': None, 'previous': None, 'results': results})
+
+
+class FakeFearGreed(FakeService):
+    """alternative.me Fear & Greed index"""
+
+    name = "feargreed"
+
+    def routes(self, router):
+        router.add_get('/fng/', self.handle_fng)
+
+    async def handle_fng(self, request):
+        return web.json_response({'name': 'Fear and Greed Index', 'data': [
+            {'value': '64', 'value_classification': 'Greed', 'timestamp': str(int(time.time()))}
+        ]})
+
+
+class FakeTelegram(FakeService):
+    """Telegram Bot API sendMessage; records delivery times"""
+
+    name = "telegram"
+
+    def __init__(self, fault: Fault = None):
+        super().__init__(fault or Fault(error_status=429))
+        self.delivered: List[tuple] = []  # (monotonic time, chat_id)
+
+    def routes(self, router):
+        router.add_post('/bot{token}/sendMessage', self.handle_send)
+
+    def error_response(self):
+        if self.fault.error_status == 429:
+            return web.json_response({'ok': False, 'error_code': 429, 'description': 'Too Many Requests',
+                                      'parameters': {'retry_after': 1}}, status=429)
+        return super().error_response()
+
+    async def handle_send(self, request):
+        payload = await request.json()
+        self.delivered.append((time.monotonic(), str(payload.get('chat_id'))))
+        return web.json_response({'ok': True, 'result': {'message_id': len(self.delivered)}})
+
+
+class FakeRPC(FakeService):
+    """EVM JSON-RPC for one or more chains (/{chain}), enough for TokenVerifier"""
+
+    name = "rpc"
+
+    def __init__(self, fault: Fault = None, chain_ids: Dict[str, int] = None, decimals: int = 18):
+        super().__init__(fault)
+        self.chain_ids = chain_ids or {}
+        self.decimals = decimals
+        self.block = 1_000_000
+        self.calls: Dict[str, int] = {}
+
+    def routes(self, router):
+        router.add_post('/{chain}', self.handle_rpc)
+
+    def balance_of(self, wallet: str) -> int:
+        """Deterministic raw balance, log-uniform from 1 to ~1M tokens so every tier appears"""
+        digest = hashlib.sha256(wallet.lower().encode()).digest()
+        exponent = int.from_bytes(digest[:4], 'big') / 2 ** 32 * 6
+        return int(10 ** exponent) * 10 ** self.decimals
+
+    async def handle_rpc(self, request):
+        chain = request.match_info['chain']
+        body = await request.json()
+        if isinstance(body, list):
+            return web.json_response([self._answer(chain, item) for item in body])
+        return web.json_response(self._answer(chain, body))
+
+    def _answer(self, chain: str, request: dict) -> dict:
+        method = request.get('method')
+        params = request.get('params') or []
+        self.calls[method] = self.calls.get(method, 0) + 1
+
+        if method == 'eth_chainId':
+            result = hex(self.chain_ids.get(chain, 1))
+        elif method == 'net_version':
+            result = str(self.chain_ids.get(chain, 1))
+        elif method == 'eth_blockNumber':
+            self.block += 1
+            result = hex(self.block)
+        elif method == 'eth_call':
+            result = self._call(params[0])
+        elif method == 'eth_getLogs':
+            result = []
+        elif method == 'eth_getBlockByNumber':
+            number = params[0] if params and params[0] not in ('latest', 'safe', 'finalized') else hex(self.block)
+            result = self._block(int(number, 16))
+        else:
+            return {'jsonrpc': '2.0', 'id': request.get('id'), 'error': {'code': -32601, 'message': f"{method} not supported"}}
+
+        return {'jsonrpc': '2.0', 'id': request.get('id'), 'result': result}
+
+    def _call(self, tx: dict) -> str:
+        data = (tx.get('data') or tx.get('input') or '0x')[2:]
+        selector, args = data[:8], bytes.fromhex(data[8:])
+
+        if selector == DECIMALS_SELECTOR:
+            return '0x' + abi_encode(['uint8'], [self.decimals]).hex()
+        if selector == BALANCE_OF_SELECTOR:
+            wallet = '0x' + args[12:32].hex()
+            return '0x' + abi_encode(['uint256'], [self.balance_of(wallet)]).hex()
+        if selector == AGGREGATE3_SELECTOR:
+            (calls,) = abi_decode(['(address,bool,bytes)[]'], args)
+            results = []
+            for _, _, call_data in calls:
+                wallet = '0x' + call_data[16:36].hex()
+                results.append((True, abi_encode(['uint256'], [self.balance_of(wallet)])))
+            return '0x' + abi_encode(['(bool,bytes)[]'], [results]).hex()
+        return '0x'
+
+    def _block(self, number: int) -> dict:
+        block_hash = '0x' + hashlib.sha256(str(number).encode()).hexdigest()
+        return {
+            'number': hex(number), 'hash': block_hash, 'parentHash': '0x' + '00' * 32,
+            'timestamp': hex(int(time.time())), 'transactions': [], 'logsBloom': '0x' + '00' * 256,
+            'miner': '0x' + '00' * 20, 'gasLimit': hex(30_000_000), 'gasUsed': '0x0',
+            'extraData': '0x', 'nonce': '0x' + '00' * 8, 'difficulty': '0x0',
+            'sha3Uncles': '0x' + '00' * 32, 'stateRoot': '0x' + '00' * 32,
+            'transactionsRoot': '0x' + '00' * 32, 'receiptsRoot': '0x' + '00' * 32,
+            'size': '0x0', 'uncles': []
+        }
+
+
+class FakeUpstreams:
+    """
+    Runs every fake service on one local port, in a background thread.
+
+    Each service is mounted under /{name}; `apply_config` points the bot's
+    config at them so unmodified components talk to the fakes.
+    """
+
+    def __init__(self, services: List[FakeService], host: str = "127.0.0.1", port: int = 0):
+        self.services = {service.name: service for service in services}
+        self.host = host
+        self.port = port
+
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    def __getitem__(self, name: str) -> FakeService:
+        return self.services[name]
+
+    def url(self, name: str) -> str:
+        return f"http://{self.host}:{self.port}/{name}"
+
+    def start(self) -> "FakeUpstreams":
+        self._thread = threading.Thread(target=self._run, name="fake-upstreams", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(10):
+            raise RuntimeError("Fake upstreams failed to start")
+        logger.info(f"Fake upstreams on http://{self.host}:{self.port} ({', '.join(self.services)})")
+        return self
+
+    def stop(self) -> None:
+        if self._loop and self._runner:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(timeout=10)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(timeout=10)
+
+    def apply_config(self, cfg=Config) -> None:
+        """Point config URLs at the running fakes"""
+
+        if 'binance' in self.services:
+            cfg.BINANCE_REST_URL = self.url('binance')
+            cfg.BINANCE_WS_URL = f"ws://{self.host}:{self.port}/binance/stream"
+            cfg.BINANCE_API_KEY = cfg.BINANCE_API_KEY or 'fake'
+            cfg.BINANCE_SECRET_KEY = cfg.BINANCE_SECRET_KEY or 'fake'
+        if 'deepseek' in self.services:
+            cfg.DEEPSEEK_BASE_URL = self.url('deepseek')
+            cfg.DEEPSEEK_API_KEY = cfg.DEEPSEEK_API_KEY or 'fake'
+        if 'coinglass' in self.services:
+            cfg.COINGLASS_BASE_URL = self.url('coinglass')
+            cfg.COINGLASS_API_KEY = cfg.COINGLASS_API_KEY or 'fake'
+        if 'cryptopanic' in self.services:
+            cfg.CRYPTOPANIC_BASE_URL = self.url('cryptopanic')
+            cfg.CRYPTOPANIC_API_KEY = cfg.CRYPTOPANIC_API_KEY or 'fake'
+        if 'feargreed' in self.services:
+            cfg.FEAR_GREED_BASE_URL = self.url('feargreed')
+        if 'telegram' in self.services:
+            cfg.TELEGRAM_API_URL = self.url('telegram')
+            cfg.TELEGRAM_BOT_TOKEN = cfg.TELEGRAM_BOT_TOKEN or 'fake'
+            cfg.TELEGRAM_CHAT_ID = cfg.TELEGRAM_CHAT_ID or '1'
+        if 'rpc' in self.services:
+            cfg.RPC_URLS = {chain: [f"{self.url('rpc')}/{chain}"] for chain in self.services['rpc'].chain_ids}
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._serve())
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _serve(self):
+        app = web.Application()
+        for name, service in self.services.items():
+            app.add_subapp(f"/{name}", service.build())
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
@@ -0,0 +1,270 @@
+"""
+NEXUS AI Trading Bot - Feature Store
+=====================================
+Append-only Arrow IPC store of cycle snapshots, decisions and trade outcomes
+"""
+
+import os
+import time
+import queue
+import atexit
+import threading
+from datetime import date, datetime, timezone
+from pathlib import Path
+import pyarrow as pa
+import concurrent.futures.thread  # noqa: F401 - pyarrow imports it lazily, which fails in the atexit flush
+import metrics
+from loguru import logger
+from config import config
+from decision import Decision
+from market_state import MarketSnapshot
+from microstructure import IMBALANCE_DEPTHS, LIQUIDITY_BANDS_BPS
+from typing import Dict, List, Optional
+
+# Rows waiting for the writer; beyond this, records are dropped rather than block a cycle
+QUEUE_SIZE = 10_000
+
+# Snapshot slots stored as float64 columns (tuples and text are handled separately)
+NUMERIC_FIELDS = (
+    'price', 'bid', 'ask', 'high_24h', 'low_24h', 'volume_24h', 'change_24h',
+    'rsi', 'macd', 'macd_signal', 'ema_20', 'ema_50', 'atr', 'atr_ratio',
+    'microprice', 'spread_bps', 'spread_z',
+    'funding_rate', 'funding_avg_24h', 'funding_change_8h',
+    'open_interest', 'oi_change_1h', 'oi_change_4h', 'oi_change_24h', 'long_short_ratio',
+    'long_liquidations', 'short_liquidations', 'nearest_long_liq', 'nearest_short_liq',
+    'fear_greed', 'news_revision', 'social_volume',
+)
+
+# Tuple slots flattened to one column per depth / band
+VECTOR_FIELDS = {
+    'book_imbalance': [f'book_imbalance_{depth}' for depth in IMBALANCE_DEPTHS],
+    'bid_liquidity': [f'bid_liquidity_{bps}bps' for bps in LIQUIDITY_BANDS_BPS],
+    'ask_liquidity': [f'ask_liquidity_{bps}bps' for bps in LIQUIDITY_BANDS_BPS],
+}
+
+SNAPSHOT_SCHEMA = pa.schema(
+    [('cycle_id', pa.int64()), ('timestamp', pa.timestamp('ms', tz='UTC')), ('symbol', pa.string())]
+    + [(name, pa.float64()) for name in NUMERIC_FIELDS]
+    + [(column, pa.float64()) for columns in VECTOR_FIELDS.values() for column in columns]
+    + [('fear_greed_label', pa.string()), ('news_sentiment', pa.string())]
+    # Decision
+    + [('decision', pa.string()), ('confidence', pa.int32()), ('risk_level', pa.string()),
+       ('entry_price', pa.float64()), ('stop_loss', pa.float64()), ('take_profit', pa.float64()),
+       ('decision_source', pa.string())]
+)
+
+OUTCOME_SCHEMA = pa.schema([
+    ('cycle_id', pa.int64()),
+    ('timestamp', pa.timestamp('ms', tz='UTC')),  # when the close was noticed
+    ('symbol', pa.string()),
+    ('side', pa.string()),
+    ('fill_price', pa.float64()),
+    ('exit_price', pa.float64()),
+    ('pnl', pa.float64()),
+    ('pnl_percent', pa.float64()),
+])
+
+TABLES = {'snapshots': SNAPSHOT_SCHEMA, 'outcomes': OUTCOME_SCHEMA}
+
+
+def _ms(seconds: float) -> int:
+    return int(seconds * 1000)
+
+
+def _day(ms: int) -> str:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+def snapshot_row(cycle_id: int, market_data: MarketSnapshot, decision: Optional[Decision]) -> dict:
+    """One snapshots row: raw numbers, flattened book vectors and the decision"""
+    row = {
+        'cycle_id': cycle_id,
+        'timestamp': _ms(market_data.timestamp),
+        'symbol': market_data.symbol,
+        'fear_greed_label': market_data.fear_greed_label,
+        'news_sentiment': market_data.news_sentiment,
+    }
+    for name in NUMERIC_FIELDS:
+        row[name] = getattr(market_data, name)
+    for name, columns in VECTOR_FIELDS.items():
+        values = getattr(market_data, name) or ()
+        for i, column in enumerate(columns):
+            row[column] = values[i] if i < len(values) else None
+    if decision is not None:
+        row.update(
+            decision=decision.decision,
+            confidence=decision.confidence,
+            risk_level=decision.risk_level,
+            entry_price=decision.entry_price,
+            stop_loss=decision.stop_loss,
+            take_profit=decision.take_profit,
+            decision_source=decision.source
+        )
+    return row
+
+
+class FeatureStore:
+    """
+    Day-partitioned Arrow IPC files, one directory per table:
+
+        {root}/snapshots/date=2024-05-01/part-<first cycle id>-<write ns>.arrow
+        {root}/outcomes/date=2024-05-01/...
+
+    `record` / `record_outcome` only enqueue; a writer thread turns the
+    buffer into one file per table and day every FEATURE_STORE_FLUSH_ROWS
+    rows or FEATURE_STORE_FLUSH_SECONDS. Files are never rewritten, and a
+    part only appears (renamed into place) once complete. Reads memory-map
+    the files, so loading is bounded by disk cache rather than parsing.
+    """
+
+    def __init__(self, root: str = None):
+        self.root = Path(root or config.FEATURE_STORE_DIR)
+        self.flush_rows = config.FEATURE_STORE_FLUSH_ROWS
+        self.flush_seconds = config.FEATURE_STORE_FLUSH_SECONDS
+
+        self._queue: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Stats
+        self.written = 0
+        self.dropped = 0
+        self.files = 0
+
+        metrics.QUEUE_DEPTH.labels('feature_store').set_function(self._queue.qsize)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="feature-store", daemon=True)
+        self._thread.start()
+        # Exits that skip Trader.shutdown (e.g. an unhandled error) still flush
+        atexit.register(self.stop)
+        logger.info(f"Feature store writing to {self.root}")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush what is buffered and stop the writer"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        atexit.unregister(self.stop)
+
+    # ============ WRITE ============
+
+    def record(self, cycle_id: int, market_data: MarketSnapshot, decision: Optional[Decision]) -> bool:
+        """Queue one cycle's snapshot and decision (never blocks)"""
+        return self._put('snapshots', snapshot_row(cycle_id, market_data, decision))
+
+    def record_outcome(self, cycle_id: int, symbol: str, side: str, fill_price: float,
+                       exit_price: Optional[float], pnl: Optional[float], pnl_percent: Optional[float]) -> bool:
+        """Queue the result of a trade opened in cycle `cycle_id`"""
+        return self._put('outcomes', {
+            'cycle_id': cycle_id,
+            'timestamp': _ms(time.time()),
+            'symbol': symbol,
+            'side': side,
+            'fill_price': fill_price,
+            'exit_price': exit_price,
+            'pnl': pnl,
+            'pnl_percent': pnl_percent,
+        })
+
+    def _put(self, table: str, row: dict) -> bool:
+        try:
+            self._queue.put_nowait((table, row))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Feature store queue full, dropping {table} row")
+            return False
+
+    def _run(self):
+        buffers: Dict[str, List[dict]] = {name: [] for name in TABLES}
+        pending = 0
+        last_flush = time.monotonic()
+
+        while True:
+            stopping = self._stop.is_set()
+            try:
+                # On stop, drain everything into the final flush
+                while True:
+                    table, row = self._queue.get_nowait() if stopping else self._queue.get(timeout=0.5)
+                    buffers[table].append(row)
+                    pending += 1
+                    if not stopping:
+                        break
+            except queue.Empty:
+                pass
+
+            due = time.monotonic() - last_flush >= self.flush_seconds
+            if pending and (pending >= self.flush_rows or due or stopping):
+                self._flush(buffers)
+                pending = 0
+            if pending == 0:
+                last_flush = time.monotonic()
+
+            if stopping and self._queue.empty() and not pending:
+                return
+
+    def _flush(self, buffers: Dict[str, List[dict]]) -> None:
+        for table, rows in buffers.items():
+            if not rows:
+                continue
+            by_day: Dict[str, List[dict]] = {}
+            for row in rows:
+                by_day.setdefault(_day(row['timestamp']), []).append(row)
+            for day, day_rows in by_day.items():
+                try:
+                    self._write(table, day, day_rows)
+                except Exception as e:
+                    logger.error(f"Feature store write failed ({table} {day}, {len(day_rows)} rows): {e}")
+            rows.clear()
+
+    def _write(self, table: str, day: str, rows: List[dict]) -> None:
+        schema = TABLES[table]
+        batch = pa.Table.from_pylist(rows, schema=schema)
+
+        directory = self.root / table / f"date={day}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"part-{rows[0]['cycle_id']}-{time.time_ns()}.arrow"
+        partial = path.with_suffix('.tmp')
+
+        with pa.OSFile(str(partial), 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+            writer.write_table(batch)
+        os.replace(partial, path)
+
+        self.written += len(rows)
+        self.files += 1
+        logger.debug(f"Feature store: {len(rows)} {table} rows -> {path.name}")
+
+    # ============ READ ============
+
+    def read(self, table: str = 'snapshots', start: date = None, end: date = None) -> pa.Table:
+        """
+        Every row of `table` between two days (inclusive), memory-mapped
+
+        The returned Table references the mapped files; no data is copied
+        until a column is converted.
+        """
+        parts = []
+        for path in self._files(table, start, end):
+            with pa.memory_map(str(path), 'r') as source:
+                parts.append(pa.ipc.open_file(source).read_all())
+        if not parts:
+            return TABLES[table].empty_table()
+        # Files written before a column was added read back with it as nulls
+        return pa.concat_tables(parts, promote_options='default')
+
+    def training_set(self, start: date = None, end: date = None) -> pa.Table:
+        """Snapshots with the outcome of any trade they opened (null if none)"""
+        snapshots = self.read('snapshots', start, end)
+        outcomes = self.read('outcomes', start).drop_columns(['timestamp', 'symbol'])
+        return snapshots.join(outcomes, 'cycle_id', join_type='left outer').sort_by('cycle_id')
+
+    def _files(self, table: str, start: Optional[date], end: Optional[date]) -> List[Path]:
+        low = start.isoformat() if start else ''
+        high = end.isoformat() if end else '9999'
+        files = []
+        for directory in sorted((self.root / table).glob('date=*')):
+            day = directory.name[len('date='):]
+            if low <= day <= high:
+                files.extend(sorted(directory.glob('*.arrow')))
+        return files
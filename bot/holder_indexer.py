@@ -0,0 +1,346 @@
+"""
+NEXUS AI Trading Bot - Holder Indexer
+======================================
+Incremental $NEXUS holder balances from Transfer logs, stored in SQLite
+"""
+
+import time
+import sqlite3
+import threading
+from collections import defaultdict
+from loguru import logger
+from config import config
+from tier_cache import TRANSFER_TOPIC
+from typing import Dict, Iterable, Optional
+
+ZERO_ADDRESS = "0x" + "00" * 20
+
+# Blocks per eth_getLogs request
+BATCH_BLOCKS = 2000
+
+# Journal depth kept for reorg rollback
+REORG_WINDOW = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS holders (
+    chain TEXT NOT NULL,
+    holder TEXT NOT NULL,
+    balance TEXT NOT NULL,
+    PRIMARY KEY (chain, holder)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS checkpoints (
+    chain TEXT PRIMARY KEY,
+    block INTEGER NOT NULL,
+    hash TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS blocks (
+    chain TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (chain, number)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS journal (
+    chain TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    holder TEXT NOT NULL,
+    delta TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS journal_block ON journal (chain, block);
+"""
+
+
+class HolderIndexer:
+    """
+    Maintains every holder's raw balance per chain from Transfer logs.
+
+    Scans in block-range batches up to head minus INDEXER_CONFIRMATIONS and
+    resumes from the stored checkpoint. Each applied batch is journaled with
+    its end block hash; if a stored hash no longer matches the chain, the
+    journal is unwound to the last matching block and rescanned.
+
+    Balances are uint256, so they are stored as decimal text.
+    """
+
+    def __init__(self, verifier, db_path: str = None, start_blocks: Dict[str, int] = None):
+        self.verifier = verifier
+        self.db_path = db_path or config.INDEXER_DB_PATH
+        self.start_blocks = start_blocks if start_blocks is not None else config.INDEXER_START_BLOCKS
+        self.confirmations = config.INDEXER_CONFIRMATIONS
+        self.poll_interval = config.INDEXER_POLL_INTERVAL
+        self.max_lag = config.INDEXER_MAX_LAG
+        # A head older than this means the RPC has stalled; the index may be behind
+        self.max_head_age = self.poll_interval * 3 + config.TIER_RPC_TIMEOUT
+
+        self.heads: Dict[str, int] = {}
+        self._head_polled: Dict[str, float] = {}  # chain -> monotonic time of last successful head poll
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+        self._running = False
+        self._thread = None
+
+    # ============ READS ============
+
+    def get_raw_balance(self, wallet: str, chain: str) -> int:
+        """Raw (wei) balance for a wallet on one chain"""
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT balance FROM holders WHERE chain = ? AND holder = ?",
+                (chain, wallet.lower())
+            ).fetchone()
+
+        return int(row[0]) if row else 0
+
+    def get_balance(self, wallet: str, chain: str) -> float:
+        """Token balance for a wallet on one chain"""
+        return self.get_raw_balance(wallet, chain) / (10 ** self.verifier.get_decimals(chain))
+
+    def get_total_balance(self, wallet: str) -> float:
+        """Token balance summed across indexed chains"""
+        return sum(self.get_balance(wallet, chain) for chain in self.verifier.web3_instances)
+
+    def get_total_balances(self, wallets: Iterable[str]) -> Dict[str, float]:
+        """Token balances for many wallets (one query per chain)"""
+
+        wallets = list(dict.fromkeys(wallets))
+        lowered = {wallet.lower(): wallet for wallet in wallets}
+        totals = {wallet: 0.0 for wallet in wallets}
+
+        for chain in self.verifier.web3_instances:
+            scale = 10 ** self.verifier.get_decimals(chain)
+            with self._lock:
+                self._db.execute("CREATE TEMP TABLE IF NOT EXISTS lookup (holder TEXT PRIMARY KEY)")
+                self._db.execute("DELETE FROM lookup")
+                self._db.executemany("INSERT OR IGNORE INTO lookup VALUES (?)", [(w,) for w in lowered])
+                rows = self._db.execute(
+                    "SELECT h.holder, h.balance FROM holders h JOIN lookup l ON h.holder = l.holder WHERE h.chain = ?",
+                    (chain,)
+                ).fetchall()
+
+            for holder, balance in rows:
+                totals[lowered[holder]] += int(balance) / scale
+
+        return totals
+
+    def holder_count(self, chain: str) -> int:
+        """Number of non-zero holders on a chain"""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM holders WHERE chain = ?", (chain,)).fetchone()[0]
+
+    def checkpoint(self, chain: str) -> Optional[int]:
+        """Last indexed block for a chain"""
+        with self._lock:
+            row = self._db.execute("SELECT block FROM checkpoints WHERE chain = ?", (chain,)).fetchone()
+        return row[0] if row else None
+
+    def is_synced(self) -> bool:
+        """True if every chain's head was polled recently and is indexed to within INDEXER_MAX_LAG"""
+
+        now = time.monotonic()
+        for chain in self.verifier.web3_instances:
+            block = self.checkpoint(chain)
+            head = self.heads.get(chain)
+            if block is None or head is None or head - block > self.confirmations + self.max_lag:
+                return False
+            if now - self._head_polled.get(chain, 0.0) > self.max_head_age:
+                return False
+
+        return bool(self.verifier.web3_instances)
+
+    # ============ INDEXING ============
+
+    def start(self) -> None:
+        """Start the background indexing loop"""
+
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="holder-indexer", daemon=True)
+        self._thread.start()
+        logger.info(f"Holder indexer started ({self.db_path})")
+
+    def stop(self) -> None:
+        """Stop indexing"""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval + 5)
+
+    def sync_once(self) -> None:
+        """Index every chain up to its confirmed head"""
+
+        for chain in list(self.verifier.web3_instances):
+            try:
+                self.index_chain(chain)
+            except Exception as e:
+                logger.warning(f"Indexer error on {chain}: {e}")
+
+    def index_chain(self, chain: str) -> int:
+        """
+        Index one chain from its checkpoint to head - confirmations
+
+        Returns:
+            Number of Transfer logs applied
+        """
+
+        w3 = self.verifier.web3_instances[chain]
+        token = self.verifier.contracts[chain].address
+
+        head = w3.eth.block_number
+        self.heads[chain] = head
+        self._head_polled[chain] = time.monotonic()
+        target = head - self.confirmations
+
+        self._handle_reorg(chain)
+
+        cursor = self.checkpoint(chain)
+        if cursor is None:
+            cursor = self.start_blocks.get(chain, 0) - 1
+
+        applied = 0
+
+        while cursor < target:
+            to_block = min(target, cursor + BATCH_BLOCKS)
+            logs = w3.eth.get_logs({
+                'fromBlock': cursor + 1,
+                'toBlock': to_block,
+                'address': token,
+                'topics': [TRANSFER_TOPIC]
+            })
+            block_hash = w3.eth.get_block(to_block)['hash']
+
+            self._apply(chain, logs, to_block, self._hex(block_hash))
+
+            applied += len(logs)
+            cursor = to_block
+
+        if applied:
+            logger.debug(f"Indexed {applied} transfers on {chain} up to block {cursor}")
+
+        return applied
+
+    def _apply(self, chain: str, logs: list, to_block: int, block_hash: str):
+        """Apply one batch of logs and move the checkpoint atomically"""
+
+        # Net delta per (block, holder) keeps the journal compact
+        deltas = defaultdict(int)
+
+        for log in logs:
+            topics = log['topics']
+            if len(topics) < 3:
+                continue
+
+            sender = '0x' + bytes(topics[1])[-20:].hex()
+            receiver = '0x' + bytes(topics[2])[-20:].hex()
+            amount = int.from_bytes(bytes(log['data'])[:32], 'big')
+            block = log['blockNumber']
+
+            if sender != ZERO_ADDRESS:
+                deltas[(block, sender)] -= amount
+            if receiver != ZERO_ADDRESS:
+                deltas[(block, receiver)] += amount
+
+        with self._lock, self._db:
+            self._apply_deltas(chain, deltas.items())
+
+            self._db.executemany(
+                "INSERT INTO journal (chain, block, holder, delta) VALUES (?, ?, ?, ?)",
+                [(chain, block, holder, str(delta)) for (block, holder), delta in deltas.items() if delta]
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO blocks (chain, number, hash) VALUES (?, ?, ?)",
+                (chain, to_block, block_hash)
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO checkpoints (chain, block, hash) VALUES (?, ?, ?)",
+                (chain, to_block, block_hash)
+            )
+
+            # Beyond the reorg window, history is final
+            floor = to_block - REORG_WINDOW
+            self._db.execute("DELETE FROM journal WHERE chain = ? AND block <= ?", (chain, floor))
+            self._db.execute("DELETE FROM blocks WHERE chain = ? AND number <= ?", (chain, floor))
+
+    def _apply_deltas(self, chain: str, deltas: Iterable):
+        """Add signed deltas to holder balances (called inside a transaction)"""
+
+        for (_, holder), delta in deltas:
+            if not delta:
+                continue
+
+            row = self._db.execute(
+                "SELECT balance FROM holders WHERE chain = ? AND holder = ?", (chain, holder)
+            ).fetchone()
+            balance = (int(row[0]) if row else 0) + delta
+
+            if balance > 0:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO holders (chain, holder, balance) VALUES (?, ?, ?)",
+                    (chain, holder, str(balance))
+                )
+            else:
+                self._db.execute("DELETE FROM holders WHERE chain = ? AND holder = ?", (chain, holder))
+
+    def _handle_reorg(self, chain: str):
+        """Unwind journaled batches whose block hash no longer matches the chain"""
+
+        with self._lock:
+            row = self._db.execute("SELECT block, hash FROM checkpoints WHERE chain = ?", (chain,)).fetchone()
+        if not row:
+            return
+
+        w3 = self.verifier.web3_instances[chain]
+        if self._hex(w3.eth.get_block(row[0])['hash']) == row[1]:
+            return
+
+        # Walk stored batch-end hashes back to the last one still canonical
+        with self._lock:
+            stored = self._db.execute(
+                "SELECT number, hash FROM blocks WHERE chain = ? ORDER BY number DESC", (chain,)
+            ).fetchall()
+
+        ancestor = None
+        for number, stored_hash in stored:
+            if self._hex(w3.eth.get_block(number)['hash']) == stored_hash:
+                ancestor = (number, stored_hash)
+                break
+
+        if ancestor is None:
+            raise RuntimeError(f"Reorg on {chain} deeper than {REORG_WINDOW} blocks, rebuild the index")
+
+        number, ancestor_hash = ancestor
+        logger.warning(f"Reorg detected on {chain}: rolling back from {row[0]} to {number}")
+
+        with self._lock, self._db:
+            undo = self._db.execute(
+                "SELECT block, holder, delta FROM journal WHERE chain = ? AND block > ?", (chain, number)
+            ).fetchall()
+            self._apply_deltas(chain, [((block, holder), -int(delta)) for block, holder, delta in undo])
+
+            self._db.execute("DELETE FROM journal WHERE chain = ? AND block > ?", (chain, number))
+            self._db.execute("DELETE FROM blocks WHERE chain = ? AND number > ?", (chain, number))
+            self._db.execute(
+                "INSERT OR REPLACE INTO checkpoints (chain, block, hash) VALUES (?, ?, ?)",
+                (chain, number, ancestor_hash)
+            )
+
+    def _run(self):
+        """Background loop"""
+        while self._running:
+            self.sync_once()
+            time.sleep(self.poll_interval)
+
+    @staticmethod
+    def _hex(value) -> str:
+        """Normalize a block hash to 0x-prefixed lowercase hex"""
+        if isinstance(value, str):
+            return value.lower() if value.startswith('0x') else '0x' + value.lower()
+        return '0x' + bytes(value).hex()
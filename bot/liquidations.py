@@ -0,0 +1,190 @@
+"""
+NEXUS AI Trading Bot - Liquidations
+====================================
+Rolling 24h liquidation totals and price map from the forceOrder stream
+"""
+
+import math
+import time
+import threading
+import numpy as np
+from loguru import logger
+from market_stream import MarketStream
+from typing import Dict, Optional
+
+MINUTES_PER_DAY = 1440
+HOURS_PER_DAY = 24
+
+# Distinct price levels kept in the liquidation map
+MAX_PRICE_BUCKETS = 500
+
+# A level counts as a cluster if it holds this share of the side's 24h total
+CLUSTER_SHARE = 0.05
+
+
+class LiquidationTracker:
+    """
+    Aggregates forced liquidations for one symbol in memory.
+
+    Totals live in a ring of 1440 per-minute buckets, so the 24h sums never
+    need pruning. The price map groups liquidations into buckets of roughly
+    0.1% of price, each with its own ring of 24 hourly slots, so a level
+    covers the same 24h window as the totals it is compared with (at hour
+    granularity: old liquidations can leave a level up to an hour before
+    they leave the totals, never after). Levels quiet for 24h are dropped
+    and the map is capped at MAX_PRICE_BUCKETS.
+
+    Binance pushes at most one liquidation per symbol per second on this
+    stream, so totals are a lower bound during cascades.
+    """
+
+    def __init__(self, stream: MarketStream):
+        self.stream = stream
+
+        self._lock = threading.Lock()
+        self._minutes = np.full(MINUTES_PER_DAY, -1, dtype=np.int64)  # minute each slot holds
+        self._long = np.zeros(MINUTES_PER_DAY)    # long positions liquidated (SELL orders), USD
+        self._short = np.zeros(MINUTES_PER_DAY)   # short positions liquidated (BUY orders), USD
+        self._levels: Dict[int, list] = {}        # bucket -> [hours, long_usd, short_usd, last_minute]
+        self._bucket_size: Optional[float] = None
+
+        self.events = 0
+
+        self.stream.subscribe('forceOrder', self._on_force_order)
+
+    def start(self) -> None:
+        """Start the shared stream (no-op if already running)"""
+        self.stream.start()
+
+    # ============ STREAM ============
+
+    def _on_force_order(self, data: dict):
+        order = data.get('o', {})
+        try:
+            price = float(order.get('ap') or order['p'])
+            qty = float(order.get('z') or order['q'])
+            minute = int(order.get('T') or data.get('E')) // 60_000
+        except (KeyError, TypeError, ValueError):
+            return
+
+        if price <= 0 or qty <= 0:
+            return
+
+        self.add(order.get('S') == 'SELL', price, price * qty, minute)
+
+    def add(self, is_long: bool, price: float, notional: float, minute: int = None) -> None:
+        """Record one liquidation (is_long: a long position was closed)"""
+
+        minute = int(time.time() // 60) if minute is None else minute
+        slot = minute % MINUTES_PER_DAY
+
+        with self._lock:
+            if self._minutes[slot] != minute:
+                self._minutes[slot] = minute
+                self._long[slot] = 0.0
+                self._short[slot] = 0.0
+
+            if is_long:
+                self._long[slot] += notional
+            else:
+                self._short[slot] += notional
+
+            if self._bucket_size is None:
+                # ~0.1% of the first price, rounded to a power of ten
+                self._bucket_size = 10.0 ** (math.floor(math.log10(price)) - 2)
+
+            bucket = int(price // self._bucket_size)
+            level = self._levels.get(bucket)
+            if level is None:
+                if len(self._levels) >= MAX_PRICE_BUCKETS:
+                    self._prune(minute)
+                level = self._levels[bucket] = [
+                    np.full(HOURS_PER_DAY, -1, dtype=np.int64), np.zeros(HOURS_PER_DAY), np.zeros(HOURS_PER_DAY), minute
+                ]
+
+            hour = minute // 60
+            hour_slot = hour % HOURS_PER_DAY
+            if level[0][hour_slot] != hour:
+                level[0][hour_slot] = hour
+                level[1][hour_slot] = 0.0
+                level[2][hour_slot] = 0.0
+
+            level[1 if is_long else 2][hour_slot] += notional
+            level[3] = max(level[3], minute)
+            self.events += 1
+
+    # ============ READS ============
+
+    def totals(self, now_minute: int = None) -> tuple:
+        """(long_usd, short_usd) liquidated over the last 24h"""
+        now_minute = int(time.time() // 60) if now_minute is None else now_minute
+        with self._lock:
+            live = self._minutes > now_minute - MINUTES_PER_DAY
+            return float(self._long[live].sum()), float(self._short[live].sum())
+
+    def snapshot(self, price: float = None) -> dict:
+        """
+        Snapshot fields for the current cycle
+
+        nearest_long_liq / nearest_short_liq are the closest price levels
+        below / above `price` where at least CLUSTER_SHARE of the side's 24h
+        liquidations happened.
+        """
+        now_minute = int(time.time() // 60)
+        long_total, short_total = self.totals(now_minute)
+
+        data = {
+            'long_liquidations': long_total,
+            'short_liquidations': short_total
+        }
+
+        if price:
+            data['nearest_long_liq'] = self._nearest_cluster(price, below=True, total=long_total, now_minute=now_minute)
+            data['nearest_short_liq'] = self._nearest_cluster(price, below=False, total=short_total, now_minute=now_minute)
+
+        return data
+
+    def price_map(self, now_minute: int = None) -> Dict[float, tuple]:
+        """Bucket price -> (long_usd, short_usd) over the last 24h"""
+        now_minute = int(time.time() // 60) if now_minute is None else now_minute
+        with self._lock:
+            return {
+                bucket * self._bucket_size: self._level_amounts(level, now_minute)
+                for bucket, level in self._levels.items()
+            }
+
+    @staticmethod
+    def _level_amounts(level: list, now_minute: int) -> tuple:
+        """(long_usd, short_usd) in a level's live hourly slots (lock held)"""
+        live = level[0] > now_minute // 60 - HOURS_PER_DAY
+        return float(level[1][live].sum()), float(level[2][live].sum())
+
+    def _nearest_cluster(self, price: float, below: bool, total: float, now_minute: int) -> Optional[float]:
+        if not total:
+            return None
+
+        side = 0 if below else 1
+        best = None
+        with self._lock:
+            for bucket, level in self._levels.items():
+                if level[3] <= now_minute - MINUTES_PER_DAY:
+                    continue
+                if self._level_amounts(level, now_minute)[side] < total * CLUSTER_SHARE:
+                    continue
+                # Bucket midpoint as the level
+                level_price = (bucket + 0.5) * self._bucket_size
+                if (below and level_price < price) or (not below and level_price > price):
+                    if best is None or abs(level_price - price) < abs(best - price):
+                        best = level_price
+        return best
+
+    def _prune(self, minute: int):
+        """Drop stale levels, then the smallest, until the map has room (lock held)"""
+        cutoff = minute - MINUTES_PER_DAY
+        self._levels = {b: level for b, level in self._levels.items() if level[3] > cutoff}
+
+        if len(self._levels) >= MAX_PRICE_BUCKETS:
+            keep = int(MAX_PRICE_BUCKETS * 0.9)
+            ranked = sorted(self._levels.items(), key=lambda item: sum(self._level_amounts(item[1], minute)), reverse=True)
+            self._levels = dict(ranked[:keep])
+            logger.debug(f"Liquidation map trimmed to {keep} levels")
@@ -0,0 +1,198 @@
+"""
+NEXUS AI Trading Bot - LLM Ensemble
+====================================
+Concurrent OpenAI-compatible model calls with quorum, hedging and cancellation
+"""
+
+import os
+import time
+import asyncio
+import threading
+import metrics
+from collections import Counter as Tally, deque
+from loguru import logger
+from config import config
+from decision import response_format
+from typing import Callable, List
+
+# Latencies remembered per model for its hedge delay
+LATENCY_WINDOW = 50
+
+# Samples needed before the p95 replaces AI_HEDGE_AFTER_SECONDS
+MIN_SAMPLES = 10
+
+
+class ModelEndpoint:
+    """One model behind an OpenAI-compatible API"""
+
+    def __init__(self, model: str, base_url: str, api_key: str):
+        # Deferred: openai pulls in a large dependency tree
+        from openai import AsyncOpenAI
+
+        self.model = model
+        self.base_url = base_url
+        self.name = model
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        self.response_format = response_format(config.AI_RESPONSE_FORMAT)
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait before duplicating a request: p95 of recent latency"""
+        if len(self._latencies) < MIN_SAMPLES:
+            return config.AI_HEDGE_AFTER_SECONDS
+        ordered = sorted(self._latencies)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+
+    async def complete(self, messages: list, timeout: float) -> str:
+        start = time.perf_counter()
+        extra = {'response_format': self.response_format} if self.response_format else {}
+        with metrics.track_upstream('llm', self.name):
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.3,  # Lower = more consistent
+                max_tokens=500,
+                timeout=timeout,
+                **extra
+            )
+        self._latencies.append(time.perf_counter() - start)
+        return response.choices[0].message.content
+
+
+def parse_models(spec: str, default_key: str) -> List[tuple]:
+    """
+    'model@base_url[|KEY_ENV], ...' -> [(model, base_url, api_key)]
+
+    Entries without |KEY_ENV use `default_key`.
+    """
+    members = []
+    for entry in filter(None, (part.strip() for part in spec.split(','))):
+        entry, _, key_env = entry.partition('|')
+        model, _, base_url = entry.partition('@')
+        if not model or not base_url:
+            logger.warning(f"Ignoring AI_ENSEMBLE entry '{entry}' (expected model@base_url)")
+            continue
+        members.append((model.strip(), base_url.strip(), os.getenv(key_env.strip(), '') if key_env else default_key))
+    return members
+
+
+class Ensemble:
+    """
+    Sends one prompt to every model at once and returns as soon as `quorum`
+    parsed answers agree on the decision; the rest are cancelled.
+
+    Each model's request is hedged: if it hasn't answered within that
+    model's p95 latency (or fails outright), a duplicate is sent and the
+    first answer wins. Runs on its own event loop thread so the sync
+    scheduler can call it.
+    """
+
+    def __init__(self, members: List[ModelEndpoint], quorum: int):
+        self.members = members
+        self.quorum = max(1, min(quorum, len(members)))
+        self.timeout = config.AI_TIMEOUT_SECONDS
+        self.hedging = config.AI_HEDGE_ENABLED
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-ensemble", daemon=True)
+        self._thread.start()
+
+    def run(self, messages: list, parse: Callable[[str, str], object]) -> dict:
+        """
+        Args:
+            parse: (text, model) -> decision object with .get('decision'); raises on bad output
+
+        Returns:
+            {'winner': decision or None, 'results': [(model, parsed)], 'errors': [(model, error)],
+             'answers': [(model, raw text)] for every answer received, parsed or not,
+             'requests': completions sent, hedges included}
+        """
+        future = asyncio.run_coroutine_threadsafe(self._gather(messages, parse), self._loop)
+        return future.result(timeout=self.timeout + 5)
+
+    def close(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    # ============ ASYNC ============
+
+    async def _gather(self, messages: list, parse: Callable[[str, str], object]) -> dict:
+        deadline = time.monotonic() + self.timeout
+        sent = Tally()
+        tasks = {asyncio.ensure_future(self._ask(member, messages, deadline, sent)): member for member in self.members}
+
+        results, errors, answers = [], [], []
+        votes = Tally()
+        winner = None
+        pending = set(tasks)
+
+        try:
+            while pending and winner is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    member = tasks[task]
+                    try:
+                        text = task.result()
+                        answers.append((member.name, text))
+                        parsed = parse(text, member.name)
+                    except Exception as e:
+                        errors.append((member.name, e))
+                        metrics.AI_REQUESTS.labels(member.name, 'error').inc()
+                        continue
+                    metrics.AI_REQUESTS.labels(member.name, 'ok').inc()
+                    results.append((member.name, parsed))
+                    votes[parsed.get('decision')] += 1
+                    if votes[parsed.get('decision')] >= self.quorum:
+                        winner = parsed.get('decision')
+        finally:
+            for task in pending:
+                task.cancel()
+                metrics.AI_REQUESTS.labels(tasks[task].name, 'cancelled').inc()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        for task in pending:
+            if winner is None:
+                errors.append((tasks[task].name, TimeoutError("no answer before deadline")))
+
+        return {'winner': winner, 'results': results, 'errors': errors, 'answers': answers,
+                'requests': sum(sent.values())}
+
+    async def _ask(self, member: ModelEndpoint, messages: list, deadline: float, sent: Tally) -> str:
+        """One model's answer, hedged with a duplicate after its p95 or a fast failure"""
+
+        def remaining() -> float:
+            return max(deadline - time.monotonic(), 0.1)
+
+        def attempt_request() -> asyncio.Future:
+            sent[member.name] += 1
+            return asyncio.ensure_future(member.complete(messages, remaining()))
+
+        attempts = {attempt_request()}
+        error = None
+        try:
+            if self.hedging:
+                done, attempts = await asyncio.wait(attempts, timeout=min(member.hedge_delay(), remaining()))
+                for attempt in done:
+                    if attempt.exception() is None:
+                        return attempt.result()
+                    error = attempt.exception()
+                    logger.debug(f"{member.name} failed ({error}), hedging")
+
+                # Stalled past p95 or failed: race a duplicate against whatever is still running
+                metrics.AI_REQUESTS.labels(member.name, 'hedged').inc()
+                attempts.add(attempt_request())
+
+            while attempts:
+                finished, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in finished:
+                    if attempt.exception() is None:
+                        return attempt.result()
+                    error = attempt.exception()
+            raise error
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
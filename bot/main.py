@@ -11,9 +11,11 @@ from datetime import datetime
 from loguru import logger
 from apscheduler.schedulers.blocking import BlockingScheduler
 
+import metrics
 from config import config, Config
 from trader import Trader
 from telegram_bot import TelegramBot
+from analysis_scheduler import AnalysisScheduler
 
 
 # Configure logging
@@ -38,7 +40,10 @@ class NexusBot:
         self.trader = None
         self.telegram = None
         self.scheduler = None
+        self.schedule = None
         self.running = False
+        self.started_at = None
+        self.first_decision_logged = False
         
     def validate_config(self) -> bool:
         """Validate configuration before starting"""
@@ -56,6 +61,8 @@ class NexusBot:
     def setup(self) -> bool:
         """Initialize all components"""
         
+        self.started_at = time.perf_counter()
+        
         logger.info("="*50)
         logger.info("NEXUS AI TRADING BOT")
         logger.info("="*50)
@@ -69,11 +76,25 @@ class NexusBot:
         
         # Initialize components
         try:
-            self.trader = Trader()
+            phases = {}
+            phase_start = time.perf_counter()
+            
+            metrics.start_server()
+            
+            # One notifier shared by the bot and the trader
             self.telegram = TelegramBot()
+            phases['telegram'] = time.perf_counter() - phase_start
+            
+            phase_start = time.perf_counter()
+            self.trader = Trader(telegram=self.telegram)
+            phases['trader'] = time.perf_counter() - phase_start
+            
+            phase_start = time.perf_counter()
             
             # Setup scheduler
             self.scheduler = BlockingScheduler()
+            if config.ADAPTIVE_SCHEDULE_ENABLED:
+                self.schedule = AnalysisScheduler()
             
             # Schedule analysis job
             self.scheduler.add_job(
@@ -93,13 +114,19 @@ class NexusBot:
                 id='daily_summary'
             )
             
-            logger.info("Setup complete")
+            phases['scheduler'] = time.perf_counter() - phase_start
+            
+            logger.info(
+                f"Setup complete in {time.perf_counter() - self.started_at:.2f}s ("
+                + ", ".join(f"{name} {secs:.2f}s" for name, secs in phases.items()) + ")"
+            )
             return True
             
         except Exception as e:
             logger.error(f"Setup failed: {e}")
             return False
     
+    @metrics.timed('cycle')
     def analysis_cycle(self):
         """Main analysis and trading cycle"""
         
@@ -109,19 +136,47 @@ class NexusBot:
             
             # Run analysis
             decision = self.trader.run_analysis()
+            # Every request the ensemble sent counts; local-model cycles send none
+            if self.schedule and self.trader.decider.llm_requests:
+                self.schedule.record_call(self.trader.decider.llm_requests)
             
             # Execute if actionable
+            if not self.first_decision_logged:
+                self.first_decision_logged = True
+                logger.info(f"First decision {time.perf_counter() - self.started_at:.2f}s after start")
+            
             if decision.get('decision') != 'WAIT' and decision.get('confidence', 0) >= 70:
                 self.trader.execute_decision(decision)
             
             # Check positions
             self.trader.check_positions()
             
-            logger.info(f"Next analysis in {config.ANALYSIS_INTERVAL} seconds")
-            
         except Exception as e:
             logger.error(f"Analysis cycle error: {e}")
             self.telegram.send_error(str(e))
+        
+        self._schedule_next()
+    
+    def _schedule_next(self):
+        """Move the next analysis closer or further out based on volatility"""
+        
+        if not self.schedule:
+            logger.info(f"Next analysis in {config.ANALYSIS_INTERVAL} seconds")
+            return
+        
+        market = self.trader.last_market_data
+        atr_ratio = market.get('atr_ratio') if market else None
+        interval = self.schedule.next_interval(config.TRADING_SYMBOL, atr_ratio)
+        
+        try:
+            self.scheduler.reschedule_job('analysis', trigger='interval', seconds=interval)
+        except Exception as e:
+            logger.error(f"Could not reschedule analysis: {e}")
+            return
+        
+        ratio = f"{atr_ratio:.2f}" if atr_ratio else "n/a"
+        logger.info(f"Next analysis in {interval:.0f} seconds (ATR ratio {ratio}, "
+                    f"{self.schedule.budget.used()}/{config.LLM_CALLS_PER_HOUR} LLM calls this hour)")
     
     def daily_summary(self):
         """Send daily performance summary"""
@@ -172,9 +227,13 @@ class NexusBot:
         if self.scheduler:
             self.scheduler.shutdown(wait=False)
         
+        if self.trader:
+            self.trader.shutdown()
+        
         # Notify
         if self.telegram:
             self.telegram.send("🛑 <b>NEXUS BOT STOPPED</b>")
+            self.telegram.close(timeout=5)
         
         logger.info("Bot stopped")
 
@@ -0,0 +1,232 @@
+"""
+NEXUS AI Trading Bot - Market State
+====================================
+Array-backed candles, NumPy indicators and the raw market snapshot
+"""
+
+import time
+import numpy as np
+from typing import Iterable, Optional
+
+CANDLE_DTYPE = np.dtype([
+    ('timestamp', 'i8'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'f8'),
+])
+
+
+class CandleBuffer:
+    """
+    Most recent OHLCV candles for one symbol in a single structured array.
+
+    ccxt rows are merged by timestamp: the still-open candle is overwritten
+    in place and new candles are appended. Storage is twice the capacity so
+    trimming old candles is a rare block copy rather than a shift per append.
+    """
+
+    __slots__ = ('capacity', '_data', '_start', '_end')
+
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        self._data = np.zeros(capacity * 2, dtype=CANDLE_DTYPE)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def candles(self) -> np.ndarray:
+        """Oldest-first view (no copy)"""
+        return self._data[self._start:self._end]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.candles['close']
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return int(self._data['timestamp'][self._end - 1]) if len(self) else None
+
+    def update(self, rows: Iterable[list]) -> int:
+        """
+        Merge ccxt OHLCV rows ([ts, open, high, low, close, volume], oldest first)
+
+        Returns:
+            Number of new candles appended
+        """
+        appended = 0
+        for row in rows:
+            ts = int(row[0])
+            last = self.last_timestamp
+
+            if last is not None and ts < last:
+                continue
+            if last is not None and ts == last:
+                self._data[self._end - 1] = tuple(row[:6])
+                continue
+
+            if self._end == len(self._data):
+                self._compact()
+            self._data[self._end] = tuple(row[:6])
+            self._end += 1
+            appended += 1
+
+        if len(self) > self.capacity:
+            self._start = self._end - self.capacity
+
+        return appended
+
+    def clear(self) -> None:
+        self._start = self._end = 0
+
+    def _compact(self):
+        """Move the live window to the front of storage"""
+        size = min(len(self), self.capacity - 1)
+        self._data[:size] = self._data[self._end - size:self._end]
+        self._start, self._end = 0, size
+
+
+# ============ INDICATORS ============
+# Match the `ta` library (pandas ewm, adjust=False) so values don't shift
+
+def ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    """Exponentially weighted mean seeded with the first value"""
+    out = np.empty(len(values))
+    if not len(values):
+        return out
+
+    acc = float(values[0])
+    decay = 1 - alpha
+    for i, value in enumerate(values.tolist()):
+        acc = alpha * value + decay * acc
+        out[i] = acc
+    return out
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    return ewm(values, 2 / (span + 1))
+
+
+def rsi(close: np.ndarray, window: int = 14) -> Optional[float]:
+    """Wilder RSI of the last candle"""
+    if len(close) <= window:
+        return None
+
+    # Leading zero change, as ta's NaN-filled first diff
+    diff = np.diff(close, prepend=close[0])
+    up = ewm(np.where(diff > 0, diff, 0.0), 1 / window)[-1]
+    down = ewm(np.where(diff < 0, -diff, 0.0), 1 / window)[-1]
+    if down == 0:
+        return 100.0
+    return float(100 - 100 / (1 + up / down))
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Optional[tuple]:
+    """(macd, signal) of the last candle"""
+    if len(close) < slow + signal:
+        return None
+
+    line = ema(close, fast) - ema(close, slow)
+    # The slow EMA is only defined from its first full window
+    signal_line = ema(line[slow - 1:], signal)
+    return float(line[-1]), float(signal_line[-1])
+
+
+def atr(candles: np.ndarray, window: int = 14) -> np.ndarray:
+    """Wilder ATR series, seeded with the mean of the first window (empty if too short)"""
+    if len(candles) < window:
+        return np.empty(0)
+
+    high, low, close = candles['high'], candles['low'], candles['close']
+    # First candle has no previous close: its range, as ta does
+    prev_close = np.concatenate((close[:1], close[:-1]))
+    true_range = np.maximum(high, prev_close) - np.minimum(low, prev_close)
+    true_range[0] = high[0] - low[0]
+
+    out = np.empty(len(true_range) - window + 1)
+    acc = float(true_range[:window].mean())
+    out[0] = acc
+    for i, value in enumerate(true_range[window:].tolist(), start=1):
+        acc = (acc * (window - 1) + value) / window
+        out[i] = acc
+    return out
+
+
+# ============ SNAPSHOT ============
+
+class MarketSnapshot:
+    """
+    One cycle's market state as raw numbers (None = unavailable).
+
+    Nothing here is formatted; `AIEngine._build_prompt` does that at the edge.
+    """
+
+    __slots__ = (
+        'symbol', 'timestamp',
+        # Ticker
+        'price', 'bid', 'ask', 'high_24h', 'low_24h', 'volume_24h', 'change_24h',
+        # Technicals
+        'rsi', 'macd', 'macd_signal', 'ema_20', 'ema_50', 'atr', 'atr_ratio',
+        # Order book
+        'microprice', 'spread_bps', 'spread_z', 'book_imbalance', 'bid_liquidity', 'ask_liquidity',
+        # Derivatives
+        'funding_rate', 'funding_avg_24h', 'funding_change_8h',
+        'open_interest', 'oi_change_1h', 'oi_change_4h', 'oi_change_24h', 'long_short_ratio',
+        'long_liquidations', 'short_liquidations', 'nearest_long_liq', 'nearest_short_liq',
+        # Sentiment
+        'fear_greed', 'fear_greed_label', 'news', 'news_sentiment', 'news_revision', 'social_volume',
+    )
+
+    def __init__(self, symbol: str, **values):
+        for name in self.__slots__:
+            setattr(self, name, None)
+        self.symbol = symbol
+        self.timestamp = time.time()
+        self.news = []  # (sentiment, title)
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def get(self, name: str, default=None):
+        value = getattr(self, name, None)
+        return default if value is None else value
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__
+                           if getattr(self, name) not in (None, []))
+        return f"MarketSnapshot({fields})"
+
+
+# ============ FORMATTING ============
+
+def format_number(num) -> str:
+    """Format large numbers (1B, 1M, etc)"""
+    if num is None:
+        return "N/A"
+    try:
+        num = float(num)
+        if num >= 1_000_000_000:
+            return f"{num/1_000_000_000:.1f}B"
+        elif num >= 1_000_000:
+            return f"{num/1_000_000:.1f}M"
+        elif num >= 1_000:
+            return f"{num/1_000:.1f}K"
+        else:
+            return str(round(num, 2))
+    except (TypeError, ValueError):
+        return str(num)
+
+
+def format_value(value, digits: int = 2) -> str:
+    """Round a number for display, 'N/A' if missing"""
+    if value is None:
+        return "N/A"
+    if isinstance(value, float):
+        return str(round(value, digits))
+    return str(value)
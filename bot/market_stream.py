@@ -0,0 +1,149 @@
+"""
+NEXUS AI Trading Bot - Market Stream
+=====================================
+Binance Futures WebSocket streams on a background thread
+"""
+
+import json
+import asyncio
+import threading
+import websockets
+from loguru import logger
+from config import config
+from typing import Callable, Dict, List
+
+
+class MarketStream:
+    """Single combined WebSocket connection shared by all stream consumers"""
+
+    MAINNET_URL = "wss://fstream.binance.com/stream"
+    TESTNET_URL = "wss://stream.binancefuture.com/stream"
+
+    def __init__(self, symbol: str = None):
+        self.symbol = symbol or config.TRADING_SYMBOL
+        self.stream_symbol = self.symbol.split(':')[0].replace('/', '').lower()
+        self.url = config.BINANCE_WS_URL or (self.TESTNET_URL if config.BINANCE_TESTNET else self.MAINNET_URL)
+
+        self.handlers: Dict[str, List[Callable[[dict], None]]] = {}
+        self.connected = False
+
+        self._loop = None
+        self._thread = None
+        self._ws = None
+        self._running = False
+        self._request_id = 0
+
+    def subscribe(self, stream: str, handler: Callable[[dict], None]) -> None:
+        """
+        Register a handler for a symbol stream
+
+        Args:
+            stream: Stream suffix, e.g. 'markPrice@1s', 'bookTicker', 'forceOrder'
+            handler: Called with the event payload on the stream thread
+        """
+        name = f"{self.stream_symbol}@{stream}"
+        is_new = name not in self.handlers
+        self.handlers.setdefault(name, []).append(handler)
+
+        # Live connection: subscribe without reconnecting
+        if is_new and self._running and self._loop:
+            asyncio.run_coroutine_threadsafe(self._send_subscribe([name]), self._loop)
+
+    def start(self) -> None:
+        """Start the stream thread"""
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="market-stream", daemon=True)
+        self._thread.start()
+        logger.info(f"Market stream started for {self.symbol}")
+
+    def stop(self) -> None:
+        """Stop the stream thread"""
+        self._running = False
+
+        if self._loop and self._ws:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+        logger.info("Market stream stopped")
+
+    # ============ INTERNAL ============
+
+    def _run(self):
+        """Thread entry point"""
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._consume())
+        finally:
+            self._loop.close()
+
+    async def _consume(self):
+        """Connect, dispatch and reconnect with backoff"""
+        backoff = 1
+
+        while self._running:
+            streams = list(self.handlers)
+            if not streams:
+                await asyncio.sleep(1)
+                continue
+
+            try:
+                async with websockets.connect(f"{self.url}?streams={'/'.join(streams)}", ping_interval=20) as ws:
+                    self._ws = ws
+                    self.connected = True
+                    backoff = 1
+                    logger.info(f"Market stream connected: {', '.join(streams)}")
+
+                    # Handlers added between building the URL and connecting
+                    missing = [s for s in list(self.handlers) if s not in streams]
+                    if missing:
+                        await self._send_subscribe(missing)
+
+                    async for raw in ws:
+                        self._dispatch(raw)
+
+            except Exception as e:
+                if self._running:
+                    logger.warning(f"Market stream error: {e}, reconnecting in {backoff}s")
+            finally:
+                self._ws = None
+                self.connected = False
+
+            if self._running:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+
+    async def _send_subscribe(self, streams: list):
+        """Subscribe to extra streams on the live connection"""
+        if not self._ws:
+            return
+
+        self._request_id += 1
+        await self._ws.send(json.dumps({
+            'method': 'SUBSCRIBE',
+            'params': streams,
+            'id': self._request_id
+        }))
+
+    def _dispatch(self, raw: str):
+        """Route a combined-stream message to its handlers"""
+        try:
+            msg = json.loads(raw)
+        except ValueError:
+            return
+
+        # Subscription acks have no stream field
+        handlers = self.handlers.get(msg.get('stream'))
+        if not handlers:
+            return
+
+        data = msg.get('data', {})
+        for handler in handlers:
+            try:
+                handler(data)
+            except Exception as e:
+                logger.error(f"Stream handler error on {msg.get('stream')}: {e}")
@@ -0,0 +1,186 @@
+"""
+NEXUS AI Trading Bot - Metrics
+===============================
+Prometheus instrumentation: stage latency, upstream latency, caches, fallbacks, circuits
+"""
+
+import time
+import functools
+from contextlib import contextmanager
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+from loguru import logger
+from config import config
+
+# Buckets from 1ms (local work) up to 30s (LLM calls)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+STAGE_LATENCY = Histogram(
+    'nexus_stage_latency_seconds',
+    'Latency of bot pipeline stages',
+    ['stage'],
+    buckets=LATENCY_BUCKETS
+)
+
+STAGE_ERRORS = Counter(
+    'nexus_stage_errors_total',
+    'Exceptions raised by bot pipeline stages',
+    ['stage']
+)
+
+UPSTREAM_LATENCY = Histogram(
+    'nexus_upstream_latency_seconds',
+    'Latency of calls to external services',
+    ['upstream', 'endpoint'],
+    buckets=LATENCY_BUCKETS
+)
+
+UPSTREAM_ERRORS = Counter(
+    'nexus_upstream_errors_total',
+    'Failed calls to external services',
+    ['upstream', 'endpoint']
+)
+
+CACHE_REQUESTS = Counter(
+    'nexus_cache_requests_total',
+    'Cache lookups by result',
+    ['cache', 'result']
+)
+
+FALLBACKS = Counter(
+    'nexus_fallbacks_total',
+    'Times a default or fallback value was used',
+    ['source']
+)
+
+HEDGED_REQUESTS = Counter(
+    'nexus_hedged_requests_total',
+    'Duplicate requests sent because the first one was slower than usual',
+    ['upstream']
+)
+
+RATE_LIMIT_HEADROOM = Gauge(
+    'nexus_rate_limit_headroom',
+    'Remaining request budget reported by an upstream',
+    ['upstream']
+)
+
+QUEUE_DEPTH = Gauge(
+    'nexus_queue_depth',
+    'Items waiting in an internal queue',
+    ['queue']
+)
+
+AI_REQUESTS = Counter(
+    'nexus_ai_requests_total',
+    'LLM requests per model by outcome (ok, error, hedged, cancelled)',
+    ['model', 'outcome']
+)
+
+AI_PARSE_FAILURES = Counter(
+    'nexus_ai_parse_failures_total',
+    'Model answers rejected by the decision parser',
+    ['model', 'reason']
+)
+
+DECISION_CLAMPS = Counter(
+    'nexus_decision_clamps_total',
+    'Decision fields clamped or dropped by validation',
+    ['field']
+)
+
+CIRCUIT_STATE = Gauge(
+    'nexus_circuit_state',
+    'Circuit breaker state per source (0 closed, 1 half-open, 2 open)',
+    ['source']
+)
+
+CIRCUIT_TIMEOUT = Gauge(
+    'nexus_circuit_timeout_seconds',
+    'Adaptive request timeout per source',
+    ['source']
+)
+
+CIRCUIT_REJECTIONS = Counter(
+    'nexus_circuit_rejections_total',
+    'Calls skipped because the source circuit was open',
+    ['source']
+)
+
+_server_started = False
+
+
+def timed(stage: str):
+    """Decorator: record latency and exceptions of a function as a stage"""
+
+    def decorator(func):
+        histogram = STAGE_LATENCY.labels(stage)
+        errors = STAGE_ERRORS.labels(stage)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def track(stage: str):
+    """Context manager: record latency and exceptions of a block as a stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(stage).inc()
+        raise
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def track_upstream(upstream: str, endpoint: str):
+    """Context manager: record latency and failures of an external call"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        UPSTREAM_ERRORS.labels(upstream, endpoint).inc()
+        raise
+    finally:
+        UPSTREAM_LATENCY.labels(upstream, endpoint).observe(time.perf_counter() - start)
+
+
+def cache_result(cache: str, hit: bool) -> None:
+    """Count a cache hit or miss"""
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def fallback(source: str) -> None:
+    """Count a fallback to default data"""
+    FALLBACKS.labels(source).inc()
+
+
+def start_server(port: int = None) -> bool:
+    """Expose /metrics on a local port (once per process)"""
+    global _server_started
+
+    if _server_started or not config.METRICS_ENABLED:
+        return False
+
+    port = port or config.METRICS_PORT
+    try:
+        start_http_server(port, addr=config.METRICS_HOST)
+        _server_started = True
+        logger.info(f"Metrics endpoint on http://{config.METRICS_HOST}:{port}/metrics")
+        return True
+    except OSError as e:
+        logger.warning(f"Could not start metrics endpoint: {e}")
+        return False
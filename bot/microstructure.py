@@ -0,0 +1,102 @@
+"""
+NEXUS AI Trading Bot - Microstructure
+======================================
+Order-book features: depth imbalance, liquidity bands, microprice, spread z-score
+"""
+
+import numpy as np
+from typing import Optional
+
+# Levels per side used for each imbalance figure
+IMBALANCE_DEPTHS = (1, 5, 10, 20)
+
+# Distance from mid (basis points) for each liquidity band
+LIQUIDITY_BANDS_BPS = (10, 25, 50)
+
+# Order book levels requested per cycle
+BOOK_DEPTH = 50
+
+# Spreads remembered for the z-score
+SPREAD_WINDOW = 120
+
+
+class OrderBookFeatures:
+    """
+    Turns one order book into a handful of numbers per cycle.
+
+    Stateless apart from a ring of recent spreads, so the spread z-score
+    says whether the book is unusually thin right now for this symbol.
+    """
+
+    __slots__ = ('_spreads', '_count')
+
+    def __init__(self):
+        self._spreads = np.zeros(SPREAD_WINDOW)
+        self._count = 0
+
+    def compute(self, orderbook: dict) -> dict:
+        """
+        Args:
+            orderbook: {'bids': [[price, qty], ...], 'asks': [...]} best first
+
+        Returns:
+            Snapshot fields (empty if the book is missing or one-sided)
+        """
+        bids = self._levels(orderbook.get('bids'))
+        asks = self._levels(orderbook.get('asks'))
+        if bids is None or asks is None:
+            return {}
+
+        best_bid, bid_qty = bids[0]
+        best_ask, ask_qty = asks[0]
+        mid = (best_bid + best_ask) / 2
+        spread_bps = (best_ask - best_bid) / mid * 10_000
+
+        # Cumulative size per side; imbalance at depth d uses the first d levels
+        bid_cum = np.cumsum(bids[:, 1])
+        ask_cum = np.cumsum(asks[:, 1])
+        imbalance = []
+        for depth in IMBALANCE_DEPTHS:
+            b = bid_cum[min(depth, len(bid_cum)) - 1]
+            a = ask_cum[min(depth, len(ask_cum)) - 1]
+            imbalance.append(float((b - a) / (b + a)) if b + a else 0.0)
+
+        # Quote notional resting within each band around mid
+        bid_notional = np.cumsum(bids[:, 0] * bids[:, 1])
+        ask_notional = np.cumsum(asks[:, 0] * asks[:, 1])
+        bands = np.asarray(LIQUIDITY_BANDS_BPS) / 10_000
+        bid_idx = np.searchsorted(-bids[:, 0], -mid * (1 - bands), side='right')
+        ask_idx = np.searchsorted(asks[:, 0], mid * (1 + bands), side='right')
+        bid_liquidity = np.where(bid_idx > 0, bid_notional[np.maximum(bid_idx - 1, 0)], 0.0)
+        ask_liquidity = np.where(ask_idx > 0, ask_notional[np.maximum(ask_idx - 1, 0)], 0.0)
+
+        # Size-weighted mid: leans toward the side about to be consumed
+        microprice = (best_bid * ask_qty + best_ask * bid_qty) / (bid_qty + ask_qty)
+
+        return {
+            'microprice': float(microprice),
+            'spread_bps': float(spread_bps),
+            'spread_z': self._spread_z(spread_bps),
+            'book_imbalance': tuple(imbalance),
+            'bid_liquidity': tuple(bid_liquidity.tolist()),
+            'ask_liquidity': tuple(ask_liquidity.tolist())
+        }
+
+    def _spread_z(self, spread_bps: float) -> Optional[float]:
+        """Z-score of this spread against the recent window (None until warm)"""
+        history = self._spreads[:min(self._count, SPREAD_WINDOW)]
+        z = None
+        if len(history) >= 10:
+            std = history.std()
+            z = float((spread_bps - history.mean()) / std) if std > 0 else 0.0
+
+        self._spreads[self._count % SPREAD_WINDOW] = spread_bps
+        self._count += 1
+        return z
+
+    @staticmethod
+    def _levels(levels) -> Optional[np.ndarray]:
+        """[[price, qty, ...], ...] -> float array (n, 2)"""
+        if not levels:
+            return None
+        return np.asarray([level[:2] for level in levels], dtype=float)
@@ -0,0 +1,299 @@
+"""
+NEXUS AI Trading Bot - News Ingester
+=====================================
+Incremental CryptoPanic polling with dedup and per-currency rolling windows
+"""
+
+import time
+import threading
+import requests
+import metrics
+from collections import OrderedDict, deque
+from datetime import datetime
+from loguru import logger
+from config import config
+from circuit_breaker import breaker
+from typing import Dict, List, Optional
+
+# Posts remembered for dedup and vote updates
+STORE_SIZE = 500
+
+# Posts older than this leave the per-currency window
+WINDOW_HOURS = 24
+
+# Headlines handed to the AI per cycle
+HEADLINES = 5
+
+# Pages followed per poll while they are still inside the re-scan window
+MAX_PAGES = 3
+
+
+class NewsItem:
+    """One CryptoPanic post"""
+
+    __slots__ = ('id', 'title', 'published', 'currencies', 'positive', 'negative', 'live')
+
+    def __init__(self, post: dict):
+        self.id = int(post['id'])
+        self.title = post.get('title', '')
+        self.published = _parse_time(post.get('published_at'))
+        self.currencies = tuple(c.get('code') for c in post.get('currencies') or [] if c.get('code'))
+        self.positive = 0
+        self.negative = 0
+        self.live = True  # still inside its currency windows
+
+    @property
+    def sentiment(self) -> str:
+        if self.positive > self.negative:
+            return "Bullish"
+        if self.negative > self.positive:
+            return "Bearish"
+        return "Neutral"
+
+
+class CurrencyWindow:
+    """Posts for one currency over the last WINDOW_HOURS with running sentiment counts"""
+
+    __slots__ = ('items', 'bullish', 'bearish')
+
+    def __init__(self):
+        self.items: deque = deque()  # NewsItem, oldest first
+        self.bullish = 0
+        self.bearish = 0
+
+    def count(self, item: NewsItem, sign: int):
+        sentiment = item.sentiment
+        if sentiment == "Bullish":
+            self.bullish += sign
+        elif sentiment == "Bearish":
+            self.bearish += sign
+
+    @property
+    def sentiment(self) -> str:
+        if self.bullish > self.bearish:
+            return "Bullish"
+        if self.bearish > self.bullish:
+            return "Bearish"
+        return "Neutral"
+
+
+class NewsIngester:
+    """
+    Polls CryptoPanic in the background and keeps news in memory.
+
+    Only posts CryptoPanic marks important are fetched, and a post only
+    becomes important once votes pile up, often well after newer posts were
+    seen. So a poll doesn't stop at the highest id already seen: it re-reads
+    the last NEWS_RESCAN_HOURS (up to MAX_PAGES pages) and stores any post it
+    doesn't know yet, in time order. Known posts get their votes refreshed,
+    and the sentiment counts of every window holding them are adjusted by
+    the change. `revision` only moves when new posts arrive, so readers can
+    tell whether the news actually changed since their last look.
+    """
+
+    def __init__(self, currencies: List[str] = None):
+        self.base_url = config.CRYPTOPANIC_BASE_URL
+        self.currencies = currencies or [config.TRADING_SYMBOL.split('/')[0]]
+        self.poll_interval = config.NEWS_POLL_INTERVAL
+        self.rescan_seconds = config.NEWS_RESCAN_HOURS * 3600
+
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[int, NewsItem]" = OrderedDict()  # id -> item, oldest first
+        self._windows: Dict[str, CurrencyWindow] = {}
+        self._evicted: "OrderedDict[int, None]" = OrderedDict()  # ids pushed out of the store
+        self.cursor = 0  # highest id seen
+        self.revision = 0
+
+        self._session = requests.Session()
+        self.circuit = breaker('cryptopanic')
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ============ LIFECYCLE ============
+
+    def start(self) -> None:
+        if self._thread:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="news-ingester", daemon=True)
+        self._thread.start()
+        logger.info(f"News ingester started ({','.join(self.currencies)} every {self.poll_interval:.0f}s)")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self.poll_interval)
+
+    # ============ POLLING ============
+
+    def poll(self) -> int:
+        """
+        Fetch the posts of the re-scan window and store the unknown ones
+
+        Returns:
+            Number of new posts stored
+        """
+        url = f"{self.base_url}/posts/"
+        params = {
+            'auth_token': config.CRYPTOPANIC_API_KEY,
+            'currencies': ','.join(self.currencies),
+            'kind': 'news',
+            'filter': 'important'
+        }
+
+        added = 0
+        for _ in range(MAX_PAGES):
+            try:
+                with self.circuit.guard() as timeout, metrics.track_upstream('cryptopanic', 'posts'):
+                    resp = self._session.get(url, params=params, timeout=timeout)
+                    resp.raise_for_status()
+                    page = resp.json()
+            except Exception as e:
+                logger.debug(f"CryptoPanic API error: {e}")
+                metrics.fallback('cryptopanic')
+                break
+
+            new, reached_end = self._ingest(page.get('results', []))
+            added += new
+
+            # Older pages only matter while they are still inside the re-scan window
+            url, params = page.get('next'), None
+            if reached_end or not url:
+                break
+
+        self._expire()
+        if added:
+            logger.debug(f"News: {added} new posts (revision {self.revision})")
+        return added
+
+    def _ingest(self, posts: list) -> tuple:
+        """Store new posts and refresh votes on known ones; (new, reached the end of the re-scan window)"""
+        new_items = []
+        now = time.time()
+        rescan_cutoff = now - self.rescan_seconds
+        window_cutoff = now - WINDOW_HOURS * 3600
+        reached_end = False
+
+        with self._lock:
+            for post in posts:
+                try:
+                    post_id = int(post['id'])
+                except (KeyError, TypeError, ValueError):
+                    continue
+
+                votes = post.get('votes') or {}
+                known = self._items.get(post_id)
+                if known is not None:
+                    self._set_votes(known, votes)
+                    reached_end = reached_end or known.published < rescan_cutoff
+                    continue
+                if post_id in self._evicted:
+                    continue
+
+                item = NewsItem(post)
+                if item.published < rescan_cutoff:
+                    reached_end = True
+                if item.published < window_cutoff:
+                    continue
+                item.positive = int(votes.get('positive', 0) or 0)
+                item.negative = int(votes.get('negative', 0) or 0)
+                new_items.append(item)
+
+            # Oldest first so the store and windows stay in time order
+            for item in sorted(new_items, key=lambda i: (i.published, i.id)):
+                self._items[item.id] = item
+                for code in item.currencies or self.currencies:
+                    window = self._windows.setdefault(code, CurrencyWindow())
+                    self._insert(window, item)
+                    window.count(item, +1)
+                self.cursor = max(self.cursor, item.id)
+
+            while len(self._items) > STORE_SIZE:
+                old_id, old = self._items.popitem(last=False)
+                self._drop(old)
+                self._evicted[old_id] = None
+                if len(self._evicted) > STORE_SIZE:
+                    self._evicted.popitem(last=False)
+
+            if new_items:
+                self.revision += 1
+
+        return len(new_items), reached_end
+
+    @staticmethod
+    def _insert(window: CurrencyWindow, item: NewsItem):
+        """Insert keeping the window in time order (late-important posts land behind newer ones)"""
+        position = len(window.items)
+        while position and (window.items[position - 1].published, window.items[position - 1].id) > (item.published, item.id):
+            position -= 1
+        window.items.insert(position, item)
+
+    def _set_votes(self, item: NewsItem, votes: dict):
+        """Update an item's votes, moving it between sentiment counts (lock held)"""
+        positive = int(votes.get('positive', 0) or 0)
+        negative = int(votes.get('negative', 0) or 0)
+        if (positive, negative) == (item.positive, item.negative):
+            return
+
+        targets = [self._windows[code] for code in (item.currencies or self.currencies)
+                   if item.live and code in self._windows]
+        for window in targets:
+            window.count(item, -1)
+        item.positive, item.negative = positive, negative
+        for window in targets:
+            window.count(item, +1)
+
+    def _drop(self, item: NewsItem):
+        """Remove an evicted item from its windows (lock held)"""
+        if not item.live:
+            return
+        for code in item.currencies or self.currencies:
+            window = self._windows.get(code)
+            if window:
+                window.items.remove(item)
+                window.count(item, -1)
+        item.live = False
+
+    def _expire(self):
+        """Drop posts older than the window from every currency"""
+        cutoff = time.time() - WINDOW_HOURS * 3600
+        with self._lock:
+            for window in self._windows.values():
+                while window.items and window.items[0].published < cutoff:
+                    item = window.items.popleft()
+                    item.live = False
+                    window.count(item, -1)
+
+    # ============ READS ============
+
+    def snapshot(self, currency: str = None) -> dict:
+        """Snapshot fields for one currency (default: the first configured)"""
+        currency = currency or self.currencies[0]
+        with self._lock:
+            window = self._windows.get(currency)
+            if window is None:
+                return {'news': [], 'news_sentiment': "Neutral", 'news_revision': self.revision}
+
+            latest = list(window.items)[-HEADLINES:][::-1]
+            return {
+                'news': [(item.sentiment, item.title) for item in latest],
+                'news_sentiment': window.sentiment,
+                'news_revision': self.revision
+            }
+
+
+def _parse_time(value: Optional[str]) -> float:
+    """CryptoPanic ISO timestamp -> epoch seconds (now if missing)"""
+    if not value:
+        return time.time()
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return time.time()
@@ -0,0 +1,187 @@
+"""
+NEXUS AI Trading Bot - Open Interest Sampler
+=============================================
+Local open interest and funding history for OI deltas and funding trend
+"""
+
+import threading
+import numpy as np
+from loguru import logger
+from config import config
+from exchange import Exchange
+from market_stream import MarketStream
+from typing import Optional
+
+SAMPLE_DTYPE = np.dtype([
+    ('timestamp', 'i8'),   # ms
+    ('oi', 'f8'),          # contracts
+    ('mark', 'f8'),
+    ('funding', 'f8'),     # percent per interval, NaN if unknown
+])
+
+# 24h of 60s samples plus the 5m history loaded at startup
+CAPACITY = 2048
+
+# 5m history samples backfilled at startup (24h + 1)
+HISTORY_LIMIT = 289
+
+HOUR_MS = 3_600_000
+
+
+class OpenInterestSampler:
+    """
+    Keeps a ring of (time, open interest, mark price, funding) samples.
+
+    At startup the last ~24h comes from Binance's 5-minute OI history, then
+    /fapi/v1/openInterest is polled every OI_POLL_INTERVAL seconds. Mark
+    price and funding ride along from the markPrice stream, so a cycle only
+    reads memory.
+    """
+
+    def __init__(self, exchange: Exchange, stream: MarketStream):
+        self.exchange = exchange
+        self.stream = stream
+        self.poll_interval = config.OI_POLL_INTERVAL
+
+        self._lock = threading.Lock()
+        self._ring = np.zeros(CAPACITY, dtype=SAMPLE_DTYPE)
+        self._count = 0
+
+        # Latest values from the markPrice stream
+        self._mark: Optional[float] = None
+        self._funding: Optional[float] = None
+
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.stream.subscribe('markPrice@1s', self._on_mark_price)
+
+    # ============ LIFECYCLE ============
+
+    def start(self) -> None:
+        """Load history and start polling"""
+
+        if self._thread:
+            return
+
+        self.stream.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="oi-sampler", daemon=True)
+        self._thread.start()
+        logger.info(f"OI sampler started (every {self.poll_interval:.0f}s)")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        self._load_history()
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.poll_interval)
+
+    # ============ SAMPLING ============
+
+    def _on_mark_price(self, data: dict):
+        try:
+            self._mark = float(data['p'])
+            self._funding = float(data['r']) * 100
+        except (KeyError, TypeError, ValueError):
+            pass
+
+    def _load_history(self):
+        """Backfill from the 5-minute OI history so deltas work immediately"""
+        history = self.exchange.get_open_interest_history('5m', HISTORY_LIMIT)
+        for item in history:
+            amount, value = item['amount'], item['value']
+            if amount:
+                mark = value / amount if value else np.nan
+                self.add(int(item['timestamp']), float(amount), mark, np.nan)
+
+        if history:
+            logger.debug(f"OI history loaded: {len(history)} samples")
+
+    def sample(self) -> bool:
+        """Poll current open interest once"""
+        oi = self.exchange.get_open_interest()
+        if not oi or not oi['amount']:
+            return False
+
+        funding = self._funding
+        if funding is None:
+            # Stream not up yet: one REST call instead
+            funding = self.exchange.get_funding_rate()
+
+        self.add(int(oi['timestamp']), float(oi['amount']), self._mark or np.nan,
+                 np.nan if funding is None else funding)
+        return True
+
+    def add(self, timestamp: int, oi: float, mark: float, funding: float) -> None:
+        """Append one sample (ignored if older than the newest)"""
+        with self._lock:
+            if self._count and timestamp <= self._ring['timestamp'][(self._count - 1) % CAPACITY]:
+                return
+            self._ring[self._count % CAPACITY] = (timestamp, oi, mark, funding)
+            self._count += 1
+
+    # ============ READS ============
+
+    def _ordered(self) -> np.ndarray:
+        """Samples oldest first (copy)"""
+        with self._lock:
+            if self._count <= CAPACITY:
+                return self._ring[:self._count].copy()
+            head = self._count % CAPACITY
+            return np.concatenate((self._ring[head:], self._ring[:head]))
+
+    def snapshot(self) -> dict:
+        """Snapshot fields: open interest (USD), OI deltas, funding and its trend"""
+
+        samples = self._ordered()
+        if not len(samples):
+            return {'funding_rate': self._funding} if self._funding is not None else {}
+
+        latest = samples[-1]
+        times = samples['timestamp']
+        oi = samples['oi']
+
+        mark = self._mark or latest['mark']
+        data = {
+            'open_interest': float(latest['oi'] * mark) if mark and not np.isnan(mark) else None,
+            'oi_change_1h': self._change(times, oi, latest, 1),
+            'oi_change_4h': self._change(times, oi, latest, 4),
+            'oi_change_24h': self._change(times, oi, latest, 24)
+        }
+
+        funding = samples['funding']
+        known = ~np.isnan(funding)
+        funding_times, funding = times[known], funding[known]
+
+        current = self._funding
+        if current is None and len(funding):
+            current = float(funding[-1])
+        data['funding_rate'] = current
+
+        recent = funding[funding_times >= latest['timestamp'] - 24 * HOUR_MS]
+        if current is not None and len(recent):
+            data['funding_avg_24h'] = float(recent.mean())
+            earlier = self._value_at(funding_times, funding, latest['timestamp'] - 8 * HOUR_MS)
+            data['funding_change_8h'] = current - earlier if earlier is not None else None
+
+        return data
+
+    @classmethod
+    def _change(cls, times: np.ndarray, values: np.ndarray, latest, hours: int) -> Optional[float]:
+        """Percent change vs the sample at or before `hours` ago"""
+        past = cls._value_at(times, values, latest['timestamp'] - hours * HOUR_MS)
+        if not past:
+            return None
+        return float((latest['oi'] / past - 1) * 100)
+
+    @staticmethod
+    def _value_at(times: np.ndarray, values: np.ndarray, at: int) -> Optional[float]:
+        """Value at or before `at` (None if history is too short)"""
+        idx = int(np.searchsorted(times, at, side='right')) - 1
+        return float(values[idx]) if idx >= 0 else None
@@ -0,0 +1,269 @@
+"""
+NEXUS AI Trading Bot - Position Monitor
+========================================
+Watches open positions on streamed mark prices between analysis cycles
+"""
+
+import time
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from loguru import logger
+from config import config
+from exchange import Exchange
+from market_stream import MarketStream
+from telegram_bot import TelegramBot
+from typing import Dict, List, Optional
+
+
+class PositionMonitor:
+    """
+    Lightweight risk loop driven by the mark price stream.
+
+    Keeps a local stop per position that moves to break-even and trails the
+    best price. The exchange SL/TP orders stay in place as a hard backstop;
+    the local stop closes at market when crossed. No AI calls, no REST polling.
+    """
+
+    def __init__(self, exchange: Exchange, telegram: TelegramBot, stream: MarketStream):
+        self.exchange = exchange
+        self.telegram = telegram
+        self.stream = stream
+
+        self.trailing_percent = config.TRAILING_STOP_PERCENT
+        self.breakeven_percent = config.BREAKEVEN_TRIGGER_PERCENT
+        self.liq_alert_percent = config.LIQUIDATION_ALERT_PERCENT
+
+        # Tracked positions keyed by side ('long' / 'short')
+        self.positions: Dict[str, dict] = {}
+        # Identity per tracked position, so a close finishing late can't touch
+        # a newer position that sync() put on the same side
+        self._ids = itertools.count(1)
+        self.mark_price: Optional[float] = None
+        self.last_price: Optional[float] = None
+        self.last_update = 0.0
+
+        self._lock = threading.Lock()
+        # Closing orders run off the stream thread so ticks keep flowing
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="position-close")
+
+        self.stream.subscribe('markPrice@1s', self._on_mark_price)
+        self.stream.subscribe('bookTicker', self._on_book_ticker)
+
+    def start(self) -> None:
+        """Start watching (stream is shared and may already be running)"""
+        self.stream.start()
+        logger.info("Position monitor started")
+
+    def stop(self) -> None:
+        """Stop pending close orders"""
+        self._executor.shutdown(wait=False)
+
+    def sync(self, positions: List[dict]) -> None:
+        """
+        Reconcile tracked positions with the exchange
+
+        Args:
+            positions: Output of Exchange.get_positions()
+        """
+        with self._lock:
+            current = {}
+
+            for pos in positions:
+                side = pos.get('side')
+                entry = float(pos.get('entry_price') or 0)
+                if side not in ('long', 'short') or not entry:
+                    continue
+
+                tracked = self.positions.get(side)
+
+                # Keep trailing state while it is the same position
+                if tracked and tracked['entry_price'] == entry and not tracked['closing']:
+                    tracked['size'] = pos['size']
+                    tracked['liquidation_price'] = float(pos.get('liquidation_price') or 0)
+                    current[side] = tracked
+                    continue
+
+                current[side] = {
+                    'id': next(self._ids),
+                    'side': side,
+                    'size': pos['size'],
+                    'entry_price': entry,
+                    'liquidation_price': float(pos.get('liquidation_price') or 0),
+                    'best_price': entry,
+                    'stop': None,
+                    'breakeven': False,
+                    'liq_alerted': False,
+                    'closing': False,
+                    'retry_at': 0.0
+                }
+                logger.info(f"Monitoring {side.upper()} {pos['size']} @ {entry}")
+
+            self.positions = current
+
+    def get_state(self) -> dict:
+        """Snapshot of monitor state for status reporting"""
+        with self._lock:
+            return {
+                'mark_price': self.mark_price,
+                'last_price': self.last_price,
+                'last_update': self.last_update,
+                'stream_connected': self.stream.connected,
+                'positions': [dict(p) for p in self.positions.values()]
+            }
+
+    # ============ STREAM HANDLERS ============
+
+    def _on_mark_price(self, data: dict):
+        """markPrice@1s event: authoritative price for liquidation distance"""
+        price = float(data.get('p', 0))
+        if not price:
+            return
+
+        self.mark_price = price
+        self._evaluate(price, check_liquidation=True)
+
+    def _on_book_ticker(self, data: dict):
+        """bookTicker event: real-time mid between mark price ticks"""
+        bid = float(data.get('b', 0))
+        ask = float(data.get('a', 0))
+        if not bid or not ask:
+            return
+
+        self._evaluate((bid + ask) / 2, check_liquidation=False)
+
+    # ============ RISK RULES ============
+
+    def _evaluate(self, price: float, check_liquidation: bool):
+        """Apply break-even, trailing stop and liquidation checks"""
+        self.last_price = price
+        self.last_update = time.time()
+
+        if not self.positions:
+            return
+
+        now = self.last_update
+        alerts = []
+
+        with self._lock:
+            for pos in self.positions.values():
+                if pos['closing'] or pos['retry_at'] > now:
+                    continue
+
+                self._update_stop(pos, price)
+
+                if self._stop_hit(pos, price):
+                    pos['closing'] = True
+                    logger.warning(f"Local stop hit: {pos['side'].upper()} @ {price} (stop {pos['stop']})")
+                    self._executor.submit(self._close, dict(pos), price)
+                    continue
+
+                if check_liquidation:
+                    alert = self._check_liquidation(pos, price)
+                    if alert:
+                        alerts.append(alert)
+
+        # Outside the lock; send() only queues, the network call is on the
+        # notifier's worker and never on the stream thread
+        for alert in alerts:
+            self.telegram.send(alert)
+
+    def _update_stop(self, pos: dict, price: float):
+        """Ratchet the local stop from best price"""
+        entry = pos['entry_price']
+        is_long = pos['side'] == 'long'
+
+        if is_long:
+            pos['best_price'] = max(pos['best_price'], price)
+            gain = (pos['best_price'] - entry) / entry * 100
+        else:
+            pos['best_price'] = min(pos['best_price'], price)
+            gain = (entry - pos['best_price']) / entry * 100
+
+        candidate = None
+
+        # Break-even once the move reaches the trigger
+        if self.breakeven_percent > 0 and gain >= self.breakeven_percent:
+            candidate = entry
+            if not pos['breakeven']:
+                pos['breakeven'] = True
+                logger.info(f"{pos['side'].upper()} moved to break-even @ {entry}")
+
+        # Trail the best price, but only once the trail is on the profit side of entry
+        if self.trailing_percent > 0 and gain > 0:
+            offset = pos['best_price'] * self.trailing_percent / 100
+            trail = pos['best_price'] - offset if is_long else pos['best_price'] + offset
+            in_profit = trail > entry if is_long else trail < entry
+            if in_profit and (candidate is None or (trail > candidate if is_long else trail < candidate)):
+                candidate = trail
+
+        if candidate is None:
+            return
+
+        # Stops only ever tighten
+        if pos['stop'] is None or (candidate > pos['stop'] if is_long else candidate < pos['stop']):
+            pos['stop'] = candidate
+
+    def _stop_hit(self, pos: dict, price: float) -> bool:
+        """Check whether price crossed the local stop"""
+        if pos['stop'] is None:
+            return False
+
+        if pos['side'] == 'long':
+            return price <= pos['stop']
+        return price >= pos['stop']
+
+    def _check_liquidation(self, pos: dict, mark: float) -> Optional[str]:
+        """Return an alert once when mark price gets close to liquidation"""
+        liq = pos['liquidation_price']
+        if not liq or self.liq_alert_percent <= 0:
+            return None
+
+        distance = abs(mark - liq) / mark * 100
+
+        if distance < self.liq_alert_percent and not pos['liq_alerted']:
+            pos['liq_alerted'] = True
+            logger.warning(f"{pos['side'].upper()} is {distance:.2f}% from liquidation ({liq})")
+            return (
+                f"🚨 <b>LIQUIDATION RISK</b>\n\n"
+                f"<b>Side:</b> {pos['side'].upper()}\n"
+                f"<b>Mark:</b> ${mark:,.2f}\n"
+                f"<b>Liquidation:</b> ${liq:,.2f} ({distance:.2f}%)"
+            )
+        # Re-arm with hysteresis so the alert doesn't flap
+        if distance > self.liq_alert_percent * 1.5:
+            pos['liq_alerted'] = False
+        return None
+
+    def _close(self, pos: dict, price: float):
+        """Close a position at market (runs on the close worker)"""
+        result = self.exchange.close_position(pos)
+
+        with self._lock:
+            # sync() may have replaced the entry meanwhile; only touch our own
+            tracked = self.positions.get(pos['side'])
+            if tracked is not None and tracked['id'] == pos['id']:
+                if result:
+                    del self.positions[pos['side']]
+                else:
+                    # Let a later tick retry without hammering the exchange
+                    tracked['closing'] = False
+                    tracked['retry_at'] = time.time() + 5
+            remaining = bool(self.positions)
+
+        if not result:
+            logger.error(f"Failed to close {pos['side'].upper()} on local stop")
+            return
+
+        # Exchange SL/TP are reduce-only leftovers once flat
+        if not remaining:
+            self.exchange.cancel_all_orders()
+
+        logger.info(f"Closed {pos['side'].upper()} {pos['size']} on local stop @ {price}")
+        self.telegram.send(
+            f"🛡️ <b>STOP TRIGGERED</b>\n\n"
+            f"<b>Side:</b> {pos['side'].upper()}\n"
+            f"<b>Entry:</b> ${pos['entry_price']:,.2f}\n"
+            f"<b>Exit:</b> ${price:,.2f}\n"
+            f"<b>Stop:</b> ${pos['stop']:,.2f}"
+        )
@@ -0,0 +1,221 @@
+"""
+NEXUS AI Trading Bot - RPC Pool
+================================
+Multi-endpoint Web3 provider with latency routing, hedging and failover
+"""
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from web3 import Web3
+from web3.providers.base import BaseProvider
+from loguru import logger
+import metrics
+from typing import List
+
+# Read-only methods that are safe to send twice
+HEDGE_SAFE_METHODS = {
+    "eth_call",
+    "eth_chainId",
+    "eth_blockNumber",
+    "eth_getBalance",
+    "eth_getCode",
+    "eth_getLogs",
+    "eth_getBlockByNumber",
+    "eth_getBlockByHash",
+    "eth_getTransactionReceipt",
+    "net_version",
+}
+
+
+class Endpoint:
+    """Rolling health stats for one RPC URL"""
+
+    WINDOW = 100
+
+    def __init__(self, url: str, timeout: float):
+        self.url = url
+        self.provider = Web3.HTTPProvider(url, request_kwargs={'timeout': timeout})
+        self.latencies = deque(maxlen=self.WINDOW)
+        self.outcomes = deque(maxlen=self.WINDOW)  # True = ok
+        self.ewma = None
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+    def record(self, latency: float, ok: bool):
+        """Update stats after a call"""
+        self.outcomes.append(ok)
+
+        if ok:
+            self.latencies.append(latency)
+            self.ewma = latency if self.ewma is None else self.ewma * 0.8 + latency * 0.2
+            self.consecutive_failures = 0
+            self.ejections = 0
+        else:
+            self.consecutive_failures += 1
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+    def p95(self) -> float:
+        """95th percentile latency over the window"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def score(self) -> float:
+        """Lower is better: latency inflated by error rate (unknown = optimistic)"""
+        return (self.ewma or 0.0) * (1 + 4 * self.error_rate)
+
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+
+class PooledProvider(BaseProvider):
+    """
+    Web3 provider that spreads calls over several endpoints.
+
+    Each call goes to the healthy endpoint with the best latency score.
+    Read-only calls that outlive the primary's p95 are hedged to the next
+    endpoint and the first answer wins. Endpoints with repeated failures are
+    ejected with exponential cooldown and retried afterwards.
+    """
+
+    EJECT_AFTER = 3          # consecutive failures
+    EJECT_BASE = 10.0        # seconds, doubles per repeat ejection
+    EJECT_MAX = 300.0
+    MIN_HEDGE_DELAY = 0.05   # seconds
+
+    def __init__(self, urls: List[str], timeout: float = 10.0, hedge: bool = True):
+        super().__init__()
+
+        if not urls:
+            raise ValueError("PooledProvider needs at least one URL")
+
+        self.timeout = timeout
+        self.hedge = hedge
+        self.endpoints = [Endpoint(url, timeout) for url in urls]
+
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(8, len(urls) * 4), thread_name_prefix="rpc-pool")
+
+    def __str__(self):
+        return f"PooledProvider({', '.join(e.url for e in self.endpoints)})"
+
+    def make_request(self, method, params):
+        """Route one JSON-RPC request"""
+
+        ranked = self._rank()
+        primary = ranked[0]
+        hedgeable = self.hedge and method in HEDGE_SAFE_METHODS and len(ranked) > 1
+
+        futures = {self._executor.submit(self._call, primary, method, params): primary}
+        backups = iter(ranked[1:])
+        deadline = time.time() + self.timeout
+        last_error = None
+
+        # Hedge once the primary is slower than usual
+        hedge_delay = max(primary.p95(), self.MIN_HEDGE_DELAY) if primary.latencies else self.timeout / 4
+        first_wait = hedge_delay if hedgeable else self.timeout
+
+        done, _ = wait(futures, timeout=first_wait, return_when=FIRST_COMPLETED)
+        if not done and hedgeable:
+            backup = next(backups)
+            metrics.HEDGED_REQUESTS.labels('rpc').inc()
+            logger.debug(f"Hedging {method}: {primary.url} slower than {hedge_delay:.3f}s, adding {backup.url}")
+            futures[self._executor.submit(self._call, backup, method, params)] = backup
+
+        while futures:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+
+            done, _ = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+
+            for future in done:
+                futures.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    last_error = e
+
+            # Every attempt so far failed: fail over to the next endpoint
+            if not futures:
+                if method not in HEDGE_SAFE_METHODS:
+                    break
+                backup = next(backups, None)
+                if backup is None:
+                    break
+                futures[self._executor.submit(self._call, backup, method, params)] = backup
+
+        raise last_error or TimeoutError(f"{method} timed out on all endpoints")
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        """True if any endpoint answers"""
+        try:
+            self.make_request("eth_chainId", [])
+            return True
+        except Exception:
+            if show_traceback:
+                raise
+            return False
+
+    def stats(self) -> list:
+        """Per-endpoint health snapshot"""
+        now = time.time()
+        return [
+            {
+                'url': e.url,
+                'ewma_ms': round(e.ewma * 1000, 1) if e.ewma is not None else None,
+                'p95_ms': round(e.p95() * 1000, 1),
+                'error_rate': round(e.error_rate, 3),
+                'healthy': e.is_healthy(now)
+            }
+            for e in self.endpoints
+        ]
+
+    # ============ INTERNAL ============
+
+    def _rank(self) -> List[Endpoint]:
+        """Healthy endpoints by score, then ejected ones by earliest return"""
+        now = time.time()
+        with self._lock:
+            healthy = sorted((e for e in self.endpoints if e.is_healthy(now)), key=Endpoint.score)
+            ejected = sorted((e for e in self.endpoints if not e.is_healthy(now)), key=lambda e: e.ejected_until)
+        return healthy + ejected
+
+    def _call(self, endpoint: Endpoint, method, params):
+        """Call one endpoint and record the outcome"""
+        start = time.time()
+        try:
+            # JSON-RPC error payloads are valid answers, only transport errors count
+            response = endpoint.provider.make_request(method, params)
+        except Exception:
+            self._record(endpoint, time.time() - start, False)
+            raise
+
+        self._record(endpoint, time.time() - start, True)
+        return response
+
+    def _record(self, endpoint: Endpoint, latency: float, ok: bool):
+        """Update stats and eject on repeated failures"""
+        metrics.UPSTREAM_LATENCY.labels('rpc', endpoint.url).observe(latency)
+        if not ok:
+            metrics.UPSTREAM_ERRORS.labels('rpc', endpoint.url).inc()
+
+        with self._lock:
+            endpoint.record(latency, ok)
+
+            if not ok and endpoint.consecutive_failures >= self.EJECT_AFTER and endpoint.is_healthy(time.time()):
+                cooldown = min(self.EJECT_BASE * 2 ** endpoint.ejections, self.EJECT_MAX)
+                endpoint.ejections += 1
+                endpoint.ejected_until = time.time() + cooldown
+                logger.warning(f"RPC endpoint ejected for {cooldown:.0f}s: {endpoint.url}")
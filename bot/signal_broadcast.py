@@ -0,0 +1,219 @@
+"""
+NEXUS AI Trading Bot - Signal Broadcast
+========================================
+Fan out signals to subscribers by tier, with per-tier delivery delay
+"""
+
+import json
+import time
+import heapq
+import itertools
+import threading
+from pathlib import Path
+from loguru import logger
+from config import config
+from telegram_bot import TelegramBot
+from token_verifier import TIERS, TIER_FEATURES
+from typing import Dict, Iterable, List
+
+
+class SignalBroadcaster:
+    """
+    Delivers each signal to every subscriber, grouped by tier.
+
+    A heap scheduler releases each tier when its `signals_delay` expires and
+    hands recipients to the Telegram queue in rate-sized batches. Higher
+    tiers get a higher queue priority, so their delivery time depends only
+    on their own subscriber count, not on how many FREE users are queued.
+    """
+
+    def __init__(self, telegram: TelegramBot, subscribers_file: str = None):
+        self.telegram = telegram
+        self.batch_size = config.BROADCAST_BATCH_SIZE
+        self.batch_interval = config.BROADCAST_BATCH_INTERVAL
+        self.subscribers_file = Path(subscribers_file or config.BROADCAST_SUBSCRIBERS_FILE)
+
+        # tier -> {chat_id: set of pairs (empty = default symbol only)}
+        self.subscribers: Dict[str, Dict[str, set]] = {tier: {} for tier in TIERS}
+        self._tier_of: Dict[str, str] = {}
+
+        # Lower rank = higher tier = delivered first (0 is kept for bot alerts)
+        self._priority = {tier: rank + 1 for rank, tier in enumerate(TIERS)}
+
+        self._cond = threading.Condition()
+        self._jobs = []  # heap of (due_at, seq, job)
+        self._seq = itertools.count()
+        self._running = False
+        self._thread = None
+
+        self.load()
+
+    # ============ SUBSCRIBERS ============
+
+    def add_subscriber(self, chat_id: str, tier: str, pairs: Iterable[str] = None) -> None:
+        """Add or update a subscriber, capping pairs at the tier limit"""
+
+        if tier not in TIERS:
+            raise ValueError(f"Unknown tier: {tier}")
+
+        chat_id = str(chat_id)
+        pairs = list(dict.fromkeys(pairs or []))
+
+        limit = TIER_FEATURES[tier]['pairs']
+        if limit != "unlimited":
+            pairs = pairs[:limit]
+
+        with self._cond:
+            old_tier = self._tier_of.get(chat_id)
+            if old_tier and old_tier != tier:
+                self.subscribers[old_tier].pop(chat_id, None)
+
+            self.subscribers[tier][chat_id] = set(pairs)
+            self._tier_of[chat_id] = tier
+
+    def remove_subscriber(self, chat_id: str) -> None:
+        """Remove a subscriber from all tiers"""
+
+        chat_id = str(chat_id)
+        with self._cond:
+            tier = self._tier_of.pop(chat_id, None)
+            if tier:
+                self.subscribers[tier].pop(chat_id, None)
+
+    def subscriber_counts(self) -> Dict[str, int]:
+        """Number of subscribers per tier"""
+        return {tier: len(subs) for tier, subs in self.subscribers.items()}
+
+    def load(self) -> None:
+        """Load subscribers from disk"""
+
+        if not self.subscribers_file.exists():
+            return
+
+        try:
+            data = json.loads(self.subscribers_file.read_text())
+            for tier, subs in data.items():
+                for chat_id, pairs in subs.items():
+                    self.add_subscriber(chat_id, tier, pairs)
+            logger.info(f"Loaded subscribers: {self.subscriber_counts()}")
+        except Exception as e:
+            logger.error(f"Error loading subscribers: {e}")
+
+    def save(self) -> None:
+        """Persist subscribers to disk"""
+
+        with self._cond:
+            data = {
+                tier: {chat_id: sorted(pairs) for chat_id, pairs in subs.items()}
+                for tier, subs in self.subscribers.items()
+            }
+
+        tmp = self.subscribers_file.with_suffix('.tmp')
+        tmp.write_text(json.dumps(data))
+        tmp.replace(self.subscribers_file)
+
+    # ============ PUBLISHING ============
+
+    def publish(self, message: str, symbol: str = None) -> None:
+        """
+        Schedule a signal for every tier
+
+        Args:
+            message: Formatted signal text
+            symbol: Pair the signal is for (defaults to TRADING_SYMBOL)
+        """
+
+        symbol = symbol or config.TRADING_SYMBOL
+        now = time.time()
+
+        with self._cond:
+            for tier in TIERS:
+                if not self.subscribers[tier]:
+                    continue
+
+                job = {
+                    'tier': tier,
+                    'message': message,
+                    'symbol': symbol,
+                    'recipients': None,
+                    'offset': 0
+                }
+                due = now + TIER_FEATURES[tier]['signals_delay']
+                heapq.heappush(self._jobs, (due, next(self._seq), job))
+
+            self._cond.notify()
+
+    def start(self) -> None:
+        """Start the scheduler thread"""
+
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="signal-broadcast", daemon=True)
+        self._thread.start()
+        logger.info(f"Signal broadcaster started: {self.subscriber_counts()}")
+
+    def stop(self) -> None:
+        """Stop the scheduler (pending delayed deliveries are dropped)"""
+
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def pending_jobs(self) -> int:
+        """Number of scheduled tier deliveries"""
+        with self._cond:
+            return len(self._jobs)
+
+    # ============ SCHEDULER ============
+
+    def _run(self):
+        """Release due jobs batch by batch"""
+
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+
+                now = time.time()
+                if not self._jobs or self._jobs[0][0] > now:
+                    timeout = self._jobs[0][0] - now if self._jobs else None
+                    self._cond.wait(timeout)
+                    continue
+
+                _, _, job = heapq.heappop(self._jobs)
+
+                # Resolve recipients when the tier is released, not at publish time
+                if job['recipients'] is None:
+                    job['recipients'] = self._recipients(job['tier'], job['symbol'])
+
+            batch = self._next_batch(job)
+            priority = self._priority[job['tier']]
+            for chat_id in batch:
+                self.telegram.send(job['message'], chat_id=chat_id, priority=priority)
+
+            if job['offset'] < len(job['recipients']):
+                with self._cond:
+                    heapq.heappush(self._jobs, (time.time() + self.batch_interval, next(self._seq), job))
+            else:
+                logger.debug(f"Signal delivered to {len(job['recipients'])} {job['tier']} subscribers")
+
+    def _recipients(self, tier: str, symbol: str) -> List[str]:
+        """Subscribers in a tier that follow this symbol (called with _cond held)"""
+
+        default = symbol == config.TRADING_SYMBOL
+        return [
+            chat_id for chat_id, pairs in self.subscribers[tier].items()
+            if symbol in pairs or (not pairs and default)
+        ]
+
+    def _next_batch(self, job: dict) -> List[str]:
+        """Take the next batch of recipients from a job"""
+
+        start = job['offset']
+        job['offset'] = start + self.batch_size
+        return job['recipients'][start:job['offset']]
@@ -0,0 +1,143 @@
+"""
+NEXUS AI Trading Bot - Signature Verifier
+==========================================
+Offline wallet signature checks, batched across worker processes
+"""
+
+import os
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from loguru import logger
+from config import config
+from typing import List, Optional, Sequence, Tuple
+
+# Batches smaller than this are cheaper to check inline than to ship to workers
+MIN_PARALLEL_BATCH = 64
+
+
+def recover_signer(message: str, signature: str) -> Optional[str]:
+    """Recover the lowercase signer of an EIP-191 personal message (no network)"""
+    try:
+        return Account.recover_message(encode_defunct(text=message), signature=signature).lower()
+    except Exception:
+        return None
+
+
+def _verify_chunk(items: Sequence[Tuple[str, str, str]]) -> List[bool]:
+    """Worker entry point: verify (wallet, message, signature) tuples"""
+    return [recover_signer(message, signature) == wallet.lower() for wallet, message, signature in items]
+
+
+class SignatureVerifier:
+    """
+    Verifies wallet ownership signatures without any RPC.
+
+    Recent results are memoized, so a user retrying a login is free. Large
+    batches are split across a process pool so login bursts don't tie up
+    the bot's own interpreter.
+    """
+
+    def __init__(self, workers: int = None, cache_size: int = None):
+        self.workers = workers or config.SIG_VERIFY_WORKERS or max(1, (os.cpu_count() or 2) - 1)
+        self.cache_size = cache_size or config.SIG_CACHE_SIZE
+
+        self._cache: "OrderedDict[tuple, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = None
+
+        self.hits = 0
+        self.misses = 0
+
+    def verify(self, wallet: str, message: str, signature: str) -> bool:
+        """Verify one signature"""
+        return self.verify_batch([(wallet, message, signature)])[0]
+
+    def verify_batch(self, items: Sequence[Tuple[str, str, str]]) -> List[bool]:
+        """
+        Verify many signatures
+
+        Args:
+            items: (wallet, message, signature) tuples
+
+        Returns:
+            One bool per item, in order
+        """
+
+        keys = [(wallet.lower(), message, signature) for wallet, message, signature in items]
+        results: List[Optional[bool]] = [None] * len(keys)
+        pending = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is None:
+                    pending.setdefault(key, []).append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    results[i] = cached
+            self.hits += len(keys) - sum(len(v) for v in pending.values())
+            self.misses += len(pending)
+
+        if pending:
+            unique = list(pending)
+            fresh = list(zip(unique, self._run(unique)))
+            for key, ok in fresh:
+                for i in pending[key]:
+                    results[i] = ok
+            self._remember(fresh)
+
+        return results
+
+    def start(self) -> None:
+        """Spawn and warm up workers ahead of a burst (otherwise lazy)"""
+        if self.workers > 1:
+            pool = self._get_pool()
+            list(pool.map(_verify_chunk, [[]] * self.workers))
+
+    def close(self) -> None:
+        """Shut down worker processes"""
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # ============ INTERNAL ============
+
+    def _run(self, items: List[tuple]) -> List[bool]:
+        """Check inline or across the pool depending on batch size"""
+
+        if len(items) < MIN_PARALLEL_BATCH or self.workers <= 1:
+            return _verify_chunk(items)
+
+        try:
+            pool = self._get_pool()
+            size = -(-len(items) // self.workers)
+            chunks = [items[i:i + size] for i in range(0, len(items), size)]
+            return [ok for chunk in pool.map(_verify_chunk, chunks) for ok in chunk]
+        except Exception as e:
+            logger.warning(f"Signature pool unavailable ({e}), verifying inline")
+            self.close()
+            return _verify_chunk(items)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Create the worker pool on first large batch"""
+        if self._pool is None:
+            # spawn: forking a process that runs background threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            logger.info(f"Signature verifier pool started with {self.workers} workers")
+        return self._pool
+
+    def _remember(self, results):
+        """Store results in the LRU memo"""
+        with self._lock:
+            for key, ok in results:
+                self._cache[key] = ok
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
@@ -4,56 +4,342 @@ NEXUS AI Trading Bot - Telegram Notifications
 Send alerts and updates via Telegram
 """
 
+import time
+import heapq
+import itertools
+import threading
 import requests
+import metrics
 from loguru import logger
 from config import config
+from typing import Callable, Dict, Optional
 
 
 class TelegramBot:
-    """Telegram notification handler"""
+    """
+    Telegram notification handler.
+
+    Messages are queued and delivered by a small pool of background senders,
+    so callers never wait on the Telegram API and a slow round trip doesn't
+    cap throughput. The senders share the per-chat and global rate limits,
+    merge bursts that share a coalesce key and retry transient failures with
+    backoff.
+    """
+    
+    GLOBAL_RATE = 30          # messages per second across all chats
+    CHAT_INTERVAL = 1.0       # seconds between messages to the same chat
+    MAX_RETRIES = 5
     
     def __init__(self):
         self.token = config.TELEGRAM_BOT_TOKEN
         self.chat_id = config.TELEGRAM_CHAT_ID
         self.enabled = bool(self.token and self.chat_id)
+        self.coalesce_seconds = config.TELEGRAM_COALESCE_SECONDS
+        self.max_queue = config.TELEGRAM_QUEUE_MAX
+        self.workers = max(1, config.TELEGRAM_SENDER_WORKERS)
+        
+        # One keep-alive connection per sender
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Queue state (guarded by _cond)
+        self._cond = threading.Condition()
+        self._ready = []       # heap of (priority, seq, item)
+        self._delayed = []     # heap of (ready_at, seq, item)
+        self._pending: Dict[tuple, dict] = {}  # coalesce key -> queued item
+        self._chat_next: Dict[str, float] = {}
+        self._global_next = 0.0
+        self._in_flight = 0
+        self._seq = itertools.count()
+        self._running = False
+        self._threads = []
+        
+        # Delivery stats
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
         
         if self.enabled:
             logger.info("Telegram notifications enabled")
+            metrics.QUEUE_DEPTH.labels('telegram').set_function(self.queue_size)
+            self._start()
         else:
             logger.warning("Telegram not configured - notifications disabled")
     
-    def send(self, message: str, parse_mode: str = "HTML") -> bool:
-        """Send a message to Telegram"""
+    def send(self, message: str, parse_mode: str = "HTML", chat_id: str = None,
+             coalesce_key: str = None, priority: int = 0,
+             formatter: Callable[[Dict[str, int]], str] = None) -> bool:
+        """
+        Queue a message for Telegram and return immediately
+        
+        Args:
+            message: Message text
+            parse_mode: Telegram parse mode
+            chat_id: Target chat (defaults to TELEGRAM_CHAT_ID)
+            coalesce_key: Messages with the same key merge while queued
+            priority: Lower is delivered first
+            formatter: Renders merged texts {text: count} into one message
+            
+        Returns:
+            True if queued (or merged into a queued message)
+        """
         
         if not self.enabled:
             return False
         
+        chat_id = str(chat_id or self.chat_id)
+        now = time.time()
+        
+        with self._cond:
+            # Merge into a message that hasn't gone out yet
+            if coalesce_key is not None:
+                item = self._pending.get((chat_id, coalesce_key))
+                if item:
+                    item['texts'][message] = item['texts'].get(message, 0) + 1
+                    self.coalesced += 1
+                    return True
+            
+            if len(self._ready) + len(self._delayed) >= self.max_queue:
+                self.dropped += 1
+                logger.warning("Telegram queue full, dropping message")
+                return False
+            
+            item = {
+                'chat_id': chat_id,
+                'texts': {message: 1},
+                'parse_mode': parse_mode,
+                'priority': priority,
+                'coalesce_key': coalesce_key,
+                'formatter': formatter,
+                'attempts': 0
+            }
+            
+            if coalesce_key is not None:
+                self._pending[(chat_id, coalesce_key)] = item
+                # Linger briefly so a burst lands in one message
+                heapq.heappush(self._delayed, (now + self.coalesce_seconds, next(self._seq), item))
+            else:
+                heapq.heappush(self._ready, (priority, next(self._seq), item))
+            
+            self._cond.notify_all()
+        
+        return True
+    
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until the queue drains (used on shutdown)"""
+        
+        deadline = time.time() + timeout
+        
+        with self._cond:
+            # Coalescing linger shouldn't hold up shutdown
+            while self._delayed:
+                _, seq, item = heapq.heappop(self._delayed)
+                heapq.heappush(self._ready, (item['priority'], seq, item))
+            self._cond.notify_all()
+            
+            while self._ready or self._delayed or self._in_flight:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        
+        return True
+    
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush pending messages and stop the sender"""
+        
+        if not self._running:
+            return
+        
+        self.flush(timeout)
+        
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        
+        for thread in self._threads:
+            thread.join(timeout=1)
+    
+    def queue_size(self) -> int:
+        """Number of messages waiting to be sent"""
+        with self._cond:
+            return len(self._ready) + len(self._delayed)
+    
+    # ============ SENDER ============
+    
+    def _start(self):
+        """Start the background sender threads"""
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._sender_loop, name=f"telegram-sender-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def _sender_loop(self):
+        """Deliver queued messages within rate limits"""
+        
+        while True:
+            with self._cond:
+                item = self._next_item()
+                if item is None:
+                    if not self._running:
+                        return
+                    continue
+                self._in_flight += 1
+            
+            try:
+                self._deliver(item)
+            finally:
+                with self._cond:
+                    self._in_flight -= 1
+                    self._cond.notify_all()
+    
+    def _next_item(self) -> Optional[dict]:
+        """
+        Pop the next sendable item, waiting on limits (called with _cond held)
+        
+        Returns None after a wait so the caller can re-check shutdown.
+        """
+        
+        now = time.time()
+        
+        # Promote delayed items whose time has come
+        while self._delayed and self._delayed[0][0] <= now:
+            _, seq, item = heapq.heappop(self._delayed)
+            heapq.heappush(self._ready, (item['priority'], seq, item))
+        
+        while self._ready:
+            _, seq, item = self._ready[0]
+            
+            # Per-chat limit: park the item until its chat frees up
+            chat_ready = self._chat_next.get(item['chat_id'], 0)
+            if chat_ready > now:
+                heapq.heappop(self._ready)
+                heapq.heappush(self._delayed, (chat_ready, seq, item))
+                continue
+            
+            # Global limit
+            if self._global_next > now:
+                self._cond.wait(self._global_next - now)
+                return None
+            
+            heapq.heappop(self._ready)
+            if item['coalesce_key'] is not None:
+                self._pending.pop((item['chat_id'], item['coalesce_key']), None)
+            
+            self._global_next = now + 1 / self.GLOBAL_RATE
+            self._chat_next[item['chat_id']] = now + self.CHAT_INTERVAL
+            return item
+        
+        if not self._running:
+            return None
+        
+        timeout = self._delayed[0][0] - now if self._delayed else None
+        self._cond.wait(timeout)
+        return None
+    
+    def _deliver(self, item: dict):
+        """Send one item and reschedule it on retryable failures"""
+        
+        text = self._render(item)
+        status, retry_after = self._post(item['chat_id'], text, item['parse_mode'])
+        
+        if status == 200:
+            with self._cond:
+                self.sent += 1
+            return
+        
+        # 4xx other than rate limiting won't succeed on retry
+        if status and status != 429 and status < 500:
+            with self._cond:
+                self.dropped += 1
+            return
+        
+        item['attempts'] += 1
+        if item['attempts'] > self.MAX_RETRIES:
+            with self._cond:
+                self.dropped += 1
+            logger.error(f"Telegram message dropped after {self.MAX_RETRIES} retries")
+            return
+        
+        delay = retry_after if retry_after else min(2 ** item['attempts'], 60)
+        ready_at = time.time() + delay
+        
+        with self._cond:
+            if status == 429:
+                self._chat_next[item['chat_id']] = ready_at
+            heapq.heappush(self._delayed, (ready_at, next(self._seq), item))
+            self._cond.notify_all()
+    
+    def _render(self, item: dict) -> str:
+        """Build the final text for a (possibly merged) item"""
+        
+        texts = item['texts']
+        
+        if item['formatter']:
+            return item['formatter'](texts)
+        
+        if len(texts) == 1:
+            text, count = next(iter(texts.items()))
+            return text if count == 1 else f"{text}\n\n<i>(x{count})</i>"
+        
+        return "\n\n".join(text if count == 1 else f"{text} <i>(x{count})</i>" for text, count in texts.items())
+    
+    @metrics.timed('telegram.send')
+    def _post(self, chat_id: str, message: str, parse_mode: str) -> tuple:
+        """
+        Synchronous Telegram API call (sender threads only)
+        
+        Returns:
+            (HTTP status or None on network error, retry_after seconds or None)
+        """
+        
         try:
-            url = f"https://api.telegram.org/bot{self.token}/sendMessage"
+            url = f"{config.TELEGRAM_API_URL}/bot{self.token}/sendMessage"
             
             payload = {
-                'chat_id': self.chat_id,
+                'chat_id': chat_id,
                 'text': message,
                 'parse_mode': parse_mode,
                 'disable_web_page_preview': True
             }
             
-            response = requests.post(url, json=payload, timeout=10)
+            response = self.session.post(url, json=payload, timeout=10)
             
             if response.status_code == 200:
-                return True
-            else:
-                logger.error(f"Telegram error: {response.text}")
-                return False
+                return 200, None
+            
+            metrics.UPSTREAM_ERRORS.labels('telegram', 'sendMessage').inc()
+            
+            retry_after = None
+            if response.status_code == 429:
+                try:
+                    retry_after = response.json().get('parameters', {}).get('retry_after')
+                except ValueError:
+                    pass
+            
+            logger.error(f"Telegram error: {response.text}")
+            return response.status_code, retry_after
                 
         except Exception as e:
             logger.error(f"Telegram send error: {e}")
-            return False
+            metrics.UPSTREAM_ERRORS.labels('telegram', 'sendMessage').inc()
+            return None, None
     
     def send_signal(self, decision: str, confidence: int, reasoning: str, 
                     entry: float = None, sl: float = None, tp: float = None) -> bool:
         """Send trading signal alert"""
         
+        return self.send(self.format_signal(decision, confidence, reasoning, entry, sl, tp))
+    
+    def format_signal(self, decision: str, confidence: int, reasoning: str, 
+                      entry: float = None, sl: float = None, tp: float = None) -> str:
+        """Build trading signal message"""
+        
         emoji = "🟢" if decision == "LONG" else "🔴" if decision == "SHORT" else "⚪"
         
         message = f"""
@@ -73,7 +359,7 @@ class TelegramBot:
         
         message += f"\n\n⏰ <i>{config.TRADING_SYMBOL}</i>"
         
-        return self.send(message)
+        return message
     
     def send_trade_executed(self, side: str, amount: float, price: float, 
                             pnl: float = None) -> bool:
@@ -97,16 +383,23 @@ class TelegramBot:
         return self.send(message)
     
     def send_error(self, error: str) -> bool:
-        """Send error alert"""
+        """Send error alert (bursts are merged into one message)"""
         
-        message = f"""
+        return self.send(error, coalesce_key='error', formatter=self._format_errors)
+    
+    @staticmethod
+    def _format_errors(errors: Dict[str, int]) -> str:
+        """Render merged error texts"""
+        
+        lines = "\n".join(error if count == 1 else f"{error} <i>(x{count})</i>" for error, count in errors.items())
+        
+        return f"""
 ⚠️ <b>NEXUS BOT ERROR</b>
 
-{error}
+{lines}
 
 <i>Please check the bot logs</i>
 """
-        return self.send(message)
     
     def send_daily_summary(self, trades: int, pnl: float, balance: float, 
                            win_rate: float = None) -> bool:
@@ -153,6 +446,7 @@ if __name__ == "__main__":
     
     if bot.enabled:
         bot.send_startup()
+        bot.close()
         print("Startup message sent!")
     else:
         print("Telegram not configured")
@@ -0,0 +1,281 @@
+"""
+NEXUS AI Trading Bot - Tier API
+================================
+Async HTTP service for wallet tier lookups (website + DIAMOND api_access)
+"""
+
+import re
+import json
+import time
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from aiohttp import web
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from loguru import logger
+import metrics
+from config import config
+from token_verifier import TokenVerifier, TIER_FEATURES
+from typing import Dict, Optional
+
+WALLET_RE = re.compile(r"^0x[0-9a-fA-F]{40}$")
+
+
+class TokenBucket:
+    """Per-client request budget"""
+
+    __slots__ = ('tokens', 'updated')
+
+    def __init__(self, burst: float):
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, rate: float, burst: float) -> float:
+        """Consume one token; returns 0 if allowed, else seconds to wait"""
+        now = time.monotonic()
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / rate
+
+
+class TierAPI:
+    """
+    Long-lived tier lookup service.
+
+    One TokenVerifier (pooled RPC, tier cache, holder index) serves every
+    request. Serialized responses are cached briefly, concurrent lookups of
+    the same wallet share one in-flight call, and each client has its own
+    token bucket: keyed by IP, or by API key for keys issued in
+    TIER_API_KEYS, which get the larger TIER_API_KEY_RATE / _BURST budget.
+    A key is only honoured while its owner wallet's tier has api_access; an
+    unknown key is rejected, not given a fresh bucket.
+    """
+
+    MAX_BUCKETS = 100_000
+
+    def __init__(self, verifier: TokenVerifier):
+        self.verifier = verifier
+        self.cache_ttl = config.TIER_API_CACHE_TTL
+        self.rate = config.TIER_API_RATE
+        self.burst = config.TIER_API_BURST
+        self.key_rate = config.TIER_API_KEY_RATE
+        self.key_burst = config.TIER_API_KEY_BURST
+        self.api_keys = {key: wallet.lower() for key, wallet in config.TIER_API_KEYS.items()}
+
+        self._responses: Dict[str, tuple] = {}  # wallet -> (expires_at, body)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()  # least recently used first
+        # Blocking RPC lookups run here so the event loop never waits on a chain
+        self._executor = ThreadPoolExecutor(max_workers=config.TIER_API_WORKERS, thread_name_prefix="tier-api")
+
+        self.stats = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'lookups': 0, 'rate_limited': 0,
+                      'unauthorized': 0}
+
+    def build_app(self) -> web.Application:
+        """Create the aiohttp application"""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get('/tier/{wallet}', self.handle_tier)
+        app.router.add_post('/verify', self.handle_verify)
+        app.router.add_get('/health', self.handle_health)
+        app.router.add_get('/metrics', self.handle_metrics)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+    # ============ HANDLERS ============
+
+    async def handle_tier(self, request: web.Request) -> web.Response:
+        """GET /tier/{wallet}"""
+        wallet = request.match_info['wallet']
+        if not WALLET_RE.match(wallet):
+            return self._json({'error': 'invalid wallet address'}, status=400)
+
+        body = await self._tier_body(wallet.lower())
+        return web.Response(body=body, content_type='application/json')
+
+    async def handle_verify(self, request: web.Request) -> web.Response:
+        """POST /verify {wallet, message, signature} -> tier if the signature matches"""
+        try:
+            payload = await request.json()
+            wallet = payload['wallet']
+            message = payload['message']
+            signature = payload['signature']
+        except (ValueError, KeyError, TypeError):
+            return self._json({'error': 'expected wallet, message, signature'}, status=400)
+        if not all(isinstance(value, str) for value in (wallet, message, signature)):
+            return self._json({'error': 'expected wallet, message, signature'}, status=400)
+
+        if not WALLET_RE.match(wallet):
+            return self._json({'error': 'invalid wallet address'}, status=400)
+
+        loop = asyncio.get_running_loop()
+        verified = await loop.run_in_executor(
+            self._executor, self.verifier.verify_signature, wallet, message, signature
+        )
+        if not verified:
+            return self._json({'error': 'signature does not match wallet'}, status=401)
+
+        body = await self._tier_body(wallet.lower())
+        return web.Response(body=body, content_type='application/json')
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        """GET /health"""
+        cache = self.verifier.tier_cache
+        return self._json({
+            'status': 'ok',
+            'chains': list(self.verifier.web3_instances),
+            'tier_cache': cache.stats() if cache else None,
+            'indexer_synced': self.verifier.indexer.is_synced() if self.verifier.indexer else None,
+            **self.stats
+        })
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        """GET /metrics (Prometheus text format)"""
+        response = web.Response(body=generate_latest())
+        response.headers['Content-Type'] = CONTENT_TYPE_LATEST
+        return response
+
+    # ============ LOOKUP ============
+
+    async def _tier_body(self, wallet: str) -> bytes:
+        """Serialized tier response: cache, then coalesced lookup"""
+        self.stats['requests'] += 1
+
+        cached = self._responses.get(wallet)
+        if cached and cached[0] > time.monotonic():
+            self.stats['cache_hits'] += 1
+            metrics.cache_result('tier_api', True)
+            return cached[1]
+        metrics.cache_result('tier_api', False)
+
+        # Join an identical lookup already in flight
+        future = self._inflight.get(wallet)
+        if future:
+            self.stats['coalesced'] += 1
+            metrics.cache_result('tier_api_inflight', True)
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[wallet] = future
+
+        try:
+            self.stats['lookups'] += 1
+            tier = await loop.run_in_executor(self._executor, self.verifier.get_tier, wallet)
+            body = json.dumps({
+                'wallet': wallet,
+                'tier': tier,
+                'features': TIER_FEATURES.get(tier, TIER_FEATURES['FREE'])
+            }).encode()
+
+            self._responses[wallet] = (time.monotonic() + self.cache_ttl, body)
+            future.set_result(body)
+            return body
+
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the error; mark it retrieved so it isn't logged as unhandled
+            future.exception()
+            raise
+
+        finally:
+            self._inflight.pop(wallet, None)
+            if len(self._responses) > config.TIER_API_CACHE_SIZE:
+                self._prune_responses()
+
+    # ============ MIDDLEWARE ============
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        """API key check, rate limiting, api_access gate, CORS and error mapping"""
+        if request.method == 'OPTIONS':
+            return self._cors(web.Response())
+
+        # Only issued keys get their own bucket; anything else is limited by IP
+        api_key = request.headers.get('X-API-Key')
+        owner = self.api_keys.get(api_key) if api_key else None
+        if owner:
+            client, rate, burst = f"key:{api_key}", self.key_rate, self.key_burst
+        else:
+            client, rate, burst = f"ip:{request.remote or 'unknown'}", self.rate, self.burst
+
+        wait = self._bucket(client, burst).take(rate, burst)
+        if wait:
+            self.stats['rate_limited'] += 1
+            response = self._json({'error': 'rate limited'}, status=429)
+            response.headers['Retry-After'] = str(max(1, round(wait)))
+            return self._cors(response)
+
+        if api_key and not owner:
+            self.stats['unauthorized'] += 1
+            return self._cors(self._json({'error': 'invalid API key'}, status=401))
+
+        try:
+            if owner and not await self._has_api_access(owner):
+                self.stats['unauthorized'] += 1
+                return self._cors(self._json({'error': 'API key owner has no api_access tier'}, status=403))
+            response = await handler(request)
+        except web.HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Tier API error on {request.path}: {e}")
+            response = self._json({'error': 'lookup failed'}, status=502)
+
+        return self._cors(response)
+
+    async def _has_api_access(self, wallet: str) -> bool:
+        """Whether the key owner's current tier includes api_access (cached like /tier)"""
+        body = await self._tier_body(wallet)
+        return bool(json.loads(body)['features'].get('api_access'))
+
+    def _bucket(self, client: str, burst: float) -> TokenBucket:
+        """Get or create a client's bucket (LRU: the longest-idle client is evicted)"""
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            if len(self._buckets) >= self.MAX_BUCKETS:
+                self._buckets.popitem(last=False)
+            bucket = self._buckets[client] = TokenBucket(burst)
+        else:
+            self._buckets.move_to_end(client)
+        return bucket
+
+    def _prune_responses(self):
+        """Drop expired cached responses"""
+        now = time.monotonic()
+        self._responses = {w: entry for w, entry in self._responses.items() if entry[0] > now}
+
+    @staticmethod
+    def _cors(response: web.StreamResponse) -> web.StreamResponse:
+        response.headers['Access-Control-Allow-Origin'] = config.TIER_API_CORS_ORIGIN
+        response.headers['Access-Control-Allow-Headers'] = 'Content-Type, X-API-Key'
+        return response
+
+    @staticmethod
+    def _json(data: dict, status: int = 200) -> web.Response:
+        return web.json_response(data, status=status)
+
+    async def _on_cleanup(self, app):
+        self._executor.shutdown(wait=False)
+        self.verifier.close()
+
+
+def run(token_addresses: Optional[Dict[str, str]] = None) -> None:
+    """Start the tier API server"""
+    token_addresses = token_addresses or config.NEXUS_TOKEN_ADDRESSES
+    if not token_addresses:
+        logger.error("NEXUS_TOKEN_ADDRESSES is required for the tier API")
+        return
+
+    verifier = TokenVerifier(token_addresses)
+    verifier.signatures.start()
+
+    api = TierAPI(verifier)
+    logger.info(f"Tier API listening on {config.TIER_API_HOST}:{config.TIER_API_PORT}")
+    web.run_app(api.build_app(), host=config.TIER_API_HOST, port=config.TIER_API_PORT, access_log=None)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,235 @@
+"""
+NEXUS AI Trading Bot - Tier Cache
+==================================
+In-memory wallet tier cache invalidated by on-chain Transfer events
+"""
+
+import time
+import threading
+import metrics
+from collections import OrderedDict
+from loguru import logger
+from config import config
+from typing import Dict, Optional, Tuple
+
+# keccak("Transfer(address,address,uint256)")
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+# Max blocks per eth_getLogs request
+MAX_LOG_RANGE = 2000
+
+
+class TierCache:
+    """
+    Wallet -> (tier, total balance) cache with TTL.
+
+    A watcher thread follows NEXUS Transfer logs on every chain and drops
+    the sender and receiver on each transfer. While any chain's watcher is
+    behind, the cache reports misses instead of possibly stale hits. The
+    hash of each chain's cursor block is checked on every poll; if a reorg
+    replaced it, transfers the watcher already passed may have changed, so
+    the whole cache is dropped and the watcher restarts from head.
+
+    Lookups that race with a transfer are handled with an invalidation
+    sequence: callers take a token with begin() before reading balances,
+    and put() refuses the result if the wallet was invalidated since.
+    """
+
+    def __init__(self, verifier, ttl: float = None, poll_interval: float = None):
+        self.verifier = verifier
+        self.ttl = ttl or config.TIER_CACHE_TTL
+        self.poll_interval = poll_interval or config.TIER_CACHE_POLL_INTERVAL
+        # Watcher lag beyond this makes the cache bypass itself
+        self.max_lag = self.poll_interval * 3 + config.TIER_RPC_TIMEOUT
+
+        self.entries: Dict[str, Tuple[str, float, float]] = {}  # wallet -> (tier, total, expires_at)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        self._lock = threading.Lock()
+        self._seq = 0
+        # wallet -> seq of its last invalidation (bounded; eviction raises the floor)
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._invalidated_floor = 0
+        self._max_invalidated = 100_000
+
+        self._cursors: Dict[str, int] = {}
+        self._cursor_hashes: Dict[str, bytes] = {}
+        self._last_poll: Dict[str, float] = {}
+        self._running = False
+        self._thread = None
+
+    # ============ CACHE ============
+
+    def get(self, wallet: str) -> Optional[Tuple[str, float]]:
+        """Return (tier, total) if cached, fresh and the watchers are live"""
+
+        entry = self.entries.get(wallet.lower())
+        now = time.time()
+
+        if entry is None or entry[2] < now or not self._watchers_live(now):
+            self.misses += 1
+            metrics.cache_result('tier', False)
+            return None
+
+        self.hits += 1
+        metrics.cache_result('tier', True)
+        return entry[0], entry[1]
+
+    def begin(self) -> int:
+        """Take an invalidation token before reading balances"""
+        with self._lock:
+            return self._seq
+
+    def put(self, wallet: str, tier: str, total: float, token: int) -> bool:
+        """
+        Cache a lookup result
+
+        Args:
+            token: Value of begin() taken before the balances were read
+
+        Returns:
+            False if the wallet changed while the lookup was in flight
+        """
+
+        wallet = wallet.lower()
+
+        with self._lock:
+            if token < self._invalidated_floor or self._invalidated.get(wallet, -1) > token:
+                return False
+
+            self.entries[wallet] = (tier, total, time.time() + self.ttl)
+            return True
+
+    def invalidate(self, wallet: str) -> None:
+        """Drop a wallet and mark it changed"""
+
+        wallet = wallet.lower()
+
+        with self._lock:
+            self._seq += 1
+            self.entries.pop(wallet, None)
+
+            self._invalidated[wallet] = self._seq
+            self._invalidated.move_to_end(wallet)
+            if len(self._invalidated) > self._max_invalidated:
+                _, seq = self._invalidated.popitem(last=False)
+                self._invalidated_floor = max(self._invalidated_floor, seq)
+
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._seq += 1
+            self._invalidated_floor = self._seq
+            self._invalidated.clear()
+            self.entries.clear()
+
+    def stats(self) -> dict:
+        """Cache counters"""
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'cursors': dict(self._cursors),
+            'live': self._watchers_live(time.time())
+        }
+
+    # ============ TRANSFER WATCHER ============
+
+    def start(self) -> None:
+        """Start following Transfer logs from the current head"""
+
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(target=self._watch, name="tier-cache-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Tier cache started (ttl {self.ttl}s, poll {self.poll_interval}s)")
+
+    def stop(self) -> None:
+        """Stop the watcher"""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval + 1)
+
+    def _watchers_live(self, now: float) -> bool:
+        """True if every chain was polled recently"""
+
+        chains = self.verifier.web3_instances
+        if not self._running or len(self._last_poll) < len(chains):
+            return False
+
+        return all(now - self._last_poll[chain] <= self.max_lag for chain in chains)
+
+    def _watch(self):
+        """Poll every chain for new Transfer logs"""
+
+        while self._running:
+            for chain in list(self.verifier.web3_instances):
+                try:
+                    self._poll_chain(chain)
+                except Exception as e:
+                    logger.warning(f"Tier cache watcher error on {chain}: {e}")
+
+            time.sleep(self.poll_interval)
+
+    def _poll_chain(self, chain: str):
+        """Invalidate wallets touched by Transfer logs since the cursor"""
+
+        w3 = self.verifier.web3_instances[chain]
+        token = self.verifier.contracts[chain].address
+        head = w3.eth.block_number
+
+        if chain in self._cursors and self._reorged(w3, chain, head):
+            logger.warning(f"Reorg on {chain} below block {self._cursors[chain]}, dropping the tier cache")
+            self.clear()
+            del self._cursors[chain]
+
+        # First poll: start at head. Lookups that began before now may
+        # predate the cursor, so raise the floor to refuse their results.
+        if chain not in self._cursors:
+            with self._lock:
+                self._seq += 1
+                self._invalidated_floor = self._seq
+            self._cursors[chain] = head
+            self._cursor_hashes[chain] = bytes(w3.eth.get_block(head)['hash'])
+            self._last_poll[chain] = time.time()
+            return
+
+        cursor = self._cursors[chain]
+
+        while cursor < head:
+            to_block = min(head, cursor + MAX_LOG_RANGE)
+            logs = w3.eth.get_logs({
+                'fromBlock': cursor + 1,
+                'toBlock': to_block,
+                'address': token,
+                'topics': [TRANSFER_TOPIC]
+            })
+
+            for log in logs:
+                topics = log['topics']
+                if len(topics) < 3:
+                    continue
+                self.invalidate('0x' + bytes(topics[1])[-20:].hex())
+                self.invalidate('0x' + bytes(topics[2])[-20:].hex())
+
+            cursor = to_block
+            self._cursors[chain] = cursor
+            self._cursor_hashes[chain] = bytes(w3.eth.get_block(to_block)['hash'])
+
+        # Only a fully caught-up pass counts as live
+        self._last_poll[chain] = time.time()
+
+    def _reorged(self, w3, chain: str, head: int) -> bool:
+        """True if the cursor block is gone or no longer canonical"""
+
+        cursor = self._cursors[chain]
+        if head < cursor:
+            return True
+        return bytes(w3.eth.get_block(cursor)['hash']) != self._cursor_hashes.get(chain)
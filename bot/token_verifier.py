@@ -4,10 +4,17 @@ NEXUS AI Trading Bot - Token Verification
 Verifica holdings on-chain per tier access
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
 from web3 import Web3
 from loguru import logger
 from config import config
-from typing import Optional, Dict
+from tier_cache import TierCache
+from holder_indexer import HolderIndexer
+from rpc_pool import PooledProvider
+from signature_verifier import SignatureVerifier
+from typing import Optional, Dict, List, Iterable
 
 # Minimal ERC20 ABI for balanceOf
 ERC20_ABI = [
@@ -27,35 +34,98 @@ ERC20_ABI = [
     }
 ]
 
-# Chain configurations
+# Multicall3 is deployed at the same address on every supported chain
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+# balanceOf(address) selector
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")
+
+# Calls per aggregate3 request (keeps eth_call well under RPC gas caps)
+MULTICALL_BATCH_SIZE = 500
+
+# Chain configurations (RPC_URLS in .env overrides the endpoint lists)
 CHAINS = {
     "base": {
-        "rpc": "https://mainnet.base.org",
+        "rpcs": [
+            "https://mainnet.base.org",
+            "https://base-rpc.publicnode.com",
+            "https://base.llamarpc.com"
+        ],
         "chain_id": 8453,
         "name": "Base"
     },
     "bsc": {
-        "rpc": "https://bsc-dataseed1.binance.org",
+        "rpcs": [
+            "https://bsc-dataseed1.binance.org",
+            "https://bsc-dataseed2.binance.org",
+            "https://bsc-rpc.publicnode.com"
+        ],
         "chain_id": 56,
         "name": "BSC"
     },
     "arbitrum": {
-        "rpc": "https://arb1.arbitrum.io/rpc",
+        "rpcs": [
+            "https://arb1.arbitrum.io/rpc",
+            "https://arbitrum-one-rpc.publicnode.com",
+            "https://arbitrum.llamarpc.com"
+        ],
         "chain_id": 42161,
         "name": "Arbitrum"
     },
     "polygon": {
-        "rpc": "https://polygon-rpc.com",
+        "rpcs": [
+            "https://polygon-rpc.com",
+            "https://polygon-bor-rpc.publicnode.com",
+            "https://polygon.llamarpc.com"
+        ],
         "chain_id": 137,
         "name": "Polygon"
     },
     "avalanche": {
-        "rpc": "https://api.avax.network/ext/bc/C/rpc",
+        "rpcs": [
+            "https://api.avax.network/ext/bc/C/rpc",
+            "https://avalanche-c-chain-rpc.publicnode.com"
+        ],
         "chain_id": 43114,
         "name": "Avalanche"
     }
 }
 
+# Partial-result policies when a chain misses the deadline
+PARTIAL_POLICIES = (
+    "partial",  # sum the chains that answered (lower bound, never over-grants)
+    "strict",   # any missing chain makes the total unknown -> FREE
+)
+
 # Tier thresholds (in tokens, not wei)
 TIERS = {
     "DIAMOND": 1_000_000,
@@ -105,23 +175,90 @@ TIER_FEATURES = {
 }
 
 
+@lru_cache(maxsize=65536)
+def to_checksum(address: str) -> str:
+    """Checksum an address once and reuse it"""
+    return Web3.to_checksum_address(address)
+
+
+def tier_for_balance(balance: float) -> str:
+    """Map a token balance to its tier"""
+    for tier, threshold in TIERS.items():
+        if balance >= threshold:
+            return tier
+    return "FREE"
+
+
 class TokenVerifier:
     """Verify $NEXUS holdings across chains"""
     
-    def __init__(self, token_addresses: Dict[str, str]):
+    def __init__(self, token_addresses: Dict[str, str], use_cache: bool = None, use_indexer: bool = None):
         """
         Args:
             token_addresses: Dict mapping chain name to token contract address
                 e.g. {"base": "0x...", "bsc": "0x..."}
+            use_cache: Cache tiers with Transfer-event invalidation
+                (defaults to TIER_CACHE_ENABLED)
+            use_indexer: Serve balances from the local holder index when synced
+                (defaults to INDEXER_ENABLED)
         """
         self.token_addresses = token_addresses
         self.web3_instances = {}
+        self.contracts = {}
+        self.multicalls = {}
+        self.decimals: Dict[str, int] = {}  # immutable per token, fetched once
+        self.rpc_timeout = config.TIER_RPC_TIMEOUT
+        self.partial_policy = config.TIER_PARTIAL_POLICY
         
-        # Initialize Web3 for each chain
+        if self.partial_policy not in PARTIAL_POLICIES:
+            raise ValueError(f"Unknown partial policy: {self.partial_policy}")
+        
+        # Initialize Web3 and contract objects once per chain
         for chain, addr in token_addresses.items():
             if chain in CHAINS:
-                self.web3_instances[chain] = Web3(Web3.HTTPProvider(CHAINS[chain]["rpc"]))
+                urls = config.RPC_URLS.get(chain) or CHAINS[chain]["rpcs"]
+                w3 = Web3(PooledProvider(urls, timeout=self.rpc_timeout))
+                self.web3_instances[chain] = w3
+                self.contracts[chain] = w3.eth.contract(address=to_checksum(addr), abi=ERC20_ABI)
+                self.multicalls[chain] = w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
                 logger.info(f"Connected to {chain}: {CHAINS[chain]['name']}")
+        
+        # Per-chain lookups run in parallel; headroom for calls abandoned at the deadline
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(4, len(self.web3_instances) * 4),
+            thread_name_prefix="tier-rpc"
+        )
+        
+        # ecrecover is offline: works even with no chain configured
+        self.signatures = SignatureVerifier()
+        
+        self.tier_cache = None
+        if config.TIER_CACHE_ENABLED if use_cache is None else use_cache:
+            self.tier_cache = TierCache(self)
+            self.tier_cache.start()
+        
+        self.indexer = None
+        if config.INDEXER_ENABLED if use_indexer is None else use_indexer:
+            self.indexer = HolderIndexer(self)
+            self.indexer.start()
+    
+    def close(self) -> None:
+        """Stop background workers"""
+        
+        if self.tier_cache:
+            self.tier_cache.stop()
+        if self.indexer:
+            self.indexer.stop()
+        self.signatures.close()
+        self._executor.shutdown(wait=False)
+    
+    def get_decimals(self, chain: str) -> int:
+        """Get token decimals for a chain (cached)"""
+        
+        if chain not in self.decimals:
+            self.decimals[chain] = self.contracts[chain].functions.decimals().call()
+        
+        return self.decimals[chain]
     
     def get_balance(self, wallet: str, chain: str) -> float:
         """Get token balance for wallet on specific chain"""
@@ -131,38 +268,201 @@ class TokenVerifier:
             return 0.0
         
         try:
-            w3 = self.web3_instances[chain]
-            token_address = self.token_addresses[chain]
-            
-            # Checksum addresses
-            wallet = Web3.to_checksum_address(wallet)
-            token_address = Web3.to_checksum_address(token_address)
+            return self._fetch_balance(wallet, chain)
+        except Exception as e:
+            logger.error(f"Error getting balance on {chain}: {e}")
+            return 0.0
+    
+    def _fetch_balance(self, wallet: str, chain: str) -> float:
+        """Read one balance, raising on RPC errors"""
+        
+        balance_wei = self.contracts[chain].functions.balanceOf(to_checksum(wallet)).call()
+        
+        # Convert to human readable
+        balance = balance_wei / (10 ** self.get_decimals(chain))
+        
+        logger.debug(f"Balance on {chain}: {balance:,.2f} NEXUS")
+        return balance
+    
+    def get_balances(self, wallets: Iterable[str], chain: str) -> Dict[str, Optional[float]]:
+        """
+        Get token balances for many wallets on one chain via Multicall3
+        
+        One eth_call per MULTICALL_BATCH_SIZE wallets instead of one per wallet.
+        
+        Args:
+            wallets: Wallet addresses (any case)
+            chain: Chain name
             
-            # Get contract
-            contract = w3.eth.contract(address=token_address, abi=ERC20_ABI)
+        Returns:
+            Dict mapping each valid input wallet to its balance, or None if
+            it couldn't be read (invalid addresses are left out)
+        """
+        
+        return self._get_balances(self._checksummed(wallets), chain)
+    
+    def _checksummed(self, wallets: Iterable[str]) -> Dict[str, str]:
+        """Map each valid wallet to its checksum address, skipping invalid ones"""
+        
+        checksummed = {}
+        for wallet in dict.fromkeys(wallets):
+            try:
+                checksummed[wallet] = to_checksum(wallet)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Skipping invalid wallet {wallet!r}: {e}")
+        return checksummed
+    
+    def _get_balances(self, checksummed: Dict[str, str], chain: str) -> Dict[str, Optional[float]]:
+        """Multicall balanceOf for already validated wallets"""
+        
+        wallets = list(checksummed)
+        balances: Dict[str, Optional[float]] = {wallet: None for wallet in wallets}
+        
+        if chain not in self.web3_instances:
+            logger.warning(f"Chain {chain} not configured")
+            return balances
+        
+        try:
+            decimals = self.get_decimals(chain)
+        except Exception as e:
+            logger.error(f"Error getting decimals on {chain}: {e}")
+            return balances
+        
+        token = self.contracts[chain].address
+        multicall = self.multicalls[chain]
+        scale = 10 ** decimals
+        
+        for start in range(0, len(wallets), MULTICALL_BATCH_SIZE):
+            batch = wallets[start:start + MULTICALL_BATCH_SIZE]
             
-            # Get balance and decimals
-            balance_wei = contract.functions.balanceOf(wallet).call()
-            decimals = contract.functions.decimals().call()
+            # balanceOf(address): selector + address left-padded to 32 bytes
+            calls = [
+                (token, True, BALANCE_OF_SELECTOR + bytes(12) + bytes.fromhex(checksummed[wallet][2:]))
+                for wallet in batch
+            ]
             
-            # Convert to human readable
-            balance = balance_wei / (10 ** decimals)
+            try:
+                results = multicall.functions.aggregate3(calls).call()
+            except Exception as e:
+                # Leave the batch unknown rather than report zero balances
+                logger.error(f"Multicall error on {chain} ({len(batch)} wallets): {e}")
+                continue
             
-            logger.debug(f"Balance on {chain}: {balance:,.2f} NEXUS")
-            return balance
+            for wallet, (success, data) in zip(batch, results):
+                if success and len(data) >= 32:
+                    balances[wallet] = int.from_bytes(data[:32], 'big') / scale
+        
+        logger.debug(f"Fetched {len(wallets)} balances on {chain}")
+        return balances
+    
+    def get_total_balances(self, wallets: Iterable[str]) -> Dict[str, Optional[float]]:
+        """
+        Get total balance across all chains for many wallets
+        
+        A wallet missing on some chain follows TIER_PARTIAL_POLICY: the sum
+        of the chains that answered, or None under "strict". Invalid
+        addresses are left out.
+        """
+        
+        if self.indexer and self.indexer.is_synced():
+            return self.indexer.get_total_balances(wallets)
+        
+        checksummed = self._checksummed(wallets)
+        totals: Dict[str, Optional[float]] = {wallet: 0.0 for wallet in checksummed}
+        incomplete = set()
+        
+        # Chains are independent: fetch them in parallel
+        futures = [self._executor.submit(self._get_balances, checksummed, chain) for chain in self.web3_instances]
+        
+        for future in futures:
+            for wallet, balance in future.result().items():
+                if balance is None:
+                    incomplete.add(wallet)
+                else:
+                    totals[wallet] += balance
+        
+        if incomplete and self.partial_policy == "strict":
+            for wallet in incomplete:
+                totals[wallet] = None
+        
+        return totals
+    
+    def get_tiers(self, wallets: Iterable[str]) -> Dict[str, str]:
+        """Get tiers for many wallets with a few batched requests per chain"""
+        
+        # Unknown totals are FREE, as in get_tier
+        return {
+            wallet: tier_for_balance(total or 0.0)
+            for wallet, total in self.get_total_balances(wallets).items()
+        }
+    
+    def get_balance_breakdown(self, wallet: str, timeout: float = None) -> dict:
+        """
+        Query all chains in parallel under a shared deadline
+        
+        Latency is that of the slowest chain, capped at the deadline.
+        
+        Args:
+            wallet: Wallet address
+            timeout: Deadline in seconds (defaults to TIER_RPC_TIMEOUT)
             
-        except Exception as e:
-            logger.error(f"Error getting balance on {chain}: {e}")
-            return 0.0
+        Returns:
+            Dict with total (None if unusable under the partial policy),
+            per-chain balances, and the chains that timed out or failed
+        """
+        
+        timeout = timeout or self.rpc_timeout
+        start = time.time()
+        
+        futures = {
+            self._executor.submit(self._fetch_balance, wallet, chain): chain
+            for chain in self.web3_instances
+        }
+        done, not_done = wait(futures, timeout=timeout)
+        
+        chains = {}
+        failed = []
+        
+        for future in done:
+            chain = futures[future]
+            try:
+                chains[chain] = future.result()
+            except Exception as e:
+                logger.warning(f"Balance lookup failed on {chain}: {e}")
+                failed.append(chain)
+        
+        # Stragglers keep running until their HTTP timeout; their results are dropped
+        timed_out = [futures[future] for future in not_done]
+        for chain in timed_out:
+            logger.warning(f"Balance lookup on {chain} missed the {timeout}s deadline")
+        
+        complete = not failed and not timed_out
+        total = sum(chains.values())
+        
+        if not complete and self.partial_policy == "strict":
+            total = None
+        
+        return {
+            "total": total,
+            "chains": chains,
+            "timed_out": timed_out,
+            "failed": failed,
+            "complete": complete,
+            "elapsed": time.time() - start
+        }
     
     def get_total_balance(self, wallet: str) -> float:
         """Get total balance across all chains"""
         
-        total = 0.0
+        if self.indexer and self.indexer.is_synced():
+            return self.indexer.get_total_balance(wallet)
         
-        for chain in self.token_addresses:
-            balance = self.get_balance(wallet, chain)
-            total += balance
+        breakdown = self.get_balance_breakdown(wallet)
+        total = breakdown["total"]
+        
+        if total is None:
+            logger.warning(f"Incomplete balance for {wallet[:10]}... (strict policy), treating as 0")
+            return 0.0
         
         logger.info(f"Total balance for {wallet[:10]}...: {total:,.2f} NEXUS")
         return total
@@ -170,14 +470,26 @@ class TokenVerifier:
     def get_tier(self, wallet: str) -> str:
         """Get user tier based on holdings"""
         
-        total_balance = self.get_total_balance(wallet)
+        if self.tier_cache:
+            cached = self.tier_cache.get(wallet)
+            if cached:
+                return cached[0]
+            token = self.tier_cache.begin()
+        
+        # Local index answers without RPC while it keeps up with the chains
+        if self.indexer and self.indexer.is_synced():
+            return tier_for_balance(self.indexer.get_total_balance(wallet))
         
-        for tier, threshold in TIERS.items():
-            if total_balance >= threshold:
-                logger.info(f"Wallet {wallet[:10]}... is tier: {tier}")
-                return tier
+        breakdown = self.get_balance_breakdown(wallet)
+        total_balance = breakdown["total"] or 0.0
+        tier = tier_for_balance(total_balance)
         
-        return "FREE"
+        # Only complete lookups are safe to serve from memory
+        if self.tier_cache and breakdown["complete"]:
+            self.tier_cache.put(wallet, tier, total_balance, token)
+        
+        logger.info(f"Wallet {wallet[:10]}... is tier: {tier}")
+        return tier
     
     def get_tier_features(self, wallet: str) -> dict:
         """Get features available for user's tier"""
@@ -201,28 +513,37 @@ class TokenVerifier:
     def verify_signature(self, wallet: str, message: str, signature: str) -> bool:
         """Verify wallet ownership via signature"""
         
-        try:
-            w3 = list(self.web3_instances.values())[0]  # Any chain works
-            
-            # Recover address from signature
-            recovered = w3.eth.account.recover_message(
-                text=message,
-                signature=signature
-            )
-            
-            return recovered.lower() == wallet.lower()
-            
-        except Exception as e:
-            logger.error(f"Signature verification failed: {e}")
-            return False
+        verified = self.signatures.verify(wallet, message, signature)
+        
+        if not verified:
+            logger.warning(f"Signature verification failed for {wallet[:10]}...")
+        
+        return verified
+    
+    def verify_signatures(self, items: List[tuple]) -> List[bool]:
+        """Verify a batch of (wallet, message, signature) tuples"""
+        
+        return self.signatures.verify_batch(items)
+
+
+# Long-lived verifiers keyed by token address set
+_verifiers: Dict[tuple, TokenVerifier] = {}
+
+
+def get_verifier(token_addresses: Dict[str, str]) -> TokenVerifier:
+    """Get a shared verifier (providers, caches and pools are reused)"""
+    
+    key = tuple(sorted(token_addresses.items()))
+    if key not in _verifiers:
+        _verifiers[key] = TokenVerifier(token_addresses)
+    return _verifiers[key]
 
 
 # Convenience function
 def verify_access(wallet: str, token_addresses: Dict[str, str]) -> dict:
     """Quick verification of wallet access"""
     
-    verifier = TokenVerifier(token_addresses)
-    return verifier.get_tier_features(wallet)
+    return get_verifier(token_addresses).get_tier_features(wallet)
 
 
 # Test
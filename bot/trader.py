@@ -4,45 +4,181 @@ NEXUS AI Trading Bot - Trading Logic
 Executes trades based on AI decisions
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
+import metrics
 from config import config
 from exchange import Exchange
 from ai_engine import AIEngine
+from decision_provider import build_provider
 from data_fetcher import DataFetcher
 from telegram_bot import TelegramBot
+from market_stream import MarketStream
+from position_monitor import PositionMonitor
+from liquidations import LiquidationTracker
+from oi_sampler import OpenInterestSampler
+from news_ingester import NewsIngester
+from cycle_recorder import CycleRecorder
 from typing import Optional, Dict
 
 
+def _build_broadcaster(telegram: TelegramBot):
+    """Subscriber fan-out; imported here since it pulls in web3 via token_verifier"""
+    from signal_broadcast import SignalBroadcaster
+    return SignalBroadcaster(telegram)
+
+
+def _build_feature_store():
+    """Cycle snapshot archive; imported here since pyarrow is slow to load"""
+    from feature_store import FeatureStore
+    return FeatureStore()
+
+
 class Trader:
     """Main trading logic handler"""
     
-    def __init__(self):
-        self.exchange = Exchange()
-        self.ai = AIEngine()
-        self.data_fetcher = DataFetcher(self.exchange)
-        self.telegram = TelegramBot()
+    def __init__(self, telegram: TelegramBot = None, exchange: Exchange = None):
+        """
+        Args:
+            telegram: Shared notifier (a private one is created if omitted)
+            exchange: Prebuilt exchange (e.g. a replay); connected here if omitted
+        """
+        self._owns_telegram = telegram is None
+        self.telegram = telegram or TelegramBot()
+        
+        # Independent components start concurrently: the exchange does network
+        # setup (leverage, markets) while the heavy libraries import
+        components = {}
+        if exchange is None:
+            components['exchange'] = Exchange
+        if config.DECISION_PROVIDER != 'local':
+            components['ai'] = AIEngine
+        if config.BROADCAST_ENABLED:
+            components['broadcaster'] = lambda: _build_broadcaster(self.telegram)
+        if config.FEATURE_STORE_ENABLED:
+            components['features'] = _build_feature_store
+        
+        built, timings = self._build_concurrently(components)
+        
+        self.exchange = exchange or built['exchange']
+        self.ai = built.get('ai')
+        
+        # LLM, local model or both (DECISION_PROVIDER)
+        self.decider = build_provider(self.ai)
+        
+        # One WebSocket for every streamed consumer
+        self.stream = MarketStream()
+        
+        # Liquidation totals and levels from the forceOrder stream
+        self.liquidations = None
+        if config.LIQUIDATION_TRACKER_ENABLED:
+            self.liquidations = LiquidationTracker(self.stream)
+            self.liquidations.start()
+        
+        # Open interest and funding history for local OI deltas
+        self.open_interest = None
+        if config.OI_SAMPLER_ENABLED:
+            # Polls from its own thread: own ccxt client, not the trading one
+            self.open_interest = OpenInterestSampler(self.exchange.public_client(), self.stream)
+            self.open_interest.start()
+        
+        # CryptoPanic posts polled in the background, deduplicated by id
+        self.news = None
+        if config.CRYPTOPANIC_API_KEY:
+            self.news = NewsIngester()
+            self.news.start()
+        
+        self.data_fetcher = DataFetcher(self.exchange, liquidations=self.liquidations,
+                                        open_interest=self.open_interest, news=self.news)
+        
+        # Real-time position watcher (runs between analysis cycles)
+        self.monitor = None
+        if config.POSITION_MONITOR_ENABLED:
+            start = time.perf_counter()
+            self.monitor = PositionMonitor(self.exchange, self.telegram, self.stream)
+            self.monitor.sync(self.exchange.get_positions())
+            self.monitor.start()
+            timings['monitor'] = time.perf_counter() - start
+        
+        # Subscriber fan-out (tier-delayed)
+        self.broadcaster = built.get('broadcaster')
+        if self.broadcaster:
+            self.broadcaster.start()
+        
+        # Every cycle's snapshot, decision and trade outcome, for training
+        self.features = built.get('features')
+        if self.features:
+            self.features.start()
+        
+        self.startup_timings = timings
+        logger.info("Trader startup: " + ", ".join(f"{name} {secs:.2f}s" for name, secs in timings.items()))
+        
+        # Every upstream response per cycle, for offline replay (cycle_recorder.py)
+        self.recorder = None
+        if config.RECORDER_ENABLED:
+            self.recorder = CycleRecorder()
+            self.recorder.attach(self)
         
         # State
+        self.clock = time.time  # replays substitute the recorded cycle time
+        self.cycle_id = None
         self.last_decision = None
+        self.last_market_data = None
+        self.open_trades: Dict[str, dict] = {}  # side -> {'cycle_id', 'fill_price'}
+        self._last_positions: Dict[str, dict] = {}
         self.trades_today = 0
         self.daily_pnl = 0.0
         
         logger.info("Trader initialized")
     
+    @staticmethod
+    def _build_concurrently(factories: dict) -> tuple:
+        """
+        Call each factory on its own thread
+        
+        Returns:
+            (name -> object, name -> seconds); the first failure is re-raised
+        """
+        
+        def timed(name, factory):
+            with metrics.track(f"startup.{name}"):
+                start = time.perf_counter()
+                result = factory()
+            return result, time.perf_counter() - start
+        
+        with ThreadPoolExecutor(max_workers=max(len(factories), 1), thread_name_prefix="startup") as pool:
+            futures = {name: pool.submit(timed, name, factory) for name, factory in factories.items()}
+            results = {name: future.result() for name, future in futures.items()}
+        
+        return (
+            {name: result for name, (result, _) in results.items()},
+            {name: secs for name, (_, secs) in results.items()}
+        )
+    
     def run_analysis(self) -> dict:
         """Run full analysis cycle"""
         
         logger.info("Starting analysis cycle...")
+        now = self.clock()
+        self.cycle_id = int(now * 1000)
+        if self.recorder:
+            self.recorder.begin(self.cycle_id, now, self.exchange.symbol)
         
         # 1. Fetch all market data
-        market_data = self.data_fetcher.get_all_data()
+        market_data = self.data_fetcher.get_all_data(timestamp=now)
+        self.last_market_data = market_data
         logger.debug(f"Market data: {market_data}")
         
-        # 2. Get AI decision
-        decision = self.ai.analyze(market_data)
+        # 2. Get decision (LLM, local model or hybrid)
+        decision = self.decider.decide(market_data)
         
         # 3. Store decision
         self.last_decision = decision
+        if self.recorder:
+            self.recorder.set_decision(decision)
+        if self.features:
+            self.features.record(self.cycle_id, market_data, decision)
         
         return decision
     
@@ -103,7 +239,7 @@ class Trader:
             side = 'sell'
         
         # Send signal to Telegram
-        self.telegram.send_signal(
+        signal = self.telegram.format_signal(
             decision=action,
             confidence=confidence,
             reasoning=decision.get('reasoning', ''),
@@ -111,6 +247,10 @@ class Trader:
             sl=sl_price,
             tp=tp_price
         )
+        self.telegram.send(signal)
+        
+        if self.broadcaster:
+            self.broadcaster.publish(signal, config.TRADING_SYMBOL)
         
         # Execute trade
         order = self.exchange.market_order(side, position_size)
@@ -128,6 +268,14 @@ class Trader:
             )
             
             self.trades_today += 1
+            self.open_trades['long' if side == 'buy' else 'short'] = {
+                'cycle_id': self.cycle_id,
+                'fill_price': current_price
+            }
+            
+            # Hand the new position to the monitor
+            if self.monitor:
+                self.monitor.sync(self.exchange.get_positions())
             
             logger.info(f"Trade executed: {action} {position_size} @ {current_price}")
             logger.info(f"SL: {sl_price}, TP: {tp_price}")
@@ -141,6 +289,11 @@ class Trader:
         
         positions = self.exchange.get_positions()
         
+        if self.monitor:
+            self.monitor.sync(positions)
+        
+        self._record_closed(positions)
+        
         if positions:
             logger.info(f"Open positions: {len(positions)}")
             for pos in positions:
@@ -148,6 +301,24 @@ class Trader:
         else:
             logger.info("No open positions")
     
+    def _record_closed(self, positions: list) -> None:
+        """
+        Log outcomes for trades whose position is gone, using the last seen
+        mark price and PnL (closes land between checks, so this is approximate)
+        """
+        
+        current = {pos['side']: pos for pos in positions}
+        for side in [s for s in self.open_trades if s not in current]:
+            trade = self.open_trades.pop(side)
+            last = self._last_positions.get(side, {})
+            logger.info(f"{side.upper()} from cycle {trade['cycle_id']} closed (last PnL {last.get('pnl')})")
+            if self.features:
+                self.features.record_outcome(
+                    trade['cycle_id'], config.TRADING_SYMBOL, side, trade['fill_price'],
+                    last.get('mark_price'), last.get('pnl'), last.get('pnl_percent')
+                )
+        self._last_positions = current
+    
     def close_all(self) -> None:
         """Emergency close all positions"""
         
@@ -173,9 +344,32 @@ class Trader:
             'positions': positions,
             'trades_today': self.trades_today,
             'daily_pnl': self.daily_pnl,
-            'last_decision': self.last_decision,
+            'last_decision': self.last_decision.to_dict() if self.last_decision else None,
+            'ai_parse_failures': self.ai.parse_failures if self.ai else 0,
+            'monitor': self.monitor.get_state() if self.monitor else None,
             'dry_run': config.DRY_RUN
         }
+    
+    def shutdown(self) -> None:
+        """Stop background components"""
+        
+        # Buffered training rows first, so a failing stop below can't lose them
+        if self.features:
+            self.features.stop()
+        if self.monitor:
+            self.monitor.stop()
+        if self.broadcaster:
+            self.broadcaster.stop()
+        if self.open_interest:
+            self.open_interest.stop()
+        if self.news:
+            self.news.stop()
+        if self.recorder:
+            self.recorder.close()
+        self.stream.stop()
+        self.decider.close()
+        if self._owns_telegram:
+            self.telegram.close(timeout=5)
 
 
 # Test if run directly